@@ -34,7 +34,10 @@ class Agent:
         )
 
     def front(self) -> Position:
-        return self.transform * Position.from_orientation(Orientation.F)
+        transform = self.transform
+        return transform.position + Position.from_orientation(
+            transform.orientation
+        )
 
     @property
     def position(self) -> Position:
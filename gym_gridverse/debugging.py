@@ -1,24 +1,41 @@
-from typing import Callable, Optional, Type
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional, Type
 
-# library-level debugging flag
-_gv_debug: Optional[bool] = None
+# library-level debugging flag;  context-local, so that each thread (or
+# asyncio task) has its own flag
+_gv_debug: ContextVar[Optional[bool]] = ContextVar('gv_debug', default=None)
 
 
 def reset_gv_debug(debug: Optional[bool] = None) -> bool:
-    """Sets the library-wide debugging boolean."""
-    global _gv_debug
-    _gv_debug = debug if debug is not None else __debug__
-    return _gv_debug
+    """Sets the library-wide debugging boolean of the current context."""
+    debug = debug if debug is not None else __debug__
+    _gv_debug.set(debug)
+    return debug
 
 
 def gv_debug() -> bool:
-    """Gets the library-wide debugging boolean.
+    """Gets the library-wide debugging boolean of the current context.
 
     Used to bypass expensive type and value checks at runtime.  By default (if
     :py:func:`~gym_gridverse.debugging.reset_gv_debug` was not called), the
     value of `__debug__` is used.
     """
-    return reset_gv_debug() if _gv_debug is None else _gv_debug
+    debug = _gv_debug.get()
+    return reset_gv_debug() if debug is None else debug
+
+
+@contextmanager
+def gv_debug_context(debug: bool) -> Iterator[bool]:
+    """Sets the library-wide debugging boolean within a context.
+
+    The previous value is restored on exit.
+    """
+    token = _gv_debug.set(debug)
+    try:
+        yield debug
+    finally:
+        _gv_debug.reset(token)
 
 
 def checkraise(
@@ -1,9 +1,14 @@
-from typing import Iterable, List
+from typing import Iterable, List, Tuple
+
+import more_itertools as mitt
 
 from gym_gridverse.geometry import Area, Position
 from gym_gridverse.grid import Grid
 from gym_gridverse.grid_object import GridObjectFactory, Wall
 
+# NOTE:  the `fill_*` functions write whole rectangles with `Grid.fill`;  the
+# `draw_*` functions do the same, and also return the drawn positions.
+
 
 def draw_wall_boundary(grid: Grid) -> List[Position]:
     """draw boundary of walls on grid"""
@@ -21,28 +26,27 @@ def draw_room_grid(
     grid: Grid, ys: Iterable[int], xs: Iterable[int], factory: GridObjectFactory
 ) -> List[Position]:
     """use factory-created grid-objects to draw a grid of rooms on grid"""
-    y_range = range(min(ys), max(ys) + 1)
-    x_range = range(min(xs), max(xs) + 1)
-
-    # draw horizontal lines
-    positions = draw_cartesian_product(grid, ys, x_range, factory)
+    ys = list(ys)
+    xs = list(xs)
+    fill_room_grid(grid, ys, xs, factory)
 
-    # fill in remaining vertical lines
-    ys_remaining = [y for y in y_range if y not in ys]
-    positions += draw_cartesian_product(grid, ys_remaining, xs, factory)
-
-    return positions
+    x_range = range(min(xs), max(xs) + 1)
+    ys_remaining = _remaining(ys)
+    return [Position(y, x) for y in ys for x in x_range] + [
+        Position(y, x) for y in ys_remaining for x in xs
+    ]
 
 
 def draw_area(
     grid: Grid, area: Area, factory: GridObjectFactory, *, fill: bool
 ) -> List[Position]:
     """use factory-created grid-objects to draw area on grid"""
-    positions = list(area.positions('all' if fill else 'border'))
-    for pos in positions:
-        grid[pos] = factory()
+    if fill:
+        grid.fill(area, factory)
+    else:
+        fill_border(grid, area, factory)
 
-    return positions
+    return list(area.positions('all' if fill else 'border'))
 
 
 def draw_line_horizontal(
@@ -63,8 +67,68 @@ def draw_cartesian_product(
     grid: Grid, ys: Iterable[int], xs: Iterable[int], factory: GridObjectFactory
 ) -> List[Position]:
     """use factory-created grid-objects to draw on grid"""
-    positions = [Position(y, x) for y in ys for x in xs]
-    for position in positions:
-        grid[position] = factory()
+    ys = list(ys)
+    xs = list(xs)
+    fill_cartesian_product(grid, ys, xs, factory)
+    return [Position(y, x) for y in ys for x in xs]
+
+
+def fill_border(grid: Grid, area: Area, factory: GridObjectFactory):
+    """use factory-created grid-objects to fill the border of area on grid"""
+    for side in _border_areas(area):
+        grid.fill(side, factory)
 
-    return positions
+
+def fill_room_grid(
+    grid: Grid, ys: Iterable[int], xs: Iterable[int], factory: GridObjectFactory
+):
+    """use factory-created grid-objects to fill a grid of rooms on grid"""
+    ys = list(ys)
+    xs = list(xs)
+    x_range = range(min(xs), max(xs) + 1)
+
+    # fill horizontal lines, then the remaining vertical lines
+    fill_cartesian_product(grid, ys, x_range, factory)
+    fill_cartesian_product(grid, _remaining(ys), xs, factory)
+
+
+def fill_cartesian_product(
+    grid: Grid, ys: Iterable[int], xs: Iterable[int], factory: GridObjectFactory
+):
+    """use factory-created grid-objects to fill the cartesian product on grid
+
+    Consecutive coordinates are filled together, as rectangles;  each cell
+    is filled once, even if its coordinates are repeated.
+    """
+    xs = list(xs)
+    for y_run in _runs(ys):
+        for x_run in _runs(xs):
+            grid.fill(Area(y_run, x_run), factory)
+
+
+def _remaining(ys: List[int]) -> List[int]:
+    """Returns the coordinates between min(ys) and max(ys) not in ys"""
+    return [y for y in range(min(ys), max(ys) + 1) if y not in ys]
+
+
+def _runs(coordinates: Iterable[int]) -> List[Tuple[int, int]]:
+    """Returns the (min, max) of each run of consecutive coordinates"""
+    groups: List[List[int]] = [
+        list(group)
+        for group in mitt.consecutive_groups(sorted(set(map(int, coordinates))))
+    ]
+    return [(group[0], group[-1]) for group in groups]
+
+
+def _border_areas(area: Area) -> List[Area]:
+    """Returns non-overlapping areas which cover the border of an area"""
+    areas = [Area((area.ymin, area.ymin), area.xs)]
+    if area.ymax > area.ymin:
+        areas.append(Area((area.ymax, area.ymax), area.xs))
+    if area.ymax - area.ymin > 1:
+        inner_ys = (area.ymin + 1, area.ymax - 1)
+        areas.append(Area(inner_ys, (area.xmin, area.xmin)))
+        if area.xmax > area.xmin:
+            areas.append(Area(inner_ys, (area.xmax, area.xmax)))
+
+    return areas
@@ -0,0 +1,488 @@
+"""Serves many outer environments from a single process.
+
+An :py:class:`EnvServer` hosts one :py:class:`~gym_gridverse.outer_env.OuterEnv`
+per connected client, and receives reset/step requests over a Unix domain
+socket.  Requests which arrive within a small time window are gathered into
+a batch, and the requests of each command are processed by a single batched
+call over the hosted environments, see :py:func:`step_batch`.  An
+:py:class:`EnvClient` is a thin gymnasium-compatible proxy to a hosted
+environment, which lets many lightweight actor processes share the memory
+and import cost of a single server process.
+
+Connections are authenticated with a key shared by the server and its
+clients, before any message is unpickled.  The key defaults to
+:py:attr:`multiprocessing.current_process().authkey`, which is inherited by
+processes started with :py:mod:`multiprocessing`;  other processes must be
+given the key explicitly.
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from multiprocessing import AuthenticationError, current_process
+from multiprocessing.connection import Client, Connection, Listener, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import gymnasium as gym
+
+from gym_gridverse.gym import outer_space_to_gym_space
+from gym_gridverse.outer_env import OuterEnv
+
+__all__ = ['EnvServer', 'EnvClient', 'step_batch']
+
+OuterEnvFactory = Callable[[], OuterEnv]
+Request = Tuple[Any, ...]
+Response = Tuple[str, Any]
+
+
+def step_batch(
+    envs: Sequence[OuterEnv], actions: Sequence[int]
+) -> List[Response]:
+    """Steps a batch of environments, and returns their responses
+
+    The server steps each batch of step requests through a single call;  as
+    the library has no vectorized transition, the environments are stepped
+    in turn within the call, and an error only fails the response of its
+    own environment.
+
+    Args:
+        envs (Sequence[OuterEnv]): environments to step
+        actions (Sequence[int]): action of each environment
+
+    Returns:
+        List[Response]: ('ok', (observation, reward, terminated)) or ('error', exception) of each environment
+    """
+    if len(envs) != len(actions):
+        raise ValueError(
+            f'number of envs ({len(envs)}) and actions ({len(actions)}) differ'
+        )
+
+    responses: List[Response] = []
+    for env, action in zip(envs, actions):
+        try:
+            reward, terminated = env.step(
+                env.action_space.int_to_action(action)
+            )
+            responses.append(('ok', (env.observation, reward, terminated)))
+        except Exception as e:  # pylint: disable=broad-except
+            responses.append(('error', e))
+
+    return responses
+
+
+class EnvServer:
+    """Hosts outer environments, and serves requests from clients.
+
+    Each client connection is assigned its own environment, created by the
+    factory when the client connects, and released when it disconnects.
+    Clients are synchronous, i.e., each connection has at most one pending
+    request.  Once any request is received, the server keeps receiving the
+    requests of the other connections for up to `batch_window` seconds, or
+    until `max_batch_size` requests are pending, and then processes and
+    answers the whole batch.
+    """
+
+    def __init__(
+        self,
+        factory: OuterEnvFactory,
+        address: str,
+        *,
+        batch_window: float = 0.001,
+        max_batch_size: Optional[int] = None,
+        poll_interval: float = 0.1,
+        authkey: Optional[bytes] = None,
+    ):
+        """Creates a server listening on a Unix domain socket
+
+        Args:
+            factory (OuterEnvFactory): creates the environment of each client
+            address (str): filesystem path of the Unix domain socket
+            batch_window (float): seconds to wait for further requests, once a request is received
+            max_batch_size (Optional[int]): number of requests which closes a batch early, defaults to the number of connected clients
+            poll_interval (float): seconds between checks of whether the server was closed
+            authkey (Optional[bytes]): authentication key shared with the clients, defaults to the authkey of the current process
+        """
+        if authkey is None:
+            authkey = current_process().authkey
+
+        if batch_window < 0.0:
+            raise ValueError(
+                f'batch_window ({batch_window}) should be non-negative'
+            )
+        if max_batch_size is not None and max_batch_size <= 0:
+            raise ValueError(
+                f'max_batch_size ({max_batch_size}) should be positive'
+            )
+
+        self.factory = factory
+        self.address = address
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.poll_interval = poll_interval
+        self.authkey = authkey
+
+        self._listener = Listener(address, family='AF_UNIX', authkey=authkey)
+        self._envs: Dict[Connection, OuterEnv] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._serving = False
+
+        # each handler processes all the requests of its command in a batch
+        self._handlers: Dict[str, Callable] = {
+            'spaces': self._handle_each(self._handle_spaces),
+            'reset': self._handle_each(self._handle_reset),
+            'step': self._handle_step,
+            'state': self._handle_each(self._handle_state),
+        }
+
+    @property
+    def num_envs(self) -> int:
+        """Number of hosted environments, i.e., of connected clients"""
+        with self._lock:
+            return len(self._envs)
+
+    def serve_forever(self):
+        """Serves requests until the server is closed"""
+        if self._closed.is_set():
+            raise RuntimeError('server is closed')
+
+        self._serving = True
+        accept_thread = threading.Thread(target=self._accept, daemon=True)
+        accept_thread.start()
+
+        try:
+            while not self._closed.is_set():
+                requests = self._gather()
+                if requests:
+                    self._handle_requests(requests)
+        finally:
+            # wakes up the accepting thread, without going through
+            # authentication, before closing the listener
+            with socket.socket(socket.AF_UNIX) as wakeup_socket:
+                try:
+                    wakeup_socket.connect(self.address)
+                except OSError:
+                    pass
+
+            accept_thread.join()
+            self._shutdown()
+
+    def close(self):
+        """Stops serving requests, and disconnects all clients"""
+        if self._closed.is_set():
+            return
+
+        self._closed.set()
+        if not self._serving:
+            self._shutdown()
+
+    def __enter__(self) -> EnvServer:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _accept(self):
+        while not self._closed.is_set():
+            try:
+                connection = self._listener.accept()
+            except (EOFError, AuthenticationError):
+                continue
+            except OSError:
+                break
+
+            if self._closed.is_set():
+                connection.close()
+                break
+
+            try:
+                env = self.factory()
+            except Exception as e:  # pylint: disable=broad-except
+                # the client receives the error in place of its first response
+                self._reject(connection, e)
+                continue
+
+            with self._lock:
+                self._envs[connection] = env
+
+    @staticmethod
+    def _reject(connection: Connection, error: Exception):
+        try:
+            connection.send(('error', error))
+        except Exception:  # pylint: disable=broad-except
+            # e.g., the error can not be pickled, or the client is gone
+            pass
+
+        connection.close()
+
+    def _gather(self) -> Dict[Connection, Request]:
+        """Receives a batch of requests, within the batch window"""
+        with self._lock:
+            connections = list(self._envs)
+
+        requests: Dict[Connection, Request] = {}
+        if not connections:
+            self._closed.wait(self.poll_interval)
+            return requests
+
+        ready = wait(connections, timeout=self.poll_interval)
+        self._receive(ready, requests)
+        if not requests:
+            return requests
+
+        max_batch_size = (
+            len(connections)
+            if self.max_batch_size is None
+            else self.max_batch_size
+        )
+        deadline = time.monotonic() + self.batch_window
+        while len(requests) < max_batch_size:
+            timeout = deadline - time.monotonic()
+            pending = [
+                connection
+                for connection in connections
+                if connection not in requests and not connection.closed
+            ]
+            if timeout <= 0.0 or not pending:
+                break
+
+            ready = wait(pending, timeout=timeout)
+            self._receive(ready, requests)
+
+        return requests
+
+    def _receive(
+        self, connections: List[Any], requests: Dict[Connection, Request]
+    ):
+        for connection in connections:
+            try:
+                request = connection.recv()
+            except (EOFError, OSError):
+                self._disconnect(connection)
+                continue
+            except Exception as e:  # pylint: disable=broad-except
+                # e.g., the message can not be unpickled
+                self._reply(connection, ('error', ValueError(e)))
+                continue
+
+            if not (
+                isinstance(request, tuple)
+                and request
+                and isinstance(request[0], str)
+            ):
+                self._reply(
+                    connection,
+                    ('error', ValueError(f'invalid request {request!r}')),
+                )
+            elif request[0] == 'close':
+                self._disconnect(connection)
+            else:
+                requests[connection] = request
+
+    def _handle_requests(self, requests: Dict[Connection, Request]):
+        """Processes the batch of requests, and sends the responses"""
+        with self._lock:
+            envs = {
+                connection: self._envs[connection] for connection in requests
+            }
+
+        batches: Dict[str, List[Connection]] = {}
+        for connection, (command, *_) in requests.items():
+            batches.setdefault(command, []).append(connection)
+
+        responses: Dict[Connection, Response] = {}
+        for command, connections in batches.items():
+            try:
+                handler = self._handlers[command]
+            except KeyError:
+                error = ValueError(f'invalid command {command!r}')
+                responses.update(
+                    (connection, ('error', error)) for connection in connections
+                )
+                continue
+
+            batch_responses = handler(
+                [envs[connection] for connection in connections],
+                [requests[connection][1:] for connection in connections],
+            )
+            responses.update(zip(connections, batch_responses))
+
+        for connection, response in responses.items():
+            self._reply(connection, response)
+
+    def _reply(self, connection: Connection, response: Response):
+        try:
+            connection.send(response)
+        except OSError:
+            self._disconnect(connection)
+
+    @staticmethod
+    def _handle_each(handler: Callable) -> Callable:
+        """Returns a batch handler which calls handler on each request"""
+
+        def handle_batch(
+            envs: List[OuterEnv], args: List[Request]
+        ) -> List[Response]:
+            responses: List[Response] = []
+            for env, env_args in zip(envs, args):
+                try:
+                    responses.append(('ok', handler(env, *env_args)))
+                except Exception as e:  # pylint: disable=broad-except
+                    responses.append(('error', e))
+            return responses
+
+        return handle_batch
+
+    @staticmethod
+    def _handle_step(
+        envs: List[OuterEnv], args: List[Request]
+    ) -> List[Response]:
+        # malformed requests fail on their own, outside of the batch
+        valid = [i for i, env_args in enumerate(args) if len(env_args) == 1]
+        responses: List[Response] = [
+            ('error', TypeError('step expects a single action'))
+        ] * len(args)
+        batch_responses = step_batch(
+            [envs[i] for i in valid], [args[i][0] for i in valid]
+        )
+        for i, response in zip(valid, batch_responses):
+            responses[i] = response
+
+        return responses
+
+    @staticmethod
+    def _handle_spaces(env: OuterEnv):
+        state_space = (
+            outer_space_to_gym_space(env.state_representation.space)
+            if env.state_representation is not None
+            else None
+        )
+        action_space = gym.spaces.Discrete(env.action_space.num_actions)
+        observation_space = (
+            outer_space_to_gym_space(env.observation_representation.space)
+            if env.observation_representation is not None
+            else None
+        )
+        return state_space, action_space, observation_space
+
+    @staticmethod
+    def _handle_reset(env: OuterEnv, seed: Optional[int]):
+        if seed is not None:
+            env.inner_env.set_seed(seed)
+
+        env.reset()
+        return env.observation
+
+    @staticmethod
+    def _handle_state(env: OuterEnv):
+        return env.state
+
+    def _disconnect(self, connection: Connection):
+        with self._lock:
+            self._envs.pop(connection, None)
+
+        connection.close()
+
+    def _shutdown(self):
+        with self._lock:
+            connections = list(self._envs)
+            self._envs.clear()
+
+        for connection in connections:
+            connection.close()
+
+        self._listener.close()
+
+
+class EnvClient(gym.Env):
+    """Gymnasium-compatible proxy to an environment hosted by an EnvServer"""
+
+    def __init__(self, address: str, *, authkey: Optional[bytes] = None):
+        """Connects to a server, which creates a new environment
+
+        Args:
+            address (str): filesystem path of the server Unix domain socket
+            authkey (Optional[bytes]): authentication key shared with the server, defaults to the authkey of the current process
+        """
+        super().__init__()
+
+        if authkey is None:
+            authkey = current_process().authkey
+
+        self._connection: Optional[Connection] = Client(
+            address, family='AF_UNIX', authkey=authkey
+        )
+        try:
+            (
+                self.state_space,
+                self.action_space,
+                self.observation_space,
+            ) = self._request('spaces')
+        except Exception:
+            # e.g., the server failed to create the environment
+            self._connection.close()
+            self._connection = None
+            raise
+
+    @property
+    def state(self):
+        """Returns the representation of the current state."""
+        return self._request('state')
+
+    def reset(
+        self,
+        *,
+        seed: Optional[int] = None,
+        options: Optional[dict] = None,
+    ):
+        """Resets the state of the environment.
+
+        Returns:
+            Tuple[Dict[str, numpy.ndarray], Dict]: (initial observation, info dictionary)
+        """
+        super().reset(seed=seed)
+        return self._request('reset', seed), {}
+
+    def step(self, action: int):
+        """Runs the environment dynamics for one timestep.
+
+        Args:
+            action (int): agent's action
+
+        Returns:
+            Tuple[Dict[str, numpy.ndarray], float, bool, bool, Dict]: (observation, reward, terminated, truncated, info dictionary)
+        """
+        observation, reward, terminated = self._request('step', int(action))
+        return observation, reward, terminated, False, {}
+
+    def close(self):
+        if self._connection is None:
+            return
+
+        try:
+            self._connection.send(('close',))
+        except OSError:
+            pass
+
+        self._connection.close()
+        self._connection = None
+
+    def _request(self, command: str, *args):
+        if self._connection is None:
+            raise RuntimeError('client is closed')
+
+        try:
+            self._connection.send((command, *args))
+        except OSError:
+            # the server may already have answered with an error and closed
+            # the connection, e.g., if it failed to create the environment
+            if not self._connection.poll():
+                raise
+
+        status, result = self._connection.recv()
+        if status == 'error':
+            raise result
+
+        return result
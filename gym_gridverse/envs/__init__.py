@@ -1 +1 @@
-from .inner_env import InnerEnv  # noqa: F401
+from .inner_env import InnerEnv, Snapshot  # noqa: F401
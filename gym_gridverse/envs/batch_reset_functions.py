@@ -0,0 +1,797 @@
+"""Batched reset functions, which generate many initial states at once
+
+Each batched reset function mirrors the reset function of the same name in
+:py:mod:`~gym_gridverse.envs.reset_functions`, but samples `n` layouts at once
+with vectorized NumPy operations, and returns them as a
+:py:class:`StateBatch` of stacked arrays.  The sampled layouts follow the same
+distribution as the sequential reset functions, although not the same random
+stream.
+"""
+import copy
+import inspect
+import itertools as itt
+import warnings
+from dataclasses import dataclass
+from functools import partial
+from typing import List, Optional, Sequence, Set, Tuple, Type
+
+import more_itertools as mitt
+import numpy as np
+import numpy.random as rnd
+from typing_extensions import Protocol  # python3.7 compatibility
+
+from gym_gridverse.agent import Agent
+from gym_gridverse.envs.reset_functions import ResetFunction
+from gym_gridverse.geometry import Orientation, Position, Shape
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import (
+    Beacon,
+    Color,
+    Door,
+    Exit,
+    Floor,
+    GridObject,
+    Key,
+    MovingObstacle,
+    Telepod,
+    Wall,
+)
+from gym_gridverse.rng import get_gv_rng_if_none
+from gym_gridverse.state import State
+from gym_gridverse.utils.custom import import_if_custom
+from gym_gridverse.utils.functions import checkraise_kwargs, select_kwargs
+from gym_gridverse.utils.protocols import (
+    get_keyword_parameter,
+    get_positional_parameters,
+)
+from gym_gridverse.utils.registry import FunctionRegistry
+
+# every palette starts with floor and wall
+_FLOOR, _WALL = 0, 1
+
+
+@dataclass(frozen=True)
+class StateBatch:
+    """A batch of states stored as stacked arrays
+
+    The grid-object in each cell is stored as an index into the palette, which
+    contains one prototype of each grid-object appearing in the batch.
+    Agents are stored by position and orientation value, and never hold an
+    item.
+
+    Attributes:
+        palette (Tuple[GridObject, ...]): grid-object prototypes
+        grid (numpy.ndarray): (N, H, W) palette indices
+        agent_position (numpy.ndarray): (N, 2) agent (y, x) positions
+        agent_orientation (numpy.ndarray): (N,) agent orientation values
+    """
+
+    palette: Tuple[GridObject, ...]
+    grid: np.ndarray
+    agent_position: np.ndarray
+    agent_orientation: np.ndarray
+
+    def __len__(self) -> int:
+        return self.grid.shape[0]
+
+    def compact(self) -> np.ndarray:
+        """Returns the (N, H, W, 3) grid of type, state and color indices
+
+        Each cell matches the grid-object conversion of the default state
+        representation.
+        """
+        channels = np.array(
+            [
+                [obj.type_index(), obj.state_index, obj.color.value]
+                for obj in self.palette
+            ]
+        )
+        return channels[self.grid]
+
+    def state(self, i: int) -> State:
+        """Returns the i-th state of the batch
+
+        Args:
+            i (int): index in the batch
+        Returns:
+            State: state with newly created grid-objects
+        """
+        grid = Grid(
+            [
+                [copy.copy(self.palette[index]) for index in row]
+                for row in self.grid[i].tolist()
+            ]
+        )
+        y, x = self.agent_position[i].tolist()
+        orientation = Orientation(int(self.agent_orientation[i]))
+        return State(grid, Agent(Position(y, x), orientation))
+
+    def states(self) -> List[State]:
+        """Returns all states of the batch"""
+        return [self.state(i) for i in range(len(self))]
+
+
+class BatchResetFunction(Protocol):
+    """Signature that all batched reset functions must follow"""
+
+    def __call__(
+        self, n: int, *, rng: Optional[rnd.Generator] = None
+    ) -> StateBatch:
+        ...
+
+
+class BatchResetFunctionRegistry(FunctionRegistry):
+    def get_protocol_parameters(
+        self, signature: inspect.Signature
+    ) -> List[inspect.Parameter]:
+        (n,) = get_positional_parameters(signature, 1)
+        rng = get_keyword_parameter(signature, 'rng')
+        return [n, rng]
+
+    def check_signature(self, function: BatchResetFunction):
+        signature = inspect.signature(function)
+        n, rng = self.get_protocol_parameters(signature)
+
+        # checks `n` is positional
+        if n.kind not in [
+            inspect.Parameter.POSITIONAL_ONLY,
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        ]:
+            raise TypeError(
+                f'The first argument ({n.name}) '
+                f'of a registered batched reset function ({function}) '
+                'should be allowed to be a positional argument.'
+            )
+
+        # checks `rng` is keyword
+        if rng.kind not in [
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            inspect.Parameter.KEYWORD_ONLY,
+        ]:
+            raise TypeError(
+                f'The `rng` argument ({rng.name}) '
+                f'of a registered batched reset function ({function}) '
+                'should be allowed to be a keyword argument.'
+            )
+
+        if signature.return_annotation not in [
+            inspect.Parameter.empty,
+            StateBatch,
+        ]:
+            warnings.warn(
+                'The return type of a registered batched reset function '
+                f'({function}) has an annotation '
+                f'({signature.return_annotation}) which is not `StateBatch`.'
+            )
+
+
+batch_reset_function_registry = BatchResetFunctionRegistry()
+"""Batched reset function registry"""
+
+
+def _walled_grid(n: int, shape: Shape) -> np.ndarray:
+    """Returns n floor grids surrounded by walls"""
+    grid = np.full((n, shape.height, shape.width), _FLOOR, dtype=np.int16)
+    grid[:, [0, -1], :] = _WALL
+    grid[:, :, [0, -1]] = _WALL
+    return grid
+
+
+def _sample_cells(
+    mask: np.ndarray, k: int, rng: rnd.Generator
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Samples k distinct cells per batch element, uniformly among the mask
+
+    Cells are ordered by independent uniform keys;  the k smallest keys among
+    the masked cells are a uniform sample without replacement, in uniformly
+    random order.
+
+    Args:
+        mask (numpy.ndarray): (N, H, W) cells which can be sampled
+        k (int): number of cells per batch element
+        rng (Generator):
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: (N, k) y and x coordinates
+    """
+    n, _, width = mask.shape
+    mask = mask.reshape(n, -1)
+
+    num_cells = mask.sum(axis=1).min(initial=k)
+    if num_cells < k:
+        raise ValueError(
+            f'cannot sample {k} cells among {num_cells} candidate cells'
+        )
+
+    keys = rng.random(mask.shape)
+    keys[~mask] = np.inf
+    indices = np.argsort(keys, axis=1)[:, :k]
+    return np.divmod(indices, width)
+
+
+def _sample_orientations(
+    n: int, orientations: Sequence[Orientation], rng: rnd.Generator
+) -> np.ndarray:
+    values = np.array([orientation.value for orientation in orientations])
+    return values[rng.integers(len(values), size=n)]
+
+
+def _sample_subsets(
+    n: int, size: int, k: int, rng: rnd.Generator
+) -> np.ndarray:
+    """Returns (N, k) indices of distinct elements out of size, in random order"""
+    return np.argsort(rng.random((n, size)), axis=1)[:, :k]
+
+
+def _room_splits(
+    shape: Shape, layout: Tuple[int, int], *, prefix: str = ''
+) -> Tuple[np.ndarray, np.ndarray]:
+    layout_height, layout_width = layout
+
+    y_splits = np.linspace(
+        0, shape.height - 1, num=layout_height + 1, dtype=int
+    )
+    if len(y_splits) != len(set(y_splits)):
+        raise ValueError(
+            f'insufficient {prefix}height ({shape.height}) for layout ({layout})'
+        )
+
+    x_splits = np.linspace(0, shape.width - 1, num=layout_width + 1, dtype=int)
+    if len(x_splits) != len(set(x_splits)):
+        raise ValueError(
+            f'insufficient {prefix}width ({shape.width}) for layout ({layout})'
+        )
+
+    return y_splits, x_splits
+
+
+def _room_grid(
+    n: int,
+    shape: Shape,
+    y_splits: np.ndarray,
+    x_splits: np.ndarray,
+    rng: rnd.Generator,
+) -> np.ndarray:
+    """Returns n grids of rooms, each wall segment with a random passage"""
+    y_range = np.arange(y_splits.min(), y_splits.max() + 1)
+    x_range = np.arange(x_splits.min(), x_splits.max() + 1)
+
+    layout = np.full((shape.height, shape.width), _FLOOR, dtype=np.int16)
+    layout[np.ix_(y_splits, x_range)] = _WALL
+    layout[np.ix_(y_range, x_splits)] = _WALL
+    grid = np.repeat(layout[None], n, axis=0)
+    batch = np.arange(n)[:, None]
+
+    # passages in horizontal walls
+    segments = list(itt.product(y_splits[1:-1], mitt.pairwise(x_splits)))
+    if segments:
+        ys = np.array([y for y, _ in segments])
+        x_from, x_to = np.array([x for _, x in segments]).T
+        xs = rng.integers(x_from + 1, x_to, size=(n, len(segments)))
+        grid[batch, ys, xs] = _FLOOR
+
+    # passages in vertical walls
+    segments = list(itt.product(mitt.pairwise(y_splits), x_splits[1:-1]))
+    if segments:
+        y_from, y_to = np.array([y for y, _ in segments]).T
+        xs = np.array([x for _, x in segments])
+        ys = rng.integers(y_from + 1, y_to, size=(n, len(segments)))
+        grid[batch, ys, xs] = _FLOOR
+
+    return grid
+
+
+def _check_colors(colors: Set[Color], *, none_name: str = 'NONE'):
+    if Color.NONE in colors:
+        raise ValueError(f'colors ({colors}) must not include {none_name}')
+    if len(colors) < 2:
+        raise ValueError(f'colors ({colors}) must have at least 2 colors')
+
+
+@batch_reset_function_registry.register
+def empty(
+    n: int,
+    shape: Shape,
+    random_agent: bool = False,
+    random_exit: bool = False,
+    *,
+    rng: Optional[rnd.Generator] = None,
+) -> StateBatch:
+    """Batched :py:func:`~gym_gridverse.envs.reset_functions.empty`
+
+    Args:
+        n (`int`): number of states
+        shape (`Shape`): shape of grid
+        random_agent (`bool, optional`): position of agent, in corner if False
+        random_exit (`bool, optional`): position of exit, in corner if False
+        rng: (`Generator, optional`)
+
+    Returns:
+        StateBatch:
+    """
+
+    if shape.height < 4 or shape.width < 4:
+        raise ValueError('height and width need to be at least 4')
+
+    rng = get_gv_rng_if_none(rng)
+
+    palette = (Floor(), Wall(), Exit())
+    EXIT = 2
+
+    grid = _walled_grid(n, shape)
+    batch = np.arange(n)
+
+    if random_exit:
+        exit_y = rng.integers(1, shape.height - 2, size=n, endpoint=True)
+        exit_x = rng.integers(1, shape.width - 2, size=n, endpoint=True)
+    else:
+        exit_y = np.full(n, shape.height - 2)
+        exit_x = np.full(n, shape.width - 2)
+
+    grid[batch, exit_y, exit_x] = EXIT
+
+    if random_agent:
+        agent_y, agent_x = _sample_cells(grid == _FLOOR, 1, rng)
+        agent_position = np.stack([agent_y[:, 0], agent_x[:, 0]], axis=-1)
+        agent_orientation = _sample_orientations(n, list(Orientation), rng)
+    else:
+        agent_position = np.tile([1, 1], (n, 1))
+        agent_orientation = np.full(n, Orientation.R.value)
+
+    return StateBatch(palette, grid, agent_position, agent_orientation)
+
+
+@batch_reset_function_registry.register
+def rooms(
+    n: int,
+    shape: Shape,
+    layout: Tuple[int, int],
+    *,
+    rng: Optional[rnd.Generator] = None,
+) -> StateBatch:
+    """Batched :py:func:`~gym_gridverse.envs.reset_functions.rooms`
+
+    Args:
+        n (`int`): number of states
+        shape (`Shape`): shape of grid
+        layout (`Tuple[int, int]`): number of rooms vertically and horizontally
+        rng: (`Generator, optional`)
+
+    Returns:
+        StateBatch:
+    """
+
+    rng = get_gv_rng_if_none(rng)
+
+    palette = (Floor(), Wall(), Exit())
+    EXIT = 2
+
+    y_splits, x_splits = _room_splits(shape, layout)
+    grid = _room_grid(n, shape, y_splits, x_splits, rng)
+
+    # sample agent and exit positions
+    ys, xs = _sample_cells(grid == _FLOOR, 2, rng)
+    grid[np.arange(n), ys[:, 1], xs[:, 1]] = EXIT
+    agent_position = np.stack([ys[:, 0], xs[:, 0]], axis=-1)
+    agent_orientation = _sample_orientations(n, list(Orientation), rng)
+
+    return StateBatch(palette, grid, agent_position, agent_orientation)
+
+
+@batch_reset_function_registry.register
+def dynamic_obstacles(
+    n: int,
+    shape: Shape,
+    num_obstacles: int,
+    random_agent: bool = False,
+    *,
+    rng: Optional[rnd.Generator] = None,
+) -> StateBatch:
+    """Batched :py:func:`~gym_gridverse.envs.reset_functions.dynamic_obstacles`
+
+    Args:
+        n (`int`): number of states
+        shape (`Shape`): shape of grid
+        num_obstacles (`int`): number of dynamic obstacles
+        random_agent (`bool, optional`): position of agent, in corner if False
+        rng: (`Generator, optional`)
+
+    Returns:
+        StateBatch:
+    """
+
+    rng = get_gv_rng_if_none(rng)
+
+    batch = empty(n, shape, random_agent, rng=rng)
+    palette = batch.palette + (MovingObstacle(),)
+    MOVING_OBSTACLE = len(palette) - 1
+
+    agent_y, agent_x = batch.agent_position.T
+    vacant = batch.grid == _FLOOR
+    vacant[np.arange(n), agent_y, agent_x] = False
+
+    try:
+        ys, xs = _sample_cells(vacant, num_obstacles, rng)
+    except ValueError as e:
+        raise ValueError(
+            f'Too many obstacles ({num_obstacles}) and not enough '
+            f'vacant positions ({vacant[0].sum()})'
+        ) from e
+
+    batch.grid[np.arange(n)[:, None], ys, xs] = MOVING_OBSTACLE
+
+    return StateBatch(
+        palette, batch.grid, batch.agent_position, batch.agent_orientation
+    )
+
+
+@batch_reset_function_registry.register
+def keydoor(
+    n: int, shape: Shape, *, rng: Optional[rnd.Generator] = None
+) -> StateBatch:
+    """Batched :py:func:`~gym_gridverse.envs.reset_functions.keydoor`
+
+    Args:
+        n (`int`): number of states
+        shape (`Shape`):
+        rng: (`Generator, optional`)
+
+    Returns:
+        StateBatch:
+    """
+
+    if shape.height < 3 or shape.width < 5 or shape == Shape(3, 5):
+        raise ValueError(f'Shape must larger than (3, 5), given {shape}')
+
+    rng = get_gv_rng_if_none(rng)
+
+    batch = empty(n, shape)
+    palette = batch.palette + (
+        Door(Door.Status.LOCKED, Color.YELLOW),
+        Key(Color.YELLOW),
+    )
+    DOOR, KEY = len(palette) - 2, len(palette) - 1
+    grid = batch.grid
+    indices = np.arange(n)
+
+    # generate vertical splitting wall
+    x_wall = rng.integers(2, shape.width - 3, size=n, endpoint=True)
+    grid[
+        indices[:, None], np.arange(1, shape.height - 1), x_wall[:, None]
+    ] = _WALL
+
+    # place yellow, locked door
+    y_door = rng.integers(1, shape.height - 1, size=n)
+    grid[indices, y_door, x_wall] = DOOR
+
+    # place yellow key left of wall
+    y_key = rng.integers(1, shape.height - 2, size=n, endpoint=True)
+    x_key = rng.integers(1, x_wall - 1, endpoint=True)
+    grid[indices, y_key, x_key] = KEY
+
+    # place agent left of wall
+    y_agent = rng.integers(1, shape.height - 2, size=n, endpoint=True)
+    x_agent = rng.integers(1, x_wall - 1, endpoint=True)
+    agent_position = np.stack([y_agent, x_agent], axis=-1)
+    agent_orientation = _sample_orientations(n, list(Orientation), rng)
+
+    return StateBatch(palette, grid, agent_position, agent_orientation)
+
+
+@batch_reset_function_registry.register
+def crossing(
+    n: int,
+    shape: Shape,
+    num_rivers: int,
+    object_type: Type[GridObject],
+    *,
+    rng: Optional[rnd.Generator] = None,
+) -> StateBatch:
+    """Batched :py:func:`~gym_gridverse.envs.reset_functions.crossing`
+
+    The path to the exit is built one crossing at a time for the whole batch,
+    so the Python loop runs over the rivers rather than the states.
+
+    Args:
+        n (`int`): number of states
+        shape (`Shape`): shape (odd height and width) of grid
+        num_rivers (`int`): number of `rivers`
+        object_type (`Type[GridObject]`): river's object type
+        rng: (`Generator, optional`)
+
+    Returns:
+        StateBatch:
+    """
+
+    if shape.height < 5 or shape.height % 2 == 0:
+        raise ValueError(f'height ({shape.height}) must be odd and >= 5')
+    if shape.width < 5 or shape.width % 2 == 0:
+        raise ValueError(f'width ({shape.width}) must be odd and >= 5')
+    if num_rivers <= 0:
+        raise ValueError(f'number of rivers ({num_rivers}) must be positive')
+
+    rng = get_gv_rng_if_none(rng)
+
+    batch = empty(n, shape)
+    palette = batch.palette + (object_type(),)
+    RIVER = len(palette) - 1
+    grid = batch.grid
+    indices = np.arange(n)
+
+    # all rivers specified by orientation and position
+    rows = np.arange(2, shape.height - 2, 2)
+    columns = np.arange(2, shape.width - 2, 2)
+
+    # sample subset of random rivers
+    num_rivers = min(num_rivers, len(rows) + len(columns))
+    selected = np.zeros((n, len(rows) + len(columns)), dtype=bool)
+    rivers = _sample_subsets(n, selected.shape[1], num_rivers, rng)
+    selected[indices[:, None], rivers] = True
+    selected_h, selected_v = selected[:, : len(rows)], selected[:, len(rows) :]
+
+    # create horizontal rivers, then vertical rivers
+    for i, y in enumerate(rows):
+        grid[selected_h[:, i], y, 1:-1] = RIVER
+    for j, x in enumerate(columns):
+        grid[selected_v[:, j], 1:-1, x] = RIVER
+
+    # river boundaries;  unselected rivers are sorted past the outer walls,
+    # where the path never reaches
+    limits_h = np.sort(np.where(selected_h, rows, shape.height - 1), axis=1)
+    limits_h = np.pad(
+        limits_h, [(0, 0), (1, 1)], constant_values=(0, shape.height - 1)
+    )
+    limits_v = np.sort(np.where(selected_v, columns, shape.width - 1), axis=1)
+    limits_v = np.pad(
+        limits_v, [(0, 0), (1, 1)], constant_values=(0, shape.width - 1)
+    )
+
+    # sample path to exit:  one horizontal step per vertical river
+    num_steps_h = selected_v.sum(axis=1, keepdims=True)
+    path_h = np.argsort(rng.random((n, num_rivers)), axis=1) < num_steps_h
+
+    # create crossing
+    room_i = np.zeros(n, dtype=int)
+    room_j = np.zeros(n, dtype=int)
+    for step_h in path_h.T:
+        y_low = limits_h[indices, room_i] + 1
+        y_high = limits_h[indices, room_i + 1]
+        x_low = limits_v[indices, room_j] + 1
+        x_high = limits_v[indices, room_j + 1]
+
+        ys = np.where(step_h, rng.integers(y_low, y_high), y_high)
+        xs = np.where(step_h, x_high, rng.integers(x_low, x_high))
+        grid[indices, ys, xs] = _FLOOR
+
+        room_i += ~step_h
+        room_j += step_h
+
+    return StateBatch(
+        palette, grid, batch.agent_position, batch.agent_orientation
+    )
+
+
+@batch_reset_function_registry.register
+def teleport(
+    n: int, shape: Shape, *, rng: Optional[rnd.Generator] = None
+) -> StateBatch:
+    """Batched :py:func:`~gym_gridverse.envs.reset_functions.teleport`
+
+    Args:
+        n (`int`): number of states
+        shape (`Shape`):
+        rng: (`Generator, optional`)
+
+    Returns:
+        StateBatch:
+    """
+
+    rng = get_gv_rng_if_none(rng)
+
+    batch = empty(n, shape)
+    palette = batch.palette + (Telepod(Color.RED),)
+    TELEPOD = len(palette) - 1
+
+    vacant = batch.grid == _FLOOR
+    vacant[:, 1, 1] = False
+    ys, xs = _sample_cells(vacant, 2, rng)
+    batch.grid[np.arange(n)[:, None], ys, xs] = TELEPOD
+
+    # place agent on top left
+    agent_orientation = _sample_orientations(
+        n, [Orientation.R, Orientation.B], rng
+    )
+
+    return StateBatch(
+        palette, batch.grid, batch.agent_position, agent_orientation
+    )
+
+
+@batch_reset_function_registry.register
+def memory(
+    n: int,
+    shape: Shape,
+    colors: Set[Color],
+    *,
+    rng: Optional[rnd.Generator] = None,
+) -> StateBatch:
+    """Batched :py:func:`~gym_gridverse.envs.reset_functions.memory`
+
+    Args:
+        n (`int`): number of states
+        shape (`Shape`):
+        colors (`Set[Color]`): colors of exits and beacons
+        rng: (`Generator, optional`)
+
+    Returns:
+        StateBatch:
+    """
+
+    if shape.height < 5:
+        raise ValueError(f'height ({shape.height}) must be >= 5')
+    if shape.width < 5 or shape.width % 2 == 0:
+        raise ValueError(f'width ({shape.width}) must be odd and >= 5')
+    _check_colors(colors, none_name='Colors.NONE')
+
+    rng = get_gv_rng_if_none(rng)
+
+    colors_list = sorted(colors, key=lambda color: color.value)
+    palette = (
+        (Floor(), Wall())
+        + tuple(Exit(color) for color in colors_list)
+        + tuple(Beacon(color) for color in colors_list)
+    )
+    EXITS = 2 + np.arange(len(colors_list))
+    BEACONS = EXITS + len(colors_list)
+
+    layout = np.full((shape.height, shape.width), _WALL, dtype=np.int16)
+    layout[[1, -2], 2:-2] = _FLOOR
+    layout[2:-2, shape.width // 2] = _FLOOR
+    grid = np.repeat(layout[None], n, axis=0)
+    indices = np.arange(n)
+
+    color_good, color_bad = _sample_subsets(n, len(colors_list), 2, rng).T
+    x_exits = np.array([1, shape.width - 2])
+    x_exit_good, x_exit_bad = x_exits[_sample_subsets(n, 2, 2, rng)].T
+    grid[indices, 1, x_exit_good] = EXITS[color_good]
+    grid[indices, 1, x_exit_bad] = EXITS[color_bad]
+    grid[:, -2, 1] = BEACONS[color_good]
+    grid[:, -2, -2] = BEACONS[color_good]
+
+    agent_position = np.tile([shape.height // 2, shape.width // 2], (n, 1))
+    agent_orientation = np.full(n, Orientation.F.value)
+
+    return StateBatch(palette, grid, agent_position, agent_orientation)
+
+
+@batch_reset_function_registry.register
+def memory_rooms(
+    n: int,
+    shape: Shape,
+    layout: Tuple[int, int],
+    colors: Set[Color],
+    num_beacons: int,
+    num_exits: int,
+    *,
+    rng: Optional[rnd.Generator] = None,
+) -> StateBatch:
+    """Batched :py:func:`~gym_gridverse.envs.reset_functions.memory_rooms`
+
+    Args:
+        n (`int`): number of states
+        shape (`Shape`): shape of grid
+        layout (`Tuple[int, int]`): number of rooms vertically and horizontally
+        colors (`Set[Color]`): colors of exits and beacons
+        num_beacons (`int`): number of beacons
+        num_exits (`int`): number of exits, each of a different color
+        rng: (`Generator, optional`)
+
+    Returns:
+        StateBatch:
+    """
+
+    _check_colors(colors)
+    if num_beacons < 1:
+        raise ValueError(f'num_beacons ({num_beacons}) must be positive')
+    if num_exits < 2:
+        raise ValueError(f'num_exits ({num_exits}) must be >= 2')
+    if num_exits > len(colors):
+        raise ValueError(
+            f'num_exits ({num_exits}) must be <= number of colors ({len(colors)})'
+        )
+
+    rng = get_gv_rng_if_none(rng)
+
+    colors_list = sorted(colors, key=lambda color: color.value)
+    palette = (
+        (Floor(), Wall())
+        + tuple(Exit(color) for color in colors_list)
+        + tuple(Beacon(color) for color in colors_list)
+    )
+    EXITS = 2 + np.arange(len(colors_list))
+    BEACONS = EXITS + len(colors_list)
+
+    y_splits, x_splits = _room_splits(shape, layout, prefix='shape.')
+    grid = _room_grid(n, shape, y_splits, x_splits, rng)
+    indices = np.arange(n)[:, None]
+
+    # sample agent, beacon, and exit positions
+    ys, xs = _sample_cells(grid == _FLOOR, 1 + num_beacons + num_exits, rng)
+    agent_position = np.stack([ys[:, 0], xs[:, 0]], axis=-1)
+    agent_orientation = _sample_orientations(n, list(Orientation), rng)
+
+    sample_colors = _sample_subsets(n, len(colors_list), num_exits, rng)
+    good_color = sample_colors[:, :1]
+    beacons = slice(1, 1 + num_beacons)
+    grid[indices, ys[:, beacons], xs[:, beacons]] = BEACONS[good_color]
+
+    exits = slice(1 + num_beacons, None)
+    grid[indices, ys[:, exits], xs[:, exits]] = EXITS[sample_colors]
+
+    return StateBatch(palette, grid, agent_position, agent_orientation)
+
+
+def buffered(
+    batch_reset_function: BatchResetFunction, batch_size: int
+) -> ResetFunction:
+    """Returns a reset function which serves states from batches
+
+    A new batch is generated, with the `rng` of the current call, whenever the
+    previous batch has been served.
+
+    Args:
+        batch_reset_function (BatchResetFunction):
+        batch_size (int): number of states generated at once
+    Returns:
+        ResetFunction:
+    """
+
+    if batch_size <= 0:
+        raise ValueError(f'batch_size ({batch_size}) must be positive')
+
+    batch: Optional[StateBatch] = None
+    i = batch_size
+
+    def reset_function(*, rng: Optional[rnd.Generator] = None) -> State:
+        nonlocal batch, i
+
+        if i == batch_size:
+            batch = batch_reset_function(batch_size, rng=rng)
+            i = 0
+
+        assert batch is not None
+        state = batch.state(i)
+        i += 1
+        return state
+
+    return reset_function
+
+
+def factory(name: str, **kwargs) -> BatchResetFunction:
+    name = import_if_custom(name)
+
+    try:
+        function = batch_reset_function_registry[name]
+    except KeyError as error:
+        raise ValueError(
+            f'invalid batched reset function name {name}'
+        ) from error
+
+    signature = inspect.signature(function)
+    required_keys = [
+        parameter.name
+        for parameter in batch_reset_function_registry.get_nonprotocol_parameters(
+            signature
+        )
+        if parameter.default is inspect.Parameter.empty
+    ]
+    optional_keys = [
+        parameter.name
+        for parameter in batch_reset_function_registry.get_nonprotocol_parameters(
+            signature
+        )
+        if parameter.default is not inspect.Parameter.empty
+    ]
+
+    checkraise_kwargs(kwargs, required_keys)
+    kwargs = select_kwargs(kwargs, required_keys + optional_keys)
+    return partial(function, **kwargs)
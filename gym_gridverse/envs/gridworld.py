@@ -1,20 +1,29 @@
-from typing import Optional, Tuple
+from typing import Any, Optional, Tuple
 
 import numpy.random as rnd
 
 from gym_gridverse.action import Action
 from gym_gridverse.debugging import gv_debug
 from gym_gridverse.envs import InnerEnv
+from gym_gridverse.envs.observation_cache import ObservationCache
 from gym_gridverse.envs.observation_functions import ObservationFunction
 from gym_gridverse.envs.reset_functions import ResetFunction
 from gym_gridverse.envs.reward_functions import RewardFunction
+from gym_gridverse.envs.step_context import StepContext, accepts_context
 from gym_gridverse.envs.terminating_functions import TerminatingFunction
 from gym_gridverse.envs.transition_functions import (
     TransitionFunction,
     transition_with_copy,
 )
+from gym_gridverse.envs.visibility_table import VisibilityTable
 from gym_gridverse.observation import Observation
-from gym_gridverse.rng import make_rng
+from gym_gridverse.rng import (
+    RngStreams,
+    get_gv_rng_if_none,
+    get_rng_state,
+    make_rng,
+    set_rng_state,
+)
 from gym_gridverse.spaces import ActionSpace, ObservationSpace, StateSpace
 from gym_gridverse.state import State
 
@@ -32,6 +41,9 @@ class GridWorld(InnerEnv):
         observation_function: ObservationFunction,
         reward_function: RewardFunction,
         termination_function: TerminatingFunction,
+        *,
+        observation_cache_size: int = 0,
+        visibility_table: Optional[str] = None,
     ):
         """Initializes a GridWorld from the given components.
 
@@ -44,6 +56,8 @@ class GridWorld(InnerEnv):
             observation_function (ObservationFunction):
             reward_function (RewardFunction):
             termination_function (TerminatingFunction):
+            observation_cache_size (int): maximum number of observations cached by :py:class:`~gym_gridverse.envs.observation_cache.ObservationCache`, disabled if 0
+            visibility_table (Optional[str]): if 'lazy' or 'precompute', visibility masks are stored in a :py:class:`~gym_gridverse.envs.visibility_table.VisibilityTable`, computed lazily or at reset respectively
         """
 
         # TODO: maybe add a parameter to avoid calls to `contain` everywhere
@@ -54,19 +68,83 @@ class GridWorld(InnerEnv):
         self._observation_function = observation_function
         self._reward_function = reward_function
         self._termination_function = termination_function
+        # checked once, rather than at every step
+        self._reward_accepts_context = accepts_context(reward_function)
+        self._termination_accepts_context = accepts_context(
+            termination_function
+        )
+
+        if visibility_table not in [None, 'lazy', 'precompute']:
+            raise ValueError(
+                f'invalid visibility table mode {visibility_table}'
+            )
+
+        self.visibility_table: Optional[VisibilityTable] = None
+        if visibility_table is not None:
+            self.visibility_table = VisibilityTable(
+                self._observation_function,
+                precompute=visibility_table == 'precompute',
+            )
+            self._observation_function = self.visibility_table
+
+        self.observation_cache: Optional[ObservationCache] = None
+        if observation_cache_size > 0:
+            self.observation_cache = ObservationCache(
+                self._observation_function, observation_cache_size
+            )
+            self._observation_function = self.observation_cache
 
         self._rng: Optional[rnd.Generator] = None
 
+        self.rng_streams: Optional[RngStreams] = None
+        self.env_index = 0
+        self.episode = 0
+
         super().__init__(state_space, action_space, observation_space)
 
     def set_seed(self, seed: Optional[int] = None):
         self._rng = make_rng(seed)
 
+        if self.rng_streams is not None:
+            self.set_rng_streams(
+                RngStreams(seed, block_size=self.rng_streams.block_size),
+                self.env_index,
+            )
+
+    def set_rng_streams(
+        self,
+        rng_streams: Optional[RngStreams],
+        env_index: int = 0,
+        *,
+        episode: int = 0,
+    ):
+        """Draws the randomness of each episode from its own stream
+
+        Each reset switches to the stream of the next episode of this
+        environment, so that episodes are reproducible regardless of how
+        environments are distributed across workers.
+
+        Args:
+            rng_streams (Optional[RngStreams]): random streams, or None to disable
+            env_index (int): index of this environment within the streams
+            episode (int): index of the next episode
+        """
+        self.rng_streams = rng_streams
+        self.env_index = env_index
+        self.episode = episode
+
     def functional_reset(self) -> State:
+        if self.rng_streams is not None:
+            self._rng = self.rng_streams.generator(self.env_index, self.episode)
+            self.episode += 1
+
         state = self._reset_function(rng=self._rng)
         if gv_debug() and not self.state_space.contains(state):
             raise ValueError('state does not satisfy state_space')
 
+        if self.visibility_table is not None:
+            self.visibility_table.reset(state)
+
         return state
 
     def functional_step(
@@ -87,13 +165,39 @@ class GridWorld(InnerEnv):
         if gv_debug() and not self.state_space.contains(next_state):
             raise ValueError('next_state does not satisfy state_space')
 
-        reward = self._reward_function(state, action, next_state)
-        terminal = self._termination_function(state, action, next_state)
+        # facts about the transition are computed once, and shared across
+        # reward and terminating functions which accept a context
+        context = StepContext(state, action, next_state)
+        reward = (
+            self._reward_function(state, action, next_state, context=context)
+            if self._reward_accepts_context
+            else self._reward_function(state, action, next_state)
+        )
+        terminal = (
+            self._termination_function(
+                state, action, next_state, context=context
+            )
+            if self._termination_accepts_context
+            else self._termination_function(state, action, next_state)
+        )
 
         return (next_state, reward, terminal)
 
-    def functional_observation(self, state: State) -> Observation:
-        observation = self._observation_function(state, rng=self._rng)
+    def _snapshot_data(self) -> Any:
+        # if the environment was not seeded, it draws from the library rng
+        rng_state = get_rng_state(get_gv_rng_if_none(self._rng))
+        return (self._rng, rng_state, self.episode)
+
+    def _restore_data(self, data: Any):
+        self._rng, rng_state, self.episode = data
+        set_rng_state(get_gv_rng_if_none(self._rng), rng_state)
+
+    def functional_observation(
+        self, state: State, *, rng: Optional[rnd.Generator] = None
+    ) -> Observation:
+        observation = self._observation_function(
+            state, rng=self._rng if rng is None else rng
+        )
         if gv_debug() and not self.observation_space.contains(observation):
             raise ValueError('observation does not satisfy observation_space')
 
@@ -1,12 +1,21 @@
 import abc
-from typing import Optional, Tuple
+from typing import Any, NamedTuple, Optional, Tuple
 
 from gym_gridverse.action import Action
 from gym_gridverse.observation import Observation
 from gym_gridverse.spaces import ActionSpace, ObservationSpace, StateSpace
 from gym_gridverse.state import State
 
-__all__ = ['InnerEnv']
+__all__ = ['InnerEnv', 'Snapshot']
+
+
+class Snapshot(NamedTuple):
+    """Token returned by :py:meth:`InnerEnv.snapshot`"""
+
+    state: Optional[State]
+    observation: Optional[Observation]
+    data: Any = None
+    """implementation-specific data, e.g., the rng state"""
 
 
 class InnerEnv(metaclass=abc.ABCMeta):
@@ -114,3 +123,37 @@ class InnerEnv(metaclass=abc.ABCMeta):
             self._observation = self.functional_observation(self.state)
 
         return self._observation
+
+    def snapshot(self) -> Snapshot:
+        """Returns a token which can be used to restore the current environment
+
+        The token references the current state and observation, rather than
+        copying them;  this is safe because :py:meth:`step` replaces the state
+        with a new one rather than modifying it.  Hence, the state and
+        observation should not be modified in place while a snapshot is in
+        use.
+
+        Returns:
+            Snapshot:
+        """
+        return Snapshot(self._state, self._observation, self._snapshot_data())
+
+    def restore(self, snapshot: Snapshot):
+        """Restores the environment to a snapshot
+
+        A snapshot can be restored any number of times, e.g., to branch
+        multiple rollouts from the same point.
+
+        Args:
+            snapshot (Snapshot): token returned by :py:meth:`snapshot`
+        """
+        self._state = snapshot.state
+        self._observation = snapshot.observation
+        self._restore_data(snapshot.data)
+
+    def _snapshot_data(self) -> Any:
+        """Returns implementation-specific data to include in snapshots"""
+        return None
+
+    def _restore_data(self, data: Any):
+        """Restores implementation-specific data included in snapshots"""
@@ -0,0 +1,161 @@
+from collections import OrderedDict
+from functools import partial
+from typing import Hashable, NamedTuple, Optional, Tuple
+
+import numpy.random as rnd
+
+from gym_gridverse.agent import Agent
+from gym_gridverse.envs.observation_functions import (
+    ObservationFunction,
+    observation_function_registry,
+)
+from gym_gridverse.envs.visibility_table import VisibilityTable
+from gym_gridverse.geometry import Area
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import GridObject
+from gym_gridverse.observation import Observation
+from gym_gridverse.state import State
+
+__all__ = ['ObservationCache', 'ObservationCacheInfo']
+
+# observation functions whose output depends only on the cells inside the
+# view area, the agent orientation, and the held object
+_deterministic_observation_functions = {
+    observation_function_registry['fully_transparent'],
+    observation_function_registry['partially_occluded'],
+    observation_function_registry['raytracing'],
+}
+
+
+class ObservationCacheInfo(NamedTuple):
+    """Observation cache statistics, analogous to :py:func:`functools.lru_cache`"""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def get_cacheable_area(
+    observation_function: ObservationFunction,
+) -> Optional[Area]:
+    """Returns the view area of a deterministic observation function
+
+    Args:
+        observation_function (ObservationFunction): observation function to inspect
+
+    Returns:
+        Optional[Area]: view area if the function is known to be deterministic, None otherwise
+    """
+    if isinstance(observation_function, VisibilityTable):
+        return observation_function.area
+
+    if (
+        isinstance(observation_function, partial)
+        and observation_function.func in _deterministic_observation_functions
+        and not observation_function.args
+        and set(observation_function.keywords) == {'area'}
+    ):
+        return observation_function.keywords['area']
+
+    return None
+
+
+def _object_key(grid_object: GridObject) -> Tuple[type, int, Hashable]:
+    return (type(grid_object), grid_object.state_index, grid_object.color)
+
+
+class ObservationCache:
+    """LRU cache wrapping an observation function.
+
+    The observations of deterministic observation functions
+    (``fully_transparent``, ``partially_occluded``, and ``raytracing``) only
+    depend on the cells within the view area, the agent orientation, and the
+    held object;  the observations of states which share these are computed
+    once and reused.  Any other observation function (e.g.,
+    ``stochastic_raytracing``, or custom functions) bypasses the cache.
+
+    NOTE:  Grid-objects are compared by type, state index, and color (as in
+    :py:meth:`GridObject.__eq__`), so a cached observation may contain
+    grid-objects which are equal, but not identical, to those in the state.
+    """
+
+    def __init__(
+        self, observation_function: ObservationFunction, maxsize: int = 1024
+    ):
+        """Wraps an observation function with an LRU cache
+
+        Args:
+            observation_function (ObservationFunction): observation function to wrap
+            maxsize (int): maximum number of cached observations
+        """
+        if maxsize <= 0:
+            raise ValueError(f'maxsize ({maxsize}) should be positive')
+
+        self.observation_function = observation_function
+        self.maxsize = maxsize
+        self.area = get_cacheable_area(observation_function)
+
+        self._cache: OrderedDict[Hashable, Observation] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the wrapped observation function is cacheable"""
+        return self.area is not None
+
+    def cache_info(self) -> ObservationCacheInfo:
+        return ObservationCacheInfo(
+            self._hits, self._misses, self.maxsize, len(self._cache)
+        )
+
+    def cache_clear(self):
+        self._cache.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def __call__(
+        self, state: State, *, rng: Optional[rnd.Generator] = None
+    ) -> Observation:
+        if self.area is None:
+            return self.observation_function(state, rng=rng)
+
+        key = self._key(state, self.area)
+        try:
+            observation = self._cache[key]
+        except KeyError:
+            self._misses += 1
+            observation = self.observation_function(state, rng=rng)
+            self._cache[key] = observation
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        else:
+            self._hits += 1
+            self._cache.move_to_end(key)
+
+        # the cached observation is never handed out, only copies of it
+        return Observation(
+            Grid([list(row) for row in observation.grid.objects]),
+            Agent(
+                observation.agent.position,
+                observation.agent.orientation,
+                state.agent.grid_object,
+            ),
+        )
+
+    @staticmethod
+    def _key(state: State, area: Area) -> Hashable:
+        pov_area = state.agent.transform * area
+        # only the cells within the view area are inspected;  cells outside
+        # of the grid are Hidden, as in the observation itself
+        cells = tuple(
+            _object_key(grid_object)
+            for row in state.grid.subgrid(pov_area).objects
+            for grid_object in row
+        )
+        return (
+            state.agent.orientation,
+            _object_key(state.agent.grid_object),
+            cells,
+        )
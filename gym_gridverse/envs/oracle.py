@@ -0,0 +1,281 @@
+"""Shortest-path oracle over the agent's poses.
+
+A pose is an agent (position, orientation) pair.  Under the movement and turn
+actions, the agent moves between poses deterministically, and the grid-objects
+only matter through whether they block movement;  the pose graph is therefore
+fully determined by the *layout* of the grid, i.e., which cells block movement
+and which cells are goals.  The :py:class:`ShortestPathOracle` computes the
+distance of every pose to the closest goal once per layout, and answers
+queries about the distance-to-goal and optimal actions by array lookup.
+
+NOTE:  :py:func:`~gym_gridverse.envs.reward_functions.dijkstra` computes the
+distances of *positions* from a single source, with unit-cost moves in all
+four directions.  Those are only the pose distances if the action set
+contains all four relative moves (see the tests);  e.g., with only
+``MOVE_FORWARD`` and turns, reaching a cell behind the agent takes turns
+which a position-level search does not count.  The oracle therefore runs its
+own breadth-first search over poses, using the env's actual action set.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Hashable, List, NamedTuple, Sequence, Tuple, Type
+
+import numpy as np
+
+from gym_gridverse.action import Action
+from gym_gridverse.geometry import Orientation, Position
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import Exit, GridObject
+from gym_gridverse.state import State
+
+__all__ = ['ShortestPathOracle', 'PoseTables', 'OracleCacheInfo']
+
+_orientations = list(Orientation)
+_orientation_indices = {
+    orientation: i for i, orientation in enumerate(_orientations)
+}
+
+# direction of each movement, and rotation of each turn, relative to the
+# agent orientation
+_move_orientations = {
+    Action.MOVE_FORWARD: Orientation.F,
+    Action.MOVE_LEFT: Orientation.L,
+    Action.MOVE_RIGHT: Orientation.R,
+    Action.MOVE_BACKWARD: Orientation.B,
+}
+_turn_orientations = {
+    Action.TURN_LEFT: Orientation.L,
+    Action.TURN_RIGHT: Orientation.R,
+}
+
+# blocked array, goal positions, and cache key of a grid layout
+Layout = Tuple[np.ndarray, Tuple[Position, ...], Hashable]
+
+
+class PoseTables(NamedTuple):
+    """Shortest-path tables of a layout, indexed by (y, x, orientation index)
+
+    ``distances`` contains the number of actions to the closest goal (``inf``
+    if no goal is reachable), and ``optimal`` contains one boolean mask over
+    the actions for each pose.
+    """
+
+    distances: np.ndarray
+    optimal: np.ndarray
+
+
+class OracleCacheInfo(NamedTuple):
+    """Oracle cache statistics, analogous to :py:func:`functools.lru_cache`"""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ShortestPathOracle:
+    """Shortest paths over the (position, orientation) pose graph.
+
+    Only the movement and turn actions change the agent pose;  any other
+    action (e.g., actuate or pick-and-drop) is treated as leaving the pose
+    unchanged, so that the oracle does not plan to open doors or to move
+    objects out of the way.  The tables are cached per layout, so that
+    states which only differ in their agent pose, or in grid-objects which do
+    not block movement, share the same tables.  The layout is read from the
+    grid at every query, since grids are modified in place by the
+    transition functions.
+    """
+
+    def __init__(
+        self,
+        actions: Sequence[Action],
+        *,
+        goal_type: Type[GridObject] = Exit,
+        maxsize: int = 128,
+    ):
+        """Creates an oracle for the given action set
+
+        Args:
+            actions (Sequence[Action]): environment action set, e.g., ``env.action_space.actions``
+            goal_type (Type[GridObject]): type of the goal grid-objects
+            maxsize (int): maximum number of cached layouts
+        """
+        if maxsize <= 0:
+            raise ValueError(f'maxsize ({maxsize}) should be positive')
+
+        self.actions = list(actions)
+        self.goal_type = goal_type
+        self.maxsize = maxsize
+
+        self._cache: OrderedDict[Hashable, PoseTables] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def cache_info(self) -> OracleCacheInfo:
+        return OracleCacheInfo(
+            self._hits, self._misses, self.maxsize, len(self._cache)
+        )
+
+    def cache_clear(self):
+        self._cache.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def tables(self, state: State) -> PoseTables:
+        """Returns the shortest-path tables of the state layout
+
+        Args:
+            state (State): state whose layout is used
+
+        Returns:
+            PoseTables: distances and optimal actions of every pose
+        """
+        blocked, goals, key = self._layout(state.grid)
+
+        try:
+            tables = self._cache[key]
+        except KeyError:
+            self._misses += 1
+            tables = self._compute_tables(blocked, goals)
+            self._cache[key] = tables
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        else:
+            self._hits += 1
+            self._cache.move_to_end(key)
+
+        return tables
+
+    def _layout(self, grid: Grid) -> Layout:
+        """Returns the blocked array, goals, and cache key of the grid layout"""
+        height, width = grid.shape.height, grid.shape.width
+        blocked = np.fromiter(
+            (
+                grid_object.blocks_movement
+                for row in grid.objects
+                for grid_object in row
+            ),
+            dtype=bool,
+            count=height * width,
+        ).reshape(height, width)
+        goals = tuple(grid.find(self.goal_type))
+        key = (blocked.shape, blocked.tobytes(), goals)
+        return blocked, goals, key
+
+    def distance(self, state: State) -> float:
+        """Returns the number of actions from the agent to the closest goal
+
+        Args:
+            state (State): current state
+
+        Returns:
+            float: shortest-path distance, ``inf`` if no goal is reachable
+        """
+        distances, _ = self.tables(state)
+        return float(distances[self._pose(state)])
+
+    def optimal_actions(self, state: State) -> List[Action]:
+        """Returns the actions along a shortest path to the closest goal
+
+        Args:
+            state (State): current state
+
+        Returns:
+            List[Action]: optimal actions, empty if the agent is on a goal or no goal is reachable
+        """
+        _, optimal = self.tables(state)
+        mask = optimal[self._pose(state)]
+        return [action for action, m in zip(self.actions, mask) if m]
+
+    @staticmethod
+    def _pose(state: State):
+        position = state.agent.position
+        return (
+            position.y,
+            position.x,
+            _orientation_indices[state.agent.orientation],
+        )
+
+    def _compute_tables(
+        self, blocked: np.ndarray, goals: Sequence[Position]
+    ) -> PoseTables:
+        height, width = blocked.shape
+        num_orientations = len(_orientations)
+        num_poses = blocked.size * num_orientations
+
+        # successor pose of each (flat) pose, for each action
+        successors = np.empty((len(self.actions), num_poses), dtype=np.intp)
+        for a, action in enumerate(self.actions):
+            successors[a] = self._successors(blocked, action).ravel()
+
+        distances = np.full(num_poses, np.inf)
+        frontier = np.zeros(num_poses, dtype=bool)
+        for goal in goals:
+            start = (goal.y * width + goal.x) * num_orientations
+            frontier[start : start + num_orientations] = True
+        distances[frontier] = 0.0
+
+        # layered breadth-first search, backwards from the goal poses;  only
+        # the poses which were not reached yet are inspected in each layer
+        unreached: np.ndarray = np.flatnonzero(~frontier)
+        distance = 0
+        while frontier.any() and unreached.size > 0:
+            distance += 1
+            reached = frontier[successors[:, unreached]].any(axis=0)
+            frontier = np.zeros(num_poses, dtype=bool)
+            frontier[unreached[reached]] = True
+            distances[unreached[reached]] = distance
+            unreached = unreached[~reached]
+
+        # unreachable poses have no optimal actions, since inf - 1 == inf
+        optimal = (distances[successors] == distances - 1.0) & np.isfinite(
+            distances
+        )
+        optimal = optimal.T
+        shape = (height, width, num_orientations)
+        return PoseTables(
+            distances.reshape(shape),
+            optimal.reshape(*shape, len(self.actions)),
+        )
+
+    @staticmethod
+    def _successors(blocked: np.ndarray, action: Action) -> np.ndarray:
+        """Returns the flat successor index of every pose, as (H, W, O)"""
+        height, width = blocked.shape
+        num_orientations = len(_orientations)
+        ys, xs = np.indices(blocked.shape)
+        positions = ys * width + xs
+
+        successors = np.empty((height, width, num_orientations), dtype=np.intp)
+        for o, orientation in enumerate(_orientations):
+            if action.is_move():
+                delta = Position.from_orientation(
+                    orientation * _move_orientations[action]
+                )
+                next_ys, next_xs = ys + delta.y, xs + delta.x
+                inside = (
+                    (0 <= next_ys)
+                    & (next_ys < height)
+                    & (0 <= next_xs)
+                    & (next_xs < width)
+                )
+                free = np.zeros_like(inside)
+                free[inside] = ~blocked[next_ys[inside], next_xs[inside]]
+                next_positions = np.where(
+                    free, next_ys * width + next_xs, positions
+                )
+                next_o = o
+            elif action.is_turn():
+                next_positions = positions
+                next_o = _orientation_indices[
+                    orientation * _turn_orientations[action]
+                ]
+            else:
+                next_positions = positions
+                next_o = o
+
+            successors[:, :, o] = next_positions * num_orientations + next_o
+
+        return successors
@@ -11,14 +11,13 @@ from typing_extensions import Protocol  # python3.7 compatibility
 
 from gym_gridverse.agent import Agent
 from gym_gridverse.design import (
-    draw_area,
-    draw_line_horizontal,
     draw_line_vertical,
-    draw_room_grid,
-    draw_wall_boundary,
+    fill_border,
+    fill_cartesian_product,
+    fill_room_grid,
 )
 from gym_gridverse.geometry import Orientation, Position, Shape
-from gym_gridverse.grid import Grid
+from gym_gridverse.grid import Grid, SparseGrid
 from gym_gridverse.grid_object import (
     Beacon,
     Color,
@@ -97,10 +96,16 @@ def empty(
     shape: Shape,
     random_agent: bool = False,
     random_exit: bool = False,
+    sparse: bool = False,
     *,
     rng: Optional[rnd.Generator] = None,
 ) -> State:
-    """An empty environment"""
+    """An empty environment
+
+    If `sparse` is True, the grid is a
+    :py:class:`~gym_gridverse.grid.SparseGrid` of Floors, whose per-step
+    costs do not scale with the grid size (suited to large grids).
+    """
     # TODO: test
 
     if shape.height < 4 or shape.width < 4:
@@ -110,8 +115,12 @@ def empty(
 
     # TODO: test creation (e.g. count number of walls, exits, check held item)
 
-    grid = Grid.from_shape((shape.height, shape.width))
-    draw_wall_boundary(grid)
+    grid = (
+        SparseGrid(shape)
+        if sparse
+        else Grid.from_shape((shape.height, shape.width))
+    )
+    fill_border(grid, grid.area, Wall)
 
     exit_y: int
     exit_x: int
@@ -126,11 +135,7 @@ def empty(
     grid[exit_y, exit_x] = Exit()
 
     if random_agent:
-        positions = [
-            position
-            for position in grid.area.positions()
-            if isinstance(grid[position], Floor)
-        ]
+        positions = grid.find(Floor)
         agent_position = choice(rng, positions)
         agent_orientation = choice(rng, list(Orientation))
     else:
@@ -179,7 +184,7 @@ def rooms(
         )
 
     grid = Grid.from_shape((shape.height, shape.width))
-    draw_room_grid(grid, y_splits, x_splits, Wall)
+    fill_room_grid(grid, y_splits, x_splits, Wall)
 
     # passages in horizontal walls
     for y in y_splits[1:-1]:
@@ -194,11 +199,7 @@ def rooms(
             grid[y, x] = Floor()
 
     # sample agent and exit positions
-    positions = [
-        position
-        for position in grid.area.positions()
-        if isinstance(grid[position], Floor)
-    ]
+    positions = grid.find(Floor)
     agent_position, exit_position = choices(
         rng,
         positions,
@@ -217,6 +218,7 @@ def dynamic_obstacles(
     shape: Shape,
     num_obstacles: int,
     random_agent: bool = False,
+    sparse: bool = False,
     *,
     rng: Optional[rnd.Generator] = None,
 ) -> State:
@@ -226,6 +228,7 @@ def dynamic_obstacles(
         shape (`Shape`): shape of grid
         num_obstacles (`int`): number of dynamic obstacles
         random_agent (`bool, optional`): position of agent, in corner if False
+        sparse (`bool, optional`): uses a SparseGrid, see :py:func:`empty`
         rng: (`Generator, optional`)
 
     Returns:
@@ -234,12 +237,11 @@ def dynamic_obstacles(
 
     rng = get_gv_rng_if_none(rng)
 
-    state = empty(shape, random_agent, rng=rng)
+    state = empty(shape, random_agent, sparse=sparse, rng=rng)
     vacant_positions = [
         position
-        for position in state.grid.area.positions()
-        if isinstance(state.grid[position], Floor)
-        and position != state.agent.position
+        for position in state.grid.find(Floor)
+        if position != state.agent.position
     ]
 
     try:
@@ -290,7 +292,7 @@ def keydoor(shape: Shape, *, rng: Optional[rnd.Generator] = None) -> State:
     assert isinstance(state.grid[shape.height - 2, shape.width - 2], Exit)
 
     # Generate vertical splitting wall
-    x_wall = rng.integers(2, shape.width - 3, endpoint=True)
+    x_wall = int(rng.integers(2, shape.width - 3, endpoint=True))
     line_wall = draw_line_vertical(
         state.grid, range(1, shape.height - 1), x_wall, Wall
     )
@@ -379,15 +381,15 @@ def crossing(
     # create horizontal rivers without crossings
     rivers_h = sorted([pos for direction, pos in rivers if direction is h])
     for y in rivers_h:
-        draw_line_horizontal(
-            state.grid, y, range(1, shape.width - 1), object_type
+        fill_cartesian_product(
+            state.grid, [y], range(1, shape.width - 1), object_type
         )
 
     # create vertical rivers without crossings
     rivers_v = sorted([pos for direction, pos in rivers if direction is v])
     for x in rivers_v:
-        draw_line_vertical(
-            state.grid, range(1, shape.height - 1), x, object_type
+        fill_cartesian_product(
+            state.grid, range(1, shape.height - 1), [x], object_type
         )
 
     # sample path to exit
@@ -439,9 +441,8 @@ def teleport(shape: Shape, *, rng: Optional[rnd.Generator] = None) -> State:
     positions = rng.choice(
         [
             position
-            for position in state.grid.area.positions()
-            if isinstance(state.grid[position], Floor)
-            and position != state.agent.position
+            for position in state.grid.find(Floor)
+            if position != state.agent.position
         ],
         size=num_telepods,
         replace=False,
@@ -475,13 +476,12 @@ def memory(
     rng = get_gv_rng_if_none(rng)
 
     grid = Grid.from_shape((shape.height, shape.width))
-    draw_area(grid, grid.area, Wall, fill=True)
-    draw_line_horizontal(grid, 1, range(2, shape.width - 2), Floor)
-    draw_line_horizontal(
-        grid, shape.height - 2, range(2, shape.width - 2), Floor
+    grid.fill(grid.area, Wall)
+    fill_cartesian_product(
+        grid, [1, shape.height - 2], range(2, shape.width - 2), Floor
     )
-    draw_line_vertical(
-        grid, range(2, shape.height - 2), shape.width // 2, Floor
+    fill_cartesian_product(
+        grid, range(2, shape.height - 2), [shape.width // 2], Floor
     )
 
     color_good, color_bad = choices(rng, list(colors), size=2, replace=False)
@@ -548,7 +548,7 @@ def memory_rooms(
         )
 
     grid = Grid.from_shape((shape.height, shape.width))
-    draw_room_grid(grid, y_splits, x_splits, Wall)
+    fill_room_grid(grid, y_splits, x_splits, Wall)
 
     # passages in horizontal walls
     for y in y_splits[1:-1]:
@@ -563,11 +563,7 @@ def memory_rooms(
             grid[y, x] = Floor()
 
     # sample agent, beacon, and exit positions
-    positions = [
-        position
-        for position in grid.area.positions()
-        if isinstance(grid[position], Floor)
-    ]
+    positions = grid.find(Floor)
     positions = choices(
         rng,
         positions,
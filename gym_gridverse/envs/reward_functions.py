@@ -10,10 +10,13 @@ import numpy.random as rnd
 from typing_extensions import Protocol  # python3.7 compatibility
 
 from gym_gridverse.action import Action
-from gym_gridverse.envs.utils import get_next_position
+from gym_gridverse.envs.step_context import (
+    ContextFunctions,
+    StepContext,
+    get_step_context_if_none,
+)
 from gym_gridverse.geometry import DistanceFunction, Position
 from gym_gridverse.grid_object import (
-    Beacon,
     Door,
     Exit,
     GridObject,
@@ -40,6 +43,7 @@ class RewardFunction(Protocol):
         next_state: State,
         *,
         rng: Optional[rnd.Generator] = None,
+        context: Optional[StepContext] = None,
     ) -> float:
         ...
 
@@ -54,11 +58,19 @@ class RewardFunctionRegistry(FunctionRegistry):
     ) -> List[inspect.Parameter]:
         state, action, next_state = get_positional_parameters(signature, 3)
         rng = get_keyword_parameter(signature, 'rng')
-        return [state, action, next_state, rng]
+        protocol_parameters = [state, action, next_state, rng]
+
+        # `context` is an optional protocol parameter
+        if 'context' in signature.parameters:
+            protocol_parameters.append(signature.parameters['context'])
+
+        return protocol_parameters
 
     def check_signature(self, function: RewardFunction):
         signature = inspect.signature(function)
-        state, action, next_state, rng = self.get_protocol_parameters(signature)
+        state, action, next_state, rng, *context = self.get_protocol_parameters(
+            signature
+        )
 
         # checks first 3 arguments are positional
         if state.kind not in [
@@ -102,6 +114,17 @@ class RewardFunctionRegistry(FunctionRegistry):
                 'should be allowed to be a keyword argument.'
             )
 
+        # and `context`, if present, is keyword
+        if context and context[0].kind not in [
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            inspect.Parameter.KEYWORD_ONLY,
+        ]:
+            raise TypeError(
+                f'The `context` argument ({context[0].name}) '
+                f'of a registered reward function ({function}) '
+                'should be allowed to be a keyword argument.'
+            )
+
         # checks if annotations, if given, are consistent
         if state.annotation not in [inspect.Parameter.empty, State]:
             warnings.warn(
@@ -159,6 +182,7 @@ def reduce(
     reward_functions: Sequence[RewardFunction],
     reduction: RewardReductionFunction,
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> float:
     """reduction of multiple reward functions into a single boolean value
 
@@ -169,15 +193,22 @@ def reduce(
         reward_functions (`Sequence[RewardFunction]`):
         reduction (`RewardReductionFunction`):
         rng (`Generator, optional`)
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         bool: reduction operator over the input reward functions
     """
     # TODO: test
+    context = get_step_context_if_none(context, state, action, next_state)
+    reward_functions = ContextFunctions.of(reward_functions)
 
     return reduction(
-        reward_function(state, action, next_state, rng=rng)
-        for reward_function in reward_functions
+        reward_function(state, action, next_state, rng=rng, context=context)
+        if accepts
+        else reward_function(state, action, next_state, rng=rng)
+        for reward_function, accepts in zip(
+            reward_functions, reward_functions.accepts
+        )
     )
 
 
@@ -189,6 +220,7 @@ def reduce_sum(
     *,
     reward_functions: Sequence[RewardFunction],
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> float:
     """utility reward function which sums other reward functions
 
@@ -198,6 +230,7 @@ def reduce_sum(
         next_state (`State`):
         reward_functions (`Sequence[RewardFunction]`):
         rng (`Generator, optional`)
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         float: sum of the evaluated input reward functions
@@ -210,6 +243,7 @@ def reduce_sum(
         reward_functions=reward_functions,
         reduction=sum,
         rng=rng,
+        context=context,
     )
 
 
@@ -223,6 +257,7 @@ def overlap(
     reward_on: float = 1.0,
     reward_off: float = 0.0,
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> float:
     """reward for the agent occupying the same position as another object
 
@@ -234,13 +269,17 @@ def overlap(
         reward_on (`float`): reward for when agent is on the object
         reward_off (`float`): reward for when agent is not on the object
         rng (`Generator, optional`)
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         float: one of the two input rewards
     """
+    context = get_step_context_if_none(context, state, action, next_state)
     return (
         reward_on
-        if isinstance(next_state.grid[next_state.agent.position], object_type)
+        if isinstance(
+            context.next_state_context.object_under_agent, object_type
+        )
         else reward_off
     )
 
@@ -278,6 +317,7 @@ def reach_exit(
     reward_on: float = 1.0,
     reward_off: float = 0.0,
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> float:
     """reward for the Agent being on a Exit
 
@@ -288,6 +328,7 @@ def reach_exit(
         reward_on (`float`): reward for when agent is on exit
         reward_off (`float`): reward for when agent is not on exit
         rng (`Generator, optional`)
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         float: one of the two input rewards
@@ -300,6 +341,7 @@ def reach_exit(
         reward_on=reward_on,
         reward_off=reward_off,
         rng=rng,
+        context=context,
     )
 
 
@@ -311,6 +353,7 @@ def bump_moving_obstacle(
     *,
     reward: float = -1.0,
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> float:
     """reward for the Agent bumping into on a MovingObstacle
 
@@ -320,6 +363,7 @@ def bump_moving_obstacle(
         next_state (`State`):
         reward (`float`): reward for when Agent bumps a MovingObstacle
         rng (`Generator, optional`)
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         float: the input reward or 0.0
@@ -332,6 +376,7 @@ def bump_moving_obstacle(
         reward_on=reward,
         reward_off=0.0,
         rng=rng,
+        context=context,
     )
 
 
@@ -345,6 +390,7 @@ def proportional_to_distance(
     object_type: Type[GridObject],
     reward_per_unit_distance: float = -1.0,
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> float:
     """reward proportional to distance to object
 
@@ -356,15 +402,15 @@ def proportional_to_distance(
         object_type: (`Type[GridObject]`): type of unique object in grid
         reward (`float`): reward per unit distance
         rng (`Generator, optional`)
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         float: input reward times distance to object
     """
+    context = get_step_context_if_none(context, state, action, next_state)
 
     object_position = mitt.one(
-        position
-        for position in next_state.grid.area.positions()
-        if isinstance(next_state.grid[position], object_type)
+        context.next_state_context.positions(object_type)
     )
     distance = distance_function(next_state.agent.position, object_position)
     return reward_per_unit_distance * distance
@@ -381,6 +427,7 @@ def getting_closer(
     reward_closer: float = 1.0,
     reward_further: float = -1.0,
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> float:
     """reward for getting closer or further to object
 
@@ -393,21 +440,21 @@ def getting_closer(
         reward_closer (`float`): reward for when agent gets closer to object
         reward_further (`float`): reward for when agent gets further to object
         rng (`Generator, optional`)
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         float: one of the input rewards, or 0.0 if distance has not changed
     """
+    context = get_step_context_if_none(context, state, action, next_state)
 
-    def _distance_agent_object(state):
-        object_position = mitt.one(
-            position
-            for position in state.grid.area.positions()
-            if isinstance(state.grid[position], object_type)
+    def _distance_agent_object(state_context):
+        object_position = mitt.one(state_context.positions(object_type))
+        return distance_function(
+            state_context.state.agent.position, object_position
         )
-        return distance_function(state.agent.position, object_position)
 
-    distance_prev = _distance_agent_object(state)
-    distance_next = _distance_agent_object(next_state)
+    distance_prev = _distance_agent_object(context.state_context)
+    distance_next = _distance_agent_object(context.next_state_context)
 
     return (
         reward_closer
@@ -460,6 +507,7 @@ def getting_closer_shortest_path(
     reward_closer: float = 1.0,
     reward_further: float = -1.0,
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> float:
     """reward for getting closer or further to object, *assuming normal navigation dynamics*
 
@@ -471,17 +519,16 @@ def getting_closer_shortest_path(
         reward_closer (`float`): reward for when agent gets closer to object
         reward_further (`float`): reward for when agent gets further to object
         rng (`Generator, optional`)
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         float: one of the input rewards, or 0.0 if distance has not changed
     """
+    context = get_step_context_if_none(context, state, action, next_state)
 
-    def _distance_agent_object(state):
-        object_position = mitt.one(
-            position
-            for position in state.grid.area.positions()
-            if isinstance(state.grid[position], object_type)
-        )
+    def _distance_agent_object(state_context):
+        state = state_context.state
+        object_position = mitt.one(state_context.positions(object_type))
 
         layout = tuple(
             tuple(
@@ -495,8 +542,8 @@ def getting_closer_shortest_path(
         )
         return distance_array[state.agent.position.y, state.agent.position.x]
 
-    distance_prev = _distance_agent_object(state)
-    distance_next = _distance_agent_object(next_state)
+    distance_prev = _distance_agent_object(context.state_context)
+    distance_next = _distance_agent_object(context.next_state_context)
 
     return (
         reward_closer
@@ -515,6 +562,7 @@ def bump_into_wall(
     *,
     reward: float = -1.0,
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ):
     """Returns `reward` when bumping into wall, otherwise 0
 
@@ -527,11 +575,10 @@ def bump_into_wall(
         next_state (State):
         reward (float): (optional) The reward to provide if bumping into wall
         rng (`Generator, optional`)
+        context (`StepContext, optional`): context shared across functions
     """
-
-    next_position = get_next_position(
-        state.agent.position, state.agent.orientation, action
-    )
+    context = get_step_context_if_none(context, state, action, next_state)
+    next_position = context.intended_next_position
 
     return (
         reward
@@ -633,6 +680,7 @@ def reach_exit_memory(
     reward_good: float = 1.0,
     reward_bad: float = -1.0,
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> float:
     """reward for the Agent being on a Exit
 
@@ -643,22 +691,19 @@ def reach_exit_memory(
         reward_good (`float`): reward for when agent is on the good exit
         reward_bad (`float`): reward for when agent is on the bad exit
         rng (`Generator, optional`)
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         float: one of the two input rewards
     """
     # TODO: test
+    context = get_step_context_if_none(context, state, action, next_state)
 
-    agent_grid_object = next_state.grid[next_state.agent.position]
-    grid_objects = (
-        next_state.grid[position]
-        for position in next_state.grid.area.positions()
-    )
-    beacon_color = next(
-        grid_object.color
-        for grid_object in grid_objects
-        if isinstance(grid_object, Beacon)
-    )
+    agent_grid_object = context.next_state_context.object_under_agent
+    beacon_color = context.next_state_context.beacon_color
+    if beacon_color is None:
+        # same failure as when searching the grid for the first Beacon
+        raise StopIteration('no Beacon in next_state')
 
     return (
         (reward_good if agent_grid_object.color is beacon_color else reward_bad)
@@ -693,4 +738,9 @@ def factory(name: str, **kwargs) -> RewardFunction:
 
     checkraise_kwargs(kwargs, required_keys)
     kwargs = select_kwargs(kwargs, required_keys + optional_keys)
+    if 'reward_functions' in kwargs:
+        # reduced functions are checked for a context once, when built
+        kwargs['reward_functions'] = ContextFunctions.of(
+            kwargs['reward_functions']
+        )
     return partial(function, **kwargs)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import inspect
+from functools import cached_property
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from gym_gridverse.action import Action
+from gym_gridverse.envs.utils import get_next_position
+from gym_gridverse.geometry import Position
+from gym_gridverse.grid import SparseGrid
+from gym_gridverse.grid_object import Beacon, Color, GridObject
+from gym_gridverse.state import State
+
+__all__ = [
+    'StateContext',
+    'StepContext',
+    'get_step_context_if_none',
+    'accepts_context',
+    'ContextFunctions',
+]
+
+
+class StateContext:
+    """Lazily computed facts about a single state.
+
+    Each fact is computed the first time it is queried, and memoized
+    afterwards;  the state should not be modified after the first query.
+    """
+
+    def __init__(self, state: State):
+        self.state = state
+        self._positions: Dict[Type[GridObject], List[Position]] = {}
+
+    @cached_property
+    def object_under_agent(self) -> GridObject:
+        """The grid-object occupying the agent position"""
+        return self.state.grid[self.state.agent.position]
+
+    @cached_property
+    def positions_by_type(self) -> Dict[Type[GridObject], List[Position]]:
+        """Positions of all grid-objects grouped by type, in row-major order"""
+        positions_by_type: Dict[Type[GridObject], List[Position]] = {}
+        for y, row in enumerate(self.state.grid.objects):
+            for x, grid_object in enumerate(row):
+                positions_by_type.setdefault(type(grid_object), []).append(
+                    Position(y, x)
+                )
+
+        return positions_by_type
+
+    def positions(self, object_type: Type[GridObject]) -> List[Position]:
+        """Positions of all grid-objects of the given type (or subtypes)
+
+        Dense grids are scanned once, see :py:attr:`positions_by_type`;
+        sparse grids are queried per type instead, since their lookups only
+        visit the non-default objects.
+
+        Args:
+            object_type (Type[GridObject]):
+
+        Returns:
+            List[Position]: positions, in row-major order
+        """
+        if isinstance(self.state.grid, SparseGrid):
+            try:
+                positions = self._positions[object_type]
+            except KeyError:
+                positions = self._positions[object_type] = self.state.grid.find(
+                    object_type
+                )
+
+            return list(positions)
+
+        matches = [
+            positions
+            for grid_object_type, positions in self.positions_by_type.items()
+            if issubclass(grid_object_type, object_type)
+        ]
+
+        if len(matches) == 1:
+            return list(matches[0])
+
+        return sorted(
+            (position for positions in matches for position in positions),
+            key=lambda position: position.yx,
+        )
+
+    @cached_property
+    def beacon_color(self) -> Optional[Color]:
+        """Color of the first Beacon in row-major order, if any"""
+        beacon_positions = self.positions(Beacon)
+        return (
+            self.state.grid[beacon_positions[0]].color
+            if beacon_positions
+            else None
+        )
+
+
+class StepContext:
+    """Lazily computed facts about a transition, shared between functions.
+
+    A single context is created by
+    :py:meth:`~gym_gridverse.envs.gridworld.GridWorld.functional_step` for
+    each transition, and passed to every reward and terminating function which
+    accepts a ``context`` keyword argument, so that facts which are needed by
+    multiple functions (e.g., the positions of objects) are only computed once.
+    """
+
+    def __init__(self, state: State, action: Action, next_state: State):
+        self.state = state
+        self.action = action
+        self.next_state = next_state
+
+        self.state_context = StateContext(state)
+        self.next_state_context = StateContext(next_state)
+
+    @cached_property
+    def intended_next_position(self) -> Position:
+        """The agent position intended by the action, assuming free movement"""
+        return get_next_position(
+            self.state.agent.position, self.state.agent.orientation, self.action
+        )
+
+
+def get_step_context_if_none(
+    context: Optional[StepContext],
+    state: State,
+    action: Action,
+    next_state: State,
+) -> StepContext:
+    """get a new transition context if input is None"""
+    return (
+        StepContext(state, action, next_state) if context is None else context
+    )
+
+
+def accepts_context(function: Callable) -> bool:
+    """Whether a reward or terminating function accepts a ``context`` keyword
+
+    The signature is inspected on every call;  callers which call the
+    function repeatedly should check once, and store the result.
+
+    Args:
+        function (Callable): reward or terminating function
+
+    Returns:
+        bool: True if the function accepts a ``context`` keyword argument
+    """
+    try:
+        parameter = inspect.signature(function).parameters['context']
+    except KeyError:
+        return False
+
+    return parameter.kind in [
+        inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        inspect.Parameter.KEYWORD_ONLY,
+    ]
+
+
+class ContextFunctions(tuple):
+    """Reward or terminating functions, and whether each accepts a context
+
+    The signatures are inspected once, when the functions are collected,
+    e.g., by the factories of the reduction functions.
+    """
+
+    accepts: Tuple[bool, ...]
+
+    def __new__(cls, functions: Iterable[Any]):
+        self = super().__new__(cls, functions)
+        self.accepts = tuple(accepts_context(function) for function in self)
+        return self
+
+    @classmethod
+    def of(cls, functions: Iterable[Callable]) -> ContextFunctions:
+        """Returns the functions, collected only if they were not already"""
+        return functions if isinstance(functions, cls) else cls(functions)
@@ -0,0 +1,510 @@
+"""Exports small environments as tabular MDPs.
+
+The reachable state space of a :py:class:`~gym_gridverse.envs.gridworld.GridWorld`
+is enumerated by breadth-first search from the initial states, using the
+environment's own reset and transition functions.  Stochastic reset and
+transition functions are handled by replaying them with an
+:py:class:`EnumeratingRng`, which enumerates every sequence of outcomes of
+the discrete random choices they make.
+"""
+
+from __future__ import annotations
+
+import itertools as itt
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+import numpy as np
+
+from gym_gridverse.action import Action
+from gym_gridverse.envs.gridworld import GridWorld
+from gym_gridverse.state import State
+
+__all__ = [
+    'COOMatrix',
+    'TabularMDP',
+    'EnumeratingRng',
+    'enumerate_outcomes',
+    'make_tabular_mdp',
+]
+
+T = TypeVar('T')
+
+
+class COOMatrix(NamedTuple):
+    """Sparse matrix in coordinate format"""
+
+    rows: np.ndarray
+    cols: np.ndarray
+    data: np.ndarray
+    shape: Tuple[int, int]
+
+    def toarray(self) -> np.ndarray:
+        """Returns the dense matrix, summing duplicate entries"""
+        array = np.zeros(self.shape, dtype=self.data.dtype)
+        np.add.at(array, (self.rows, self.cols), self.data)
+        return array
+
+    def to_scipy(self):
+        """Returns the matrix as a :py:class:`scipy.sparse.coo_matrix`
+
+        Requires the optional scipy dependency.
+        """
+        try:
+            from scipy.sparse import coo_matrix
+        except ImportError as e:
+            raise ImportError(
+                'COOMatrix.to_scipy() requires scipy to be installed'
+            ) from e
+
+        return coo_matrix((self.data, (self.rows, self.cols)), shape=self.shape)
+
+
+class TabularMDP(NamedTuple):
+    """Tabular representation of an environment
+
+    For each action index ``a``, ``P[a][s, s']`` is the probability of
+    transitioning from state ``s`` to state ``s'``, ``R[a][s, s']`` is the
+    reward of that transition, and ``D[a][s, s']`` is whether that transition
+    is terminal;  ``R[a]`` and ``D[a]`` share the sparsity pattern of
+    ``P[a]``.
+    """
+
+    states: List[State]
+    actions: Sequence[Action]
+    initial: np.ndarray
+    """initial state distribution"""
+    P: List[COOMatrix]
+    R: List[COOMatrix]
+    D: List[COOMatrix]
+
+    @property
+    def num_states(self) -> int:
+        return len(self.states)
+
+    def expected_rewards(self) -> np.ndarray:
+        """Returns the (num_actions, num_states) expected immediate rewards"""
+        return np.stack(
+            [
+                np.bincount(
+                    P.rows, weights=P.data * R.data, minlength=self.num_states
+                )
+                for P, R in zip(self.P, self.R)
+            ]
+        )
+
+
+class EnumeratingRng:
+    """Replaces a random generator, to enumerate the outcomes of a function.
+
+    Each random choice follows a given prefix of choice indices, and picks the
+    first option once the prefix is exhausted;  the choices made and their
+    probability are recorded, so that :py:func:`enumerate_outcomes` can
+    backtrack to the next sequence of choices.  Only discrete draws are
+    supported, i.e., :py:meth:`choice`, :py:meth:`integers`, and
+    :py:meth:`shuffle`;  continuous draws raise a ValueError.
+    """
+
+    def __init__(self, prefix: Sequence[int] = ()):
+        self.prefix = prefix
+        self.trace: List[Tuple[int, int]] = []
+        """(choice index, number of options) of each choice"""
+        self.probability = 1.0
+
+    def _choose(self, n: int, p: Optional[Sequence[float]] = None) -> int:
+        if n <= 0:
+            raise ValueError('a must be a positive integer')
+
+        i = len(self.trace)
+        c = self.prefix[i] if i < len(self.prefix) else 0
+        self.trace.append((c, n))
+        self.probability *= 1.0 / n if p is None else float(p[c])
+        return c
+
+    def choice(self, a, size=None, replace=True, p=None):
+        n = int(a) if isinstance(a, (int, np.integer)) else len(a)
+
+        if size is None:
+            c = self._choose(n, p)
+        else:
+            if p is not None:
+                raise ValueError('weighted choices of multiple elements')
+
+            options = list(range(n))
+            c = np.array(
+                [
+                    options[self._choose(n)]
+                    if replace
+                    else options.pop(self._choose(len(options)))
+                    for _ in range(size)
+                ]
+            )
+
+        return c if isinstance(a, (int, np.integer)) else np.asarray(a)[c]
+
+    def integers(self, low, high=None, size=None, endpoint=False):
+        if size is not None:
+            raise ValueError('integers can only be enumerated one at a time')
+
+        if high is None:
+            low, high = 0, low
+        if endpoint:
+            high += 1
+
+        return low + self._choose(high - low)
+
+    def shuffle(self, x):
+        # Fisher-Yates, where every permutation has the same probability
+        for i in reversed(range(1, len(x))):
+            j = self._choose(i + 1)
+            x[i], x[j] = x[j], x[i]
+
+    def random(self, *args, **kwargs):
+        raise ValueError('continuous random draws can not be enumerated')
+
+
+def enumerate_outcomes(
+    function: Callable[[EnumeratingRng], T],
+    *,
+    max_outcomes: Optional[int] = None,
+) -> Iterator[Tuple[T, float]]:
+    """Enumerates the outcomes of a function of the random generator
+
+    The function is called once for every sequence of random choices it can
+    make, which requires that the choices it makes depend only on the
+    outcomes of its previous choices.
+
+    Args:
+        function (Callable[[EnumeratingRng], T]): function to enumerate
+        max_outcomes (Optional[int]): raises a RuntimeError if exceeded
+    Returns:
+        Iterator[Tuple[T, float]]: outcomes and their probabilities
+    """
+    prefix: List[int] = []
+    for num_outcomes in itt.count(1):
+        if max_outcomes is not None and num_outcomes > max_outcomes:
+            raise RuntimeError(f'more than {max_outcomes} outcomes')
+
+        rng = EnumeratingRng(prefix)
+        outcome = function(rng)
+        if rng.probability > 0.0:
+            yield outcome, rng.probability
+
+        # backtracks to the last choice which has options left
+        trace = rng.trace
+        while trace and trace[-1][0] == trace[-1][1] - 1:
+            trace.pop()
+
+        if not trace:
+            return
+
+        prefix = [c for c, _ in trace[:-1]] + [trace[-1][0] + 1]
+
+    assert False, 'unreachable'
+
+
+@contextmanager
+def _using_rng(env: GridWorld, rng):
+    """temporarily replaces the random generator of the environment"""
+    env_rng, env_rng_streams = env._rng, env.rng_streams
+    env._rng, env.rng_streams = rng, None
+    try:
+        yield
+    finally:
+        env._rng, env.rng_streams = env_rng, env_rng_streams
+
+
+def state_key(state: State) -> Hashable:
+    """Returns a key which identifies the state, cheaper to hash than the state
+
+    Two states have the same key if and only if they compare equal.
+
+    Args:
+        state (State):
+    Returns:
+        Hashable:
+    """
+    held = state.agent.grid_object
+    return (
+        tuple(
+            (type(obj), obj.state_index, obj.color)
+            for row in state.grid.objects
+            for obj in row
+        ),
+        state.agent.position,
+        state.agent.orientation,
+        (type(held), held.state_index, held.color),
+    )
+
+
+Transition = Tuple[Optional[State], Hashable, float, float, bool]
+"""next state, next state key, probability, reward, terminal"""
+
+
+def _enumerate_resets(
+    env: GridWorld, max_outcomes: Optional[int]
+) -> List[Tuple[State, Hashable, float]]:
+    def reset(rng: EnumeratingRng) -> State:
+        with _using_rng(env, rng):
+            return env.functional_reset()
+
+    probabilities: Dict[Hashable, List] = {}
+    for state, probability in enumerate_outcomes(
+        reset, max_outcomes=max_outcomes
+    ):
+        key = state_key(state)
+        try:
+            probabilities[key][2] += probability
+        except KeyError:
+            probabilities[key] = [state, key, probability]
+
+    return [tuple(outcome) for outcome in probabilities.values()]  # type: ignore
+
+
+def _enumerate_transitions(
+    env: GridWorld,
+    state: State,
+    action: Action,
+    max_outcomes: Optional[int],
+) -> List[Transition]:
+    def step(rng: EnumeratingRng) -> Tuple[State, float, bool]:
+        with _using_rng(env, rng):
+            return env.functional_step(state, action)
+
+    transitions: Dict[Hashable, List] = {}
+    for (next_state, reward, terminal), probability in enumerate_outcomes(
+        step, max_outcomes=max_outcomes
+    ):
+        key = state_key(next_state)
+        try:
+            transitions[key, reward, terminal][2] += probability
+        except KeyError:
+            transitions[key, reward, terminal] = [
+                next_state,
+                key,
+                probability,
+                reward,
+                terminal,
+            ]
+
+    return [tuple(transition) for transition in transitions.values()]  # type: ignore
+
+
+# environment of the worker processes, set by the pool initializer
+_worker_env: Optional[GridWorld] = None
+
+# keys of the states already sent by the worker process;  the main process
+# receives results in task order, so it already knows these states
+_worker_sent_keys: Set[Hashable] = set()
+
+
+def _init_worker(env: GridWorld):
+    global _worker_env
+    _worker_env = env
+    _worker_sent_keys.clear()
+
+
+def _expand_states(
+    states: Sequence[State],
+    actions: Sequence[Action],
+    max_outcomes: Optional[int],
+    env: Optional[GridWorld] = None,
+) -> List[List[List[Transition]]]:
+    """transitions of each state and action"""
+    if env is not None:
+        return [
+            [
+                _enumerate_transitions(env, state, action, max_outcomes)
+                for action in actions
+            ]
+            for state in states
+        ]
+
+    assert _worker_env is not None
+    results: List[List[List[Transition]]] = []
+    for state in states:
+        state_transitions: List[List[Transition]] = []
+        for action in actions:
+            transitions: List[Transition] = []
+            for transition in _enumerate_transitions(
+                _worker_env, state, action, max_outcomes
+            ):
+                # avoids sending states which were sent before
+                next_state, key, probability, reward, terminal = transition
+                if key in _worker_sent_keys:
+                    transitions.append(
+                        (None, key, probability, reward, terminal)
+                    )
+                else:
+                    _worker_sent_keys.add(key)
+                    transitions.append(transition)
+
+            state_transitions.append(transitions)
+        results.append(state_transitions)
+
+    return results
+
+
+def make_tabular_mdp(
+    env: GridWorld,
+    *,
+    max_states: Optional[int] = None,
+    max_outcomes: Optional[int] = None,
+    num_workers: int = 0,
+    chunk_size: int = 256,
+) -> TabularMDP:
+    """Enumerates the reachable states of an environment into a tabular MDP
+
+    States are deduplicated by :py:func:`state_key`, i.e., by equality, so
+    distinct states which compare equal, e.g., boxes with different contents,
+    are merged.
+    Reward and terminating functions are assumed to be deterministic given
+    the transition, and rewards of merged outcomes must coincide.
+
+    Args:
+        env (GridWorld): environment to enumerate
+        max_states (Optional[int]): raises a RuntimeError if exceeded
+        max_outcomes (Optional[int]): maximum number of outcomes of a single reset or step
+        num_workers (int): number of worker processes, or 0 to expand states in this process
+        chunk_size (int): number of states expanded per worker task
+    Returns:
+        TabularMDP:
+    """
+    actions = env.action_space.actions
+    num_actions = len(actions)
+
+    index: Dict[Hashable, int] = {}
+    states: List[State] = []
+
+    def get_index(state: Optional[State], key: Hashable) -> int:
+        try:
+            return index[key]
+        except KeyError:
+            assert state is not None
+            if max_states is not None and len(states) >= max_states:
+                raise RuntimeError(f'more than {max_states} reachable states')
+
+            index[key] = len(states)
+            states.append(state)
+            return index[key]
+
+    initial_outcomes = _enumerate_resets(env, max_outcomes)
+    initial_indices = [
+        get_index(state, key) for state, key, _ in initial_outcomes
+    ]
+
+    # (state, next state, probability, reward, terminal) of each action
+    entries: List[List[Tuple[int, int, float, float, bool]]] = [
+        [] for _ in range(num_actions)
+    ]
+
+    executor = (
+        ProcessPoolExecutor(
+            num_workers, initializer=_init_worker, initargs=(env,)
+        )
+        if num_workers > 0
+        else None
+    )
+
+    try:
+        frontier_begin = 0
+        while frontier_begin < len(states):
+            frontier_end = len(states)
+            frontier = states[frontier_begin:frontier_end]
+            chunks = [
+                frontier[i : i + chunk_size]
+                for i in range(0, len(frontier), chunk_size)
+            ]
+
+            results: Iterator[List[List[List[Transition]]]] = (
+                executor.map(
+                    _expand_states,
+                    chunks,
+                    [actions] * len(chunks),
+                    [max_outcomes] * len(chunks),
+                )
+                if executor is not None
+                else (
+                    _expand_states(chunk, actions, max_outcomes, env)
+                    for chunk in chunks
+                )
+            )
+
+            # states are indexed in the same order regardless of workers
+            s = frontier_begin
+            for chunk_transitions in results:
+                for state_transitions in chunk_transitions:
+                    for a, transitions in enumerate(state_transitions):
+                        for (
+                            next_state,
+                            key,
+                            probability,
+                            reward,
+                            terminal,
+                        ) in transitions:
+                            entries[a].append(
+                                (
+                                    s,
+                                    get_index(next_state, key),
+                                    probability,
+                                    reward,
+                                    terminal,
+                                )
+                            )
+                    s += 1
+
+            frontier_begin = frontier_end
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    num_states = len(states)
+    shape = (num_states, num_states)
+
+    initial = np.zeros(num_states)
+    for i, (_, _, probability) in zip(initial_indices, initial_outcomes):
+        initial[i] += probability
+
+    P, R, D = [], [], []
+    for action_entries in entries:
+        rows = np.array([entry[0] for entry in action_entries], dtype=int)
+        cols = np.array([entry[1] for entry in action_entries], dtype=int)
+        P.append(
+            COOMatrix(
+                rows,
+                cols,
+                np.array([entry[2] for entry in action_entries], dtype=float),
+                shape,
+            )
+        )
+        R.append(
+            COOMatrix(
+                rows,
+                cols,
+                np.array([entry[3] for entry in action_entries], dtype=float),
+                shape,
+            )
+        )
+        D.append(
+            COOMatrix(
+                rows,
+                cols,
+                np.array([entry[4] for entry in action_entries], dtype=bool),
+                shape,
+            )
+        )
+
+    return TabularMDP(states, actions, initial, P, R, D)
@@ -7,7 +7,11 @@ import numpy.random as rnd
 from typing_extensions import Protocol  # python3.7 compatibility
 
 from gym_gridverse.action import Action
-from gym_gridverse.envs.utils import get_next_position
+from gym_gridverse.envs.step_context import (
+    ContextFunctions,
+    StepContext,
+    get_step_context_if_none,
+)
 from gym_gridverse.grid_object import Exit, GridObject, MovingObstacle, Wall
 from gym_gridverse.state import State
 from gym_gridverse.utils.custom import import_if_custom
@@ -29,6 +33,7 @@ class TerminatingFunction(Protocol):
         next_state: State,
         *,
         rng: Optional[rnd.Generator] = None,
+        context: Optional[StepContext] = None,
     ) -> bool:
         ...
 
@@ -43,11 +48,19 @@ class TerminatingFunctionRegistry(FunctionRegistry):
     ) -> List[inspect.Parameter]:
         state, action, next_state = get_positional_parameters(signature, 3)
         rng = get_keyword_parameter(signature, 'rng')
-        return [state, action, next_state, rng]
+        protocol_parameters = [state, action, next_state, rng]
+
+        # `context` is an optional protocol parameter
+        if 'context' in signature.parameters:
+            protocol_parameters.append(signature.parameters['context'])
+
+        return protocol_parameters
 
     def check_signature(self, function: TerminatingFunction):
         signature = inspect.signature(function)
-        state, action, next_state, rng = self.get_protocol_parameters(signature)
+        state, action, next_state, rng, *context = self.get_protocol_parameters(
+            signature
+        )
 
         # checks first 3 arguments are positional
         if state.kind not in [
@@ -91,6 +104,17 @@ class TerminatingFunctionRegistry(FunctionRegistry):
                 'should be allowed to be a keyword argument.'
             )
 
+        # and `context`, if present, is keyword
+        if context and context[0].kind not in [
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            inspect.Parameter.KEYWORD_ONLY,
+        ]:
+            raise TypeError(
+                f'The `context` argument ({context[0].name}) '
+                f'of a registered terminating function ({function}) '
+                'should be allowed to be a keyword argument.'
+            )
+
         # checks if annotations, if given, are consistent
         if state.annotation not in [inspect.Parameter.empty, State]:
             warnings.warn(
@@ -148,6 +172,7 @@ def reduce(
     terminating_functions: Sequence[TerminatingFunction],
     reduction: TerminatingReductionFunction,
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> bool:
     """reduction of multiple terminating functions into a single boolean value
 
@@ -157,14 +182,24 @@ def reduce(
         next_state (`State`):
         terminating_functions (`Sequence[TerminatingFunction]`):
         reduction (`TerminatingReductionFunction`):
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         bool: reduction operator over the input terminating functions
     """
     # TODO: test
+    context = get_step_context_if_none(context, state, action, next_state)
+    terminating_functions = ContextFunctions.of(terminating_functions)
+
     return reduction(
-        terminating_function(state, action, next_state, rng=rng)
-        for terminating_function in terminating_functions
+        terminating_function(
+            state, action, next_state, rng=rng, context=context
+        )
+        if accepts
+        else terminating_function(state, action, next_state, rng=rng)
+        for terminating_function, accepts in zip(
+            terminating_functions, terminating_functions.accepts
+        )
     )
 
 
@@ -176,6 +211,7 @@ def reduce_any(
     *,
     terminating_functions: Sequence[TerminatingFunction],
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> bool:
     """utility function terminates when any of the input functions terminates
 
@@ -184,6 +220,7 @@ def reduce_any(
         action (`Action`):
         next_state (`State`):
         terminating_functions (`Sequence[TerminatingFunction]`):
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         bool: OR operator over the input terminating functions
@@ -196,6 +233,7 @@ def reduce_any(
         terminating_functions=terminating_functions,
         reduction=any,
         rng=rng,
+        context=context,
     )
 
 
@@ -207,6 +245,7 @@ def reduce_all(
     *,
     terminating_functions: Sequence[TerminatingFunction],
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> bool:
     """utility function terminates when all of the input functions terminates
 
@@ -215,6 +254,7 @@ def reduce_all(
         action (`Action`):
         next_state (`State`):
         terminating_functions (`Sequence[TerminatingFunction]`):
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         bool: AND operator over the input terminating functions
@@ -227,6 +267,7 @@ def reduce_all(
         terminating_functions=terminating_functions,
         reduction=all,
         rng=rng,
+        context=context,
     )
 
 
@@ -238,6 +279,7 @@ def overlap(
     *,
     object_type: Type[GridObject],
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> bool:
     """terminating condition for agent occupying same position as an object
 
@@ -246,11 +288,15 @@ def overlap(
         action (`Action`):
         next_state (`State`):
         object_type (`Type[GridObject]`):
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         bool: True if next_state agent is on object of type object_type
     """
-    return isinstance(next_state.grid[next_state.agent.position], object_type)
+    context = get_step_context_if_none(context, state, action, next_state)
+    return isinstance(
+        context.next_state_context.object_under_agent, object_type
+    )
 
 
 @terminating_function_registry.register
@@ -260,6 +306,7 @@ def reach_exit(
     next_state: State,
     *,
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> bool:
     """terminating condition for Agent reaching the Exit
 
@@ -267,11 +314,14 @@ def reach_exit(
         state (`State`):
         action (`Action`):
         next_state (`State`):
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         bool: True if next_state agent is on exit
     """
-    return overlap(state, action, next_state, object_type=Exit, rng=rng)
+    return overlap(
+        state, action, next_state, object_type=Exit, rng=rng, context=context
+    )
 
 
 @terminating_function_registry.register
@@ -281,6 +331,7 @@ def bump_moving_obstacle(
     next_state: State,
     *,
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> bool:
     """terminating condition for Agent bumping a moving obstacle
 
@@ -288,13 +339,19 @@ def bump_moving_obstacle(
         state (`State`):
         action (`Action`):
         next_state (`State`):
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         bool: True if next_state agent is on a MovingObstacle
     """
     # TODO: test
     return overlap(
-        state, action, next_state, object_type=MovingObstacle, rng=rng
+        state,
+        action,
+        next_state,
+        object_type=MovingObstacle,
+        rng=rng,
+        context=context,
     )
 
 
@@ -305,6 +362,7 @@ def bump_into_wall(
     next_state: State,
     *,
     rng: Optional[rnd.Generator] = None,
+    context: Optional[StepContext] = None,
 ) -> bool:
     """Terminating condition for Agent bumping into a wall
 
@@ -314,13 +372,13 @@ def bump_into_wall(
         state (`State`):
         action (`Action`):
         next_state (`State`):
+        context (`StepContext, optional`): context shared across functions
 
     Returns:
         bool: True if next_state agent attempted to move onto a wall cell
     """
-    next_position = get_next_position(
-        state.agent.position, state.agent.orientation, action
-    )
+    context = get_step_context_if_none(context, state, action, next_state)
+    next_position = context.intended_next_position
 
     return state.grid.area.contains(next_position) and isinstance(
         state.grid[next_position], Wall
@@ -353,4 +411,9 @@ def factory(name: str, **kwargs) -> TerminatingFunction:
 
     checkraise_kwargs(kwargs, required_keys)
     kwargs = select_kwargs(kwargs, required_keys + optional_keys)
+    if 'terminating_functions' in kwargs:
+        # reduced functions are checked for a context once, when built
+        kwargs['terminating_functions'] = ContextFunctions.of(
+            kwargs['terminating_functions']
+        )
     return partial(function, **kwargs)
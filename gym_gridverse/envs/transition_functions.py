@@ -2,14 +2,24 @@
 import inspect
 import warnings
 from functools import partial
-from typing import List, Optional, Sequence
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
+import numpy as np
 import numpy.random as rnd
 from typing_extensions import Protocol  # python3.7 compatibility
 
 from gym_gridverse.action import Action
 from gym_gridverse.envs.utils import get_next_position
-from gym_gridverse.geometry import Orientation, get_manhattan_boundary
+from gym_gridverse.geometry import Orientation, Position, get_manhattan_boundary
 from gym_gridverse.grid_object import (
     Box,
     Door,
@@ -128,6 +138,89 @@ transition_function_registry = TransitionFunctionRegistry()
 """Transition function registry"""
 
 
+def responds_to(*actions: Action) -> Callable[[Callable], Callable]:
+    """Declares the actions which a transition function responds to
+
+    A transition function which declares its actions promises to leave the
+    state unaffected by any other action, which lets
+    :py:func:`compile_transition_table` skip it entirely for those actions.
+    Transition functions without a declaration are assumed to respond to
+    every action.
+
+    Usage:
+
+        >>> @transition_function_registry.register
+        >>> @responds_to(Action.ACTUATE)
+        >>> def function(...):
+                ...
+
+    Args:
+        *actions (Action): actions which the transition function responds to
+
+    Returns:
+        Callable: decorator which annotates the transition function
+    """
+
+    def responds_to_decorator(function):
+        function.responds_to = frozenset(actions)
+        return function
+
+    return responds_to_decorator
+
+
+def get_responds_to(
+    transition_function: TransitionFunction,
+) -> Optional[FrozenSet[Action]]:
+    """Returns the actions a transition function responds to, if declared
+
+    Args:
+        transition_function (`TransitionFunction`):
+
+    Returns:
+        Optional[FrozenSet[Action]]: declared actions, or None if undeclared
+    """
+    function = (
+        transition_function.func
+        if isinstance(transition_function, partial)
+        else transition_function
+    )
+    return getattr(function, 'responds_to', None)
+
+
+TransitionTable = Mapping[Action, Sequence[TransitionFunction]]
+"""Maps each action to the transition functions which respond to it"""
+
+
+def compile_transition_table(
+    transition_functions: Sequence[TransitionFunction],
+) -> Dict[Action, Tuple[TransitionFunction, ...]]:
+    """Compiles a per-action dispatch table of transition functions
+
+    The relative order of the transition functions is preserved for each
+    action.
+
+    Args:
+        transition_functions (`Sequence[TransitionFunction]`): transition functions
+
+    Returns:
+        Dict[Action, Tuple[TransitionFunction, ...]]: dispatch table
+    """
+    responds_tos = [
+        get_responds_to(transition_function)
+        for transition_function in transition_functions
+    ]
+    return {
+        action: tuple(
+            transition_function
+            for transition_function, actions in zip(
+                transition_functions, responds_tos
+            )
+            if actions is None or action in actions
+        )
+        for action in Action
+    }
+
+
 @transition_function_registry.register
 def chain(
     state: State,
@@ -152,6 +245,35 @@ def chain(
 
 
 @transition_function_registry.register
+def dispatch(
+    state: State,
+    action: Action,
+    *,
+    transition_table: TransitionTable,
+    rng: Optional[rnd.Generator] = None,
+) -> None:
+    """Run the transition functions which respond to the action, in a row
+
+    Args:
+        state (`State`):
+        action (`Action`):
+        transition_table (`TransitionTable`): see :py:func:`compile_transition_table`
+        rng (`Generator, optional`)
+
+    Returns:
+        None
+    """
+    for transition_function in transition_table[action]:
+        transition_function(state, action, rng=rng)
+
+
+@transition_function_registry.register
+@responds_to(
+    Action.MOVE_FORWARD,
+    Action.MOVE_BACKWARD,
+    Action.MOVE_LEFT,
+    Action.MOVE_RIGHT,
+)
 def move_agent(
     state: State,
     action: Action,
@@ -189,6 +311,7 @@ def move_agent(
 
 
 @transition_function_registry.register
+@responds_to(Action.TURN_LEFT, Action.TURN_RIGHT)
 def turn_agent(
     state: State,
     action: Action,
@@ -223,6 +346,7 @@ _action_orientations = {
 
 
 @transition_function_registry.register
+@responds_to(Action.PICK_N_DROP)
 def pickndrop(
     state: State,
     action: Action,
@@ -292,11 +416,7 @@ def move_obstacles(
     rng = get_gv_rng_if_none(rng)
 
     # get all positions before performing any movement
-    positions = [
-        position
-        for position in state.grid.area.positions()
-        if isinstance(state.grid[position], MovingObstacle)
-    ]
+    positions = state.grid.find(MovingObstacle)
 
     for position in positions:
         next_positions = [
@@ -315,7 +435,83 @@ def move_obstacles(
             state.grid.swap(position, next_position)
 
 
+# (dy, dx) of the neighbouring cells, in the same (clockwise from top) order as
+# `get_manhattan_boundary(position, distance=1)`
+_neighbour_offsets = np.array([[-1, 0], [0, 1], [1, 0], [0, -1]])
+
+
+@transition_function_registry.register
+def move_obstacles_simultaneous(
+    state: State,
+    action: Action,
+    *,
+    rng: Optional[rnd.Generator] = None,
+) -> None:
+    """Moves moving obstacles randomly and simultaneously
+
+    Array-based alternative to :py:func:`move_obstacles`.  Each
+    MovingObstacle randomly chooses a neighbouring cell which is a Floor at
+    the beginning of the step;  the random choices of all obstacles are drawn
+    with a single rng call.  If multiple obstacles choose the same cell, the
+    first obstacle in row-major order moves there, and the others stay in
+    place.  All moves are then applied at once.
+
+    Unlike :py:func:`move_obstacles`, an obstacle can not move into a cell
+    which was vacated by another obstacle during the same step.
+
+    Args:
+        state (`State`): current state
+        action (`Action`): action taken by agent (ignored)
+    """
+    rng = get_gv_rng_if_none(rng)
+
+    width = state.grid.shape.width
+
+    # obstacle positions are in row-major order
+    obstacle_positions = state.grid.find(MovingObstacle)
+    if not obstacle_positions:
+        return
+
+    # (num_obstacles, 4, 2) neighbouring positions, and whether they are free;
+    # only the neighbourhoods of obstacles are inspected
+    positions = np.array([position.yx for position in obstacle_positions])
+    next_positions = positions[:, None, :] + _neighbour_offsets[None, :, :]
+    free = np.array(
+        [
+            [
+                state.grid.area.contains(next_position)
+                and isinstance(state.grid[next_position], Floor)
+                for next_position in (Position(y, x) for y, x in neighbours)
+            ]
+            for neighbours in next_positions.tolist()
+        ],
+        dtype=bool,
+    )
+
+    # chooses uniformly among the free neighbours of each obstacle, i.e., the
+    # `choices`-th free neighbour
+    num_free = free.sum(axis=1)
+    movers = np.flatnonzero(num_free)
+    choices = (rng.random(len(movers)) * num_free[movers]).astype(int)
+    directions = np.argmax(
+        free[movers].cumsum(axis=1) > choices[:, None], axis=1
+    )
+    targets = next_positions[movers, directions]
+
+    # resolves collisions in favour of the first obstacle in row-major order
+    _, winners = np.unique(
+        targets[:, 0] * width + targets[:, 1], return_index=True
+    )
+
+    # positions are built from python ints, not numpy scalars
+    for i in winners.tolist():
+        y, x = positions[movers[i]].tolist()
+        next_y, next_x = targets[i].tolist()
+        state.grid.swap(Position(y, x), Position(next_y, next_x))
+
+
 @transition_function_registry.register
+@responds_to(Action.ACTUATE)
 def actuate_door(
     state: State,
     action: Action,
@@ -361,6 +557,7 @@ def actuate_door(
 
 
 @transition_function_registry.register
+@responds_to(Action.ACTUATE)
 def actuate_box(
     state: State,
     action: Action,
@@ -408,9 +605,8 @@ def teleport(
     if isinstance(telepod, Telepod):
         positions = [
             position
-            for position in state.grid.area.positions()
+            for position in state.grid.find(Telepod)
             if position != state.agent.position
-            and isinstance(state.grid[position], Telepod)
             and state.grid[position].color == telepod.color
         ]
         i = rng.choice(len(positions))
@@ -9,6 +9,15 @@ _move_action_to_orientation = {
     Action.MOVE_BACKWARD: Orientation.B,
 }
 
+# maps action and orientation to movement offset
+_move_offsets = {
+    action: {
+        orientation: Position.from_orientation(orientation * move_orientation)
+        for orientation in Orientation
+    }
+    for action, move_orientation in _move_action_to_orientation.items()
+}
+
 
 def get_next_position(
     position: Position, orientation: Orientation, action: Action
@@ -27,8 +36,8 @@ def get_next_position(
     """
 
     try:
-        move_orientation = _move_action_to_orientation[action]
+        offsets = _move_offsets[action]
     except KeyError:
         return position
 
-    return position + Position.from_orientation(orientation * move_orientation)
+    return position + offsets[orientation]
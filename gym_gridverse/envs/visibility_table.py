@@ -0,0 +1,196 @@
+from collections import OrderedDict
+from functools import partial
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import numpy.random as rnd
+
+from gym_gridverse.agent import Agent
+from gym_gridverse.envs.observation_functions import (
+    ObservationFunction,
+    observation_function_registry,
+)
+from gym_gridverse.envs.visibility_functions import (
+    VisibilityFunction,
+    visibility_function_registry,
+)
+from gym_gridverse.geometry import Area, Orientation, Position
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import Hidden
+from gym_gridverse.observation import Observation
+from gym_gridverse.state import State
+
+__all__ = ['VisibilityTable']
+
+# maps deterministic observation functions to their visibility functions
+_deterministic_visibility_functions = {
+    observation_function_registry[name]: visibility_function_registry[name]
+    for name in ['fully_transparent', 'partially_occluded', 'raytracing']
+}
+
+Pose = Tuple[Position, Orientation]
+BlockerPattern = Tuple[bool, ...]
+
+
+class VisibilityTable:
+    """Pose-keyed table of visibility masks, wrapping an observation function.
+
+    Deterministic visibility functions only depend on which cells within the
+    view area block vision.  In environments where the only vision-blocking
+    objects are static (e.g., walls), this pattern depends only on the agent
+    pose, and the visibility of each pose needs to be computed only once.
+
+    The table stores the visibility masks of each (position, orientation)
+    pose, along with the blocker pattern they were computed for.  The pattern
+    is re-checked at every lookup, so that if a dynamic blocker (e.g., a
+    :py:class:`~gym_gridverse.grid_object.Door`) changes state, the visibility
+    is recomputed live and stored alongside the previous one.
+
+    Masks are either computed lazily, the first time a pose is observed, or
+    precomputed for every pose at reset time.  Observation functions other
+    than ``fully_transparent``, ``partially_occluded``, and ``raytracing``
+    bypass the table.
+    """
+
+    def __init__(
+        self,
+        observation_function: ObservationFunction,
+        *,
+        precompute: bool = False,
+        max_patterns_per_pose: int = 4,
+    ):
+        """Wraps an observation function with a visibility table
+
+        Args:
+            observation_function (ObservationFunction): observation function to wrap
+            precompute (bool): if True, visibility masks of every pose are computed at reset
+            max_patterns_per_pose (int): maximum number of blocker patterns stored per pose
+        """
+        if max_patterns_per_pose <= 0:
+            raise ValueError(
+                f'max_patterns_per_pose ({max_patterns_per_pose}) should be positive'
+            )
+
+        self.observation_function = observation_function
+        self.precompute = precompute
+        self.max_patterns_per_pose = max_patterns_per_pose
+
+        self.area: Optional[Area] = None
+        self.visibility_function: Optional[VisibilityFunction] = None
+        if (
+            isinstance(observation_function, partial)
+            and observation_function.func in _deterministic_visibility_functions
+            and not observation_function.args
+            and set(observation_function.keywords) == {'area'}
+        ):
+            self.area = observation_function.keywords['area']
+            self.visibility_function = _deterministic_visibility_functions[
+                observation_function.func
+            ]
+
+        self._table: Dict[Pose, OrderedDict[BlockerPattern, np.ndarray]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the wrapped observation function uses the table"""
+        return self.area is not None
+
+    def __len__(self) -> int:
+        """Number of stored visibility masks"""
+        return sum(len(masks) for masks in self._table.values())
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def clear(self):
+        self._table.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def reset(self, state: State):
+        """Precomputes the visibility masks of every pose, if enabled
+
+        Only positions which the agent can occupy are considered;  poses
+        whose mask is already stored are not recomputed, so that tables of
+        static layouts are only filled once.
+
+        Args:
+            state (State): initial state of an episode
+        """
+        if not self.enabled or not self.precompute:
+            return
+
+        agent = state.agent
+        for position in state.grid.area.positions():
+            if state.grid[position].blocks_movement:
+                continue
+
+            for orientation in Orientation:
+                pov_state = State(
+                    state.grid, Agent(position, orientation, agent.grid_object)
+                )
+                self._visibility(self._observation_grid(pov_state), pov_state)
+
+    def __call__(
+        self, state: State, *, rng: Optional[rnd.Generator] = None
+    ) -> Observation:
+        if self.area is None:
+            return self.observation_function(state, rng=rng)
+
+        observation_grid = self._observation_grid(state)
+        visibility = self._visibility(observation_grid, state)
+
+        for pos in observation_grid.area.positions():
+            if not visibility[pos.y, pos.x]:
+                observation_grid[pos] = Hidden()
+
+        observation_agent = Agent(
+            self._pov_agent_position,
+            Orientation.F,
+            state.agent.grid_object,
+        )
+        return Observation(observation_grid, observation_agent)
+
+    @property
+    def _pov_agent_position(self) -> Position:
+        assert self.area is not None
+        return Position(-self.area.ymin, -self.area.xmin)
+
+    def _observation_grid(self, state: State) -> Grid:
+        assert self.area is not None
+        pov_area = state.agent.transform * self.area
+        return state.grid.subgrid(pov_area) * state.agent.orientation
+
+    def _visibility(self, observation_grid: Grid, state: State) -> np.ndarray:
+        assert self.visibility_function is not None
+
+        pose = (state.agent.position, state.agent.orientation)
+        pattern = tuple(
+            grid_object.blocks_vision
+            for row in observation_grid.objects
+            for grid_object in row
+        )
+
+        masks = self._table.setdefault(pose, OrderedDict())
+        try:
+            visibility = masks[pattern]
+        except KeyError:
+            self._misses += 1
+            visibility = masks[pattern] = self.visibility_function(
+                observation_grid, self._pov_agent_position
+            )
+            visibility.flags.writeable = False
+            if len(masks) > self.max_patterns_per_pose:
+                masks.popitem(last=False)
+        else:
+            self._hits += 1
+            masks.move_to_end(pattern)
+
+        return visibility
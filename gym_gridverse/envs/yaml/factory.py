@@ -206,8 +206,18 @@ def factory_env_from_data(data) -> InnerEnv:
     )
 
     reset_function = factory_reset_function(data['reset_function'])
+    # transition functions are dispatched according to the actions they
+    # respond to, see `transition_functions.responds_to`
     transition_function = factory_transition_function(
-        {'name': 'chain', 'transition_functions': data['transition_functions']}
+        {
+            'name': 'dispatch',
+            'transition_table': transition_fs.compile_transition_table(
+                [
+                    factory_transition_function(d)
+                    for d in data['transition_functions']
+                ]
+            ),
+        }
     )
     reward_function = factory_reward_function(
         {'name': 'reduce_sum', 'reward_functions': data['reward_functions']}
@@ -236,6 +246,8 @@ def factory_env_from_data(data) -> InnerEnv:
         observation_function,
         reward_function,
         terminating_function,
+        observation_cache_size=data.get('observation_cache_size', 0),
+        visibility_table=data.get('visibility_table'),
     )
 
 
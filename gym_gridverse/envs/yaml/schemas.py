@@ -242,6 +242,12 @@ schemas.update(
                 'reward_functions': schemas['reward_functions'],
                 'observation_function': schemas['observation_function'],
                 'terminating_function': schemas['terminating_function'],
+                Optional('observation_cache_size'): And(
+                    int,
+                    lambda n: n >= 0,
+                    error='observation_cache_size should be non-negative',
+                ),
+                Optional('visibility_table'): Or('lazy', 'precompute'),
             },
         )
     }
@@ -1,10 +1,24 @@
 from __future__ import annotations
 
 import enum
+import functools
 import itertools as itt
 import math
 from dataclasses import dataclass
-from typing import Callable, Iterable, List, Sequence, Tuple, Union, overload
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+# NOTE:  geometric types are slotted, and the frozen ones define `__reduce__`
+# because frozen slotted dataclasses cannot be unpickled through `setattr`.
 
 
 @dataclass(frozen=True)
@@ -15,9 +29,14 @@ class Shape:
     is number of columns.
     """
 
+    __slots__ = ('height', 'width')
+
     height: int
     width: int
 
+    def __reduce__(self):
+        return Shape, (self.height, self.width)
+
     @property
     def as_tuple(self) -> Tuple[int, int]:
         return self.height, self.width
@@ -27,6 +46,8 @@ class Shape:
 class Area:
     """2D area, which extends vertically and horizontally"""
 
+    __slots__ = ('ys', 'xs')
+
     ys: Tuple[int, int]
     xs: Tuple[int, int]
 
@@ -36,6 +57,9 @@ class Area:
         if self.xs[0] > self.xs[1]:
             raise ValueError('xs ({self.xs}) should be non-decreasing')
 
+    def __reduce__(self):
+        return Area, (self.ys, self.xs)
+
     @staticmethod
     def from_positions(positions: Sequence[Position]) -> Area:
         ys, xs = zip(*(position.yx for position in positions))
@@ -76,6 +100,8 @@ class Area:
     def positions(self, selection: str = 'all') -> Iterable[Position]:
         """iterator over all/border/inside positions
 
+        The positions of recently used areas are cached.
+
         Args:
             selection (str): 'all', 'border', or 'inside'
         Returns:
@@ -85,37 +111,7 @@ class Area:
         if selection not in ['all', 'border', 'inside']:
             raise ValueError(f'invalid selection `{selection}`')
 
-        positions: Iterable[Position]
-
-        if selection == 'all':
-            positions = (
-                Position(y, x)
-                for y in self.y_coordinates()
-                for x in self.x_coordinates()
-            )
-
-        elif selection == 'border':
-            positions = itt.chain(
-                (
-                    Position(y, x)
-                    for y in [self.ymin, self.ymax]
-                    for x in range(self.xmin, self.xmax + 1)
-                ),
-                (
-                    Position(y, x)
-                    for y in range(self.ymin + 1, self.ymax)
-                    for x in [self.xmin, self.xmax]
-                ),
-            )
-
-        elif selection == 'inside':
-            positions = (
-                Position(y, x)
-                for y in range(self.ymin + 1, self.ymax)
-                for x in range(self.xmin + 1, self.xmax)
-            )
-
-        return positions
+        return _area_positions(self.ys, self.xs, selection)
 
     def contains(self, position: Position) -> bool:
         return (
@@ -124,13 +120,60 @@ class Area:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, init=False, eq=False)
 class Position:
-    """2D position (y, x), with `y` extending downward and `x` extending rightward"""
+    """2D position (y, x), with `y` extending downward and `x` extending rightward
+
+    Positions with small integer coordinates are interned, i.e., constructing
+    the same position twice returns the same object.
+    """
+
+    __slots__ = ('y', 'x', '_hash')
 
     y: int
     x: int
 
+    # declared for type checkers only:  a dataclass field would show in the
+    # repr, and a field default would conflict with the slot
+    if TYPE_CHECKING:
+        _hash: int
+
+    def __new__(cls, y: int, x: int) -> Position:
+        try:
+            return _interned_positions[y, x]
+        except KeyError:
+            pass
+
+        position = object.__new__(cls)
+        object.__setattr__(position, 'y', y)
+        object.__setattr__(position, 'x', x)
+        object.__setattr__(position, '_hash', hash((y, x)))
+
+        if (
+            type(y) is int
+            and type(x) is int
+            and -_INTERN_BOUND <= y < _INTERN_BOUND
+            and -_INTERN_BOUND <= x < _INTERN_BOUND
+        ):
+            _interned_positions[y, x] = position
+
+        return position
+
+    def __reduce__(self):
+        return Position, (self.y, self.x)
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+
+        if isinstance(other, Position):
+            return self.y == other.y and self.x == other.x
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return self._hash
+
     @property
     def yx(self) -> Tuple[int, int]:
         return self.y, self.x
@@ -198,6 +241,10 @@ class Orientation(enum.Enum):
     L = LEFT
     R = RIGHT
 
+    # members are singletons compared by identity, so the identity hash is
+    # consistent with equality, and cheaper than the name-based enum hash
+    __hash__ = object.__hash__
+
     @overload
     def __mul__(self, other: Orientation) -> Orientation:
         ...
@@ -213,48 +260,14 @@ class Orientation(enum.Enum):
     def __mul__(
         self, other: Union[Orientation, Position, Area]
     ) -> Union[Orientation, Position, Area]:
-        if isinstance(other, Orientation):
-            return _orientation_rotations[self, other]
-
         if isinstance(other, Position):
-            if self is Orientation.F:
-                return Position(other.y, other.x)
-
-            if self is Orientation.B:
-                return Position(-other.y, -other.x)
-
-            if self is Orientation.R:
-                return Position(other.x, -other.y)
-
-            if self is Orientation.L:
-                return Position(-other.x, other.y)
+            return _position_rotations[self](other)
 
-            assert False
+        if isinstance(other, Orientation):
+            return _orientation_rotations[self, other]
 
         if isinstance(other, Area):
-            if self is Orientation.F:
-                return Area(
-                    (other.ymin, other.ymax),
-                    (other.xmin, other.xmax),
-                )
-
-            if self is Orientation.B:
-                return Area(
-                    (-other.ymax, -other.ymin),
-                    (-other.xmax, -other.xmin),
-                )
-
-            if self is Orientation.R:
-                return Area(
-                    (other.xmin, other.xmax),
-                    (-other.ymax, -other.ymin),
-                )
-
-            if self is Orientation.L:
-                return Area(
-                    (-other.xmax, -other.xmin),
-                    (other.ymin, other.ymax),
-                )
+            return _area_rotations[self](other)
 
         return NotImplemented
 
@@ -279,6 +292,8 @@ class Orientation(enum.Enum):
 class Transform:
     """A grid-based rigid body transformation, also a ``pose`` (position and orientation)"""
 
+    __slots__ = ('position', 'orientation')
+
     position: Position
     orientation: Orientation
 
@@ -310,15 +325,18 @@ class Transform:
         4. transform * area -> transformed area
         """
 
+        if isinstance(other, Position):
+            return self.position + _position_rotations[self.orientation](other)
+
+        if isinstance(other, Area):
+            return self.position + _area_rotations[self.orientation](other)
+
         if isinstance(other, Transform):
             return Transform(
                 self.position + self.orientation * other.position,
                 self.orientation * other.orientation,
             )
 
-        if isinstance(other, (Position, Area)):
-            return self.position + self.orientation * other
-
         if isinstance(other, Orientation):
             return self.orientation * other
 
@@ -394,6 +412,11 @@ def distance_function_factory(name: str):
 
 # cached values (used to avoid if-else chains)
 
+# for Position.__new__
+_INTERN_BOUND = 256
+_interned_positions: Dict[Tuple[int, int], Position] = {}
+
+
 # for Position.from_orientation
 _position_from_orientation = {
     Orientation.F: Position(-1, 0),
@@ -433,3 +456,66 @@ _orientation_neg = {
     Orientation.B: Orientation.B,
     Orientation.L: Orientation.R,
 }
+
+
+# for Orientation.__mul__ and Transform.__mul__
+_position_rotations: Dict[Orientation, Callable[[Position], Position]] = {
+    Orientation.F: lambda position: position,
+    Orientation.B: lambda position: Position(-position.y, -position.x),
+    Orientation.R: lambda position: Position(position.x, -position.y),
+    Orientation.L: lambda position: Position(-position.x, position.y),
+}
+
+_area_rotations: Dict[Orientation, Callable[[Area], Area]] = {
+    Orientation.F: lambda area: area,
+    Orientation.B: lambda area: Area(
+        (-area.ymax, -area.ymin), (-area.xmax, -area.xmin)
+    ),
+    Orientation.R: lambda area: Area(
+        (area.xmin, area.xmax), (-area.ymax, -area.ymin)
+    ),
+    Orientation.L: lambda area: Area(
+        (-area.xmax, -area.xmin), (area.ymin, area.ymax)
+    ),
+}
+
+
+# for Area.positions
+@functools.lru_cache(maxsize=1024)
+def _area_positions(
+    ys: Tuple[int, int], xs: Tuple[int, int], selection: str
+) -> Tuple[Position, ...]:
+    ymin, ymax = ys
+    xmin, xmax = xs
+
+    if selection == 'all':
+        return tuple(
+            Position(y, x)
+            for y in range(ymin, ymax + 1)
+            for x in range(xmin, xmax + 1)
+        )
+
+    if selection == 'border':
+        return tuple(
+            itt.chain(
+                (
+                    Position(y, x)
+                    for y in [ymin, ymax]
+                    for x in range(xmin, xmax + 1)
+                ),
+                (
+                    Position(y, x)
+                    for y in range(ymin + 1, ymax)
+                    for x in [xmin, xmax]
+                ),
+            )
+        )
+
+    if selection == 'inside':
+        return tuple(
+            Position(y, x)
+            for y in range(ymin + 1, ymax)
+            for x in range(xmin + 1, xmax)
+        )
+
+    assert False
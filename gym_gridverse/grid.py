@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import List, Set, Tuple, Type, Union, cast
+from collections import Counter
+from typing import Dict, List, Mapping, Optional, Set, Tuple, Type, Union, cast
 
 from .geometry import Area, Orientation, Position, Shape
-from .grid_object import Floor, GridObject, GridObjectFactory, Hidden
+from .grid_object import Color, Floor, GridObject, GridObjectFactory, Hidden
 
 
 class Grid:
@@ -13,6 +14,12 @@ class Grid:
     typically used to represent either the global state of the environment, or
     a partial agent view.  This is basically a two-dimensional array, with some
     additional methods which help in querying and manipulating its objects.
+
+    The grid keeps reference-counted histograms of the types and colors of its
+    objects, which are updated by :py:meth:`__setitem__`, so that
+    :py:meth:`object_types` and :py:meth:`colors` do not need to inspect every
+    cell.  Hence, objects should be placed in the grid through item
+    assignment, rather than by modifying :py:attr:`objects` directly.
     """
 
     def __init__(self, objects: List[List[GridObject]]):
@@ -25,6 +32,13 @@ class Grid:
         self.shape = Shape(len(objects), len(objects[0]))
         self.area = Area((0, self.shape.height - 1), (0, self.shape.width - 1))
 
+        self._type_counts: Counter[Type[GridObject]] = Counter(
+            type(obj) for row in objects for obj in row
+        )
+        self._color_counts: Counter[Color] = Counter(
+            obj.color for row in objects for obj in row
+        )
+
     @staticmethod
     def from_shape(
         shape: Union[Shape, Tuple[int, int]],
@@ -64,7 +78,30 @@ class Grid:
         Returns:
             Set[Type[GridObject]]:
         """
-        return set(type(self[position]) for position in self.area.positions())
+        return set(self._type_counts)
+
+    def colors(self) -> Set[Color]:
+        """Returns the set of object colors in the grid
+
+        Returns:
+            Set[Color]:
+        """
+        return set(self._color_counts)
+
+    def find(self, object_type: Type[GridObject]) -> List[Position]:
+        """Returns the positions of objects of the given type (or subtypes)
+
+        Args:
+            object_type (Type[GridObject]):
+        Returns:
+            List[~gym_gridverse.geometry.Position]: positions, in row-major order
+        """
+        return [
+            Position(y, x)
+            for y, row in enumerate(self.objects)
+            for x, obj in enumerate(row)
+            if isinstance(obj, object_type)
+        ]
 
     def get(
         self,
@@ -110,7 +147,55 @@ class Grid:
         if not isinstance(obj, GridObject):
             raise TypeError('grid can only contain grid objects')
 
-        self.objects[y][x] = obj
+        row = self.objects[y]
+        self._discount(row[x])
+        self._count(obj)
+        row[x] = obj
+
+    def fill(self, area: Area, factory: GridObjectFactory):
+        """Fills an area of the grid with factory-created grid-objects
+
+        Each row of the area is written with a single slice assignment, and
+        the type and color histograms are updated once for the whole area.
+
+        Args:
+            area (~gym_gridverse.geometry.Area): area to fill, within the grid
+            factory (~gym_gridverse.grid_object.GridObjectFactory):
+        """
+        self._check_area(area)
+
+        columns = slice(area.xmin, area.xmax + 1)
+        rows = self.objects[area.ymin : area.ymax + 1]
+        added = [factory() for _ in range(area.height * area.width)]
+        if not all(isinstance(obj, GridObject) for obj in added):
+            raise TypeError('grid can only contain grid objects')
+
+        removed = [obj for row in rows for obj in row[columns]]
+        for i, row in enumerate(rows):
+            row[columns] = added[i * area.width : (i + 1) * area.width]
+
+        # in-place subtraction also drops the counts which reach zero
+        self._type_counts -= Counter(map(type, removed))
+        self._type_counts += Counter(map(type, added))
+        self._color_counts -= Counter(obj.color for obj in removed)
+        self._color_counts += Counter(obj.color for obj in added)
+
+    def _check_area(self, area: Area):
+        if not (
+            0 <= area.ymin
+            and area.ymax < self.shape.height
+            and 0 <= area.xmin
+            and area.xmax < self.shape.width
+        ):
+            raise IndexError(f'area {area} is not within the grid')
+
+    def _count(self, obj: GridObject):
+        self._type_counts[type(obj)] += 1
+        self._color_counts[obj.color] += 1
+
+    def _discount(self, obj: GridObject):
+        _decrement(self._type_counts, type(obj))
+        _decrement(self._color_counts, obj.color)
 
     def swap(self, p: Position, q: Position):
         """Swaps the grid objects at two positions.
@@ -119,7 +204,12 @@ class Grid:
             p (~gym_gridverse.geometry.Position):
             q (~gym_gridverse.geometry.Position):
         """
-        self[p], self[q] = self[q], self[p]
+        # swapping does not change the type and color histograms
+        objects = self.objects
+        objects[p.y][p.x], objects[q.y][q.x] = (
+            objects[q.y][q.x],
+            objects[p.y][p.x],
+        )
 
     def subgrid(self, area: Area) -> Grid:
         """Returns subgrid slice at given area.
@@ -187,6 +277,211 @@ class Grid:
         return f'<{self.__class__.__name__} {self.shape.height}x{self.shape.width} objects={self.objects}>'
 
 
+class SparseGrid(Grid):
+    """A two-dimensional grid of objects, which only stores non-default objects.
+
+    Every cell which was not explicitly set contains the same shared default
+    object (e.g., a :py:class:`~gym_gridverse.grid_object.Floor`), so that
+    the cost of most operations (copying, comparing, :py:meth:`object_types`,
+    :py:meth:`find` for non-default types) scales with the number of
+    non-default objects, and the cost of :py:meth:`subgrid` scales with the
+    size of the sliced area, rather than with the size of the whole grid.
+
+    NOTE:  Because the default object is shared between cells, it should be
+    stateless, e.g., a Floor or a Wall.  The :py:attr:`objects` attribute is
+    materialized on demand, and modifying it does not affect the grid.
+    """
+
+    def __init__(
+        self,
+        shape: Union[Shape, Tuple[int, int]],
+        objects: Optional[Mapping[Position, GridObject]] = None,
+        *,
+        factory: GridObjectFactory = Floor,
+    ):
+        """Constructs a sparse grid with the given shape and non-default objects
+
+        Args:
+            shape (Union[~gym_gridverse.geometry.Shape, Tuple[int, int]]):
+            objects (Optional[Mapping[~gym_gridverse.geometry.Position, ~gym_gridverse.grid_object.GridObject]]): initial non-default objects
+            factory (~gym_gridverse.grid_object.GridObjectFactory): generates the default object
+        """
+        try:
+            shape = cast(Shape, shape)
+            height, width = shape.height, shape.width
+        except AttributeError:
+            shape = cast(Tuple[int, int], shape)
+            height, width = shape
+
+        self.shape = Shape(height, width)
+        self.area = Area((0, height - 1), (0, width - 1))
+        self.default = factory()
+
+        # type and color histograms only count non-default objects
+        self._objects: Dict[Tuple[int, int], GridObject] = {}
+        self._type_counts = Counter()
+        self._color_counts = Counter()
+        if objects is not None:
+            for position, obj in objects.items():
+                self[position] = obj
+
+    @staticmethod
+    def from_grid(
+        grid: Grid, *, factory: GridObjectFactory = Floor
+    ) -> SparseGrid:
+        """Constructs a sparse grid with the same objects as another grid
+
+        Args:
+            grid (Grid):
+            factory (~gym_gridverse.grid_object.GridObjectFactory): generates the default object
+        Returns:
+            SparseGrid:
+        """
+        sparse_grid = SparseGrid(grid.shape, factory=factory)
+        for position in grid.area.positions():
+            sparse_grid[position] = grid[position]
+        return sparse_grid
+
+    @property
+    def objects(self) -> List[List[GridObject]]:  # type: ignore
+        return [
+            [
+                self._objects.get((y, x), self.default)
+                for x in range(self.shape.width)
+            ]
+            for y in range(self.shape.height)
+        ]
+
+    def __len__(self) -> int:
+        """Number of non-default objects"""
+        return len(self._objects)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, SparseGrid) and self.default == other.default:
+            return self.shape == other.shape and self._objects == other._objects
+
+        return super().__eq__(other)
+
+    __hash__ = Grid.__hash__
+
+    def object_types(self) -> Set[Type[GridObject]]:
+        object_types = set(self._type_counts)
+        if len(self._objects) < self.shape.height * self.shape.width:
+            object_types.add(type(self.default))
+        return object_types
+
+    def colors(self) -> Set[Color]:
+        colors = set(self._color_counts)
+        if len(self._objects) < self.shape.height * self.shape.width:
+            colors.add(self.default.color)
+        return colors
+
+    def find(self, object_type: Type[GridObject]) -> List[Position]:
+        if isinstance(self.default, object_type):
+            return super().find(object_type)
+
+        return [
+            Position(y, x)
+            for (y, x), obj in sorted(self._objects.items())
+            if isinstance(obj, object_type)
+        ]
+
+    def _is_default(self, obj: GridObject) -> bool:
+        # grid-object equality already compares the object types
+        return obj is self.default or obj == self.default
+
+    def _yx(
+        self, position: Union[Position, Tuple[int, int]]
+    ) -> Tuple[int, int]:
+        try:
+            position = cast(Position, position)
+            y, x = position.yx
+        except AttributeError:
+            position = cast(Tuple[int, int], position)
+            y, x = position
+
+        if not (0 <= y < self.shape.height and 0 <= x < self.shape.width):
+            raise IndexError(f'position {position} is outside of the grid')
+
+        return y, x
+
+    def __getitem__(
+        self, position: Union[Position, Tuple[int, int]]
+    ) -> GridObject:
+        return self._objects.get(self._yx(position), self.default)
+
+    def __setitem__(
+        self, position: Union[Position, Tuple[int, int]], obj: GridObject
+    ):
+        yx = self._yx(position)
+
+        if not isinstance(obj, GridObject):
+            raise TypeError('grid can only contain grid objects')
+
+        try:
+            self._discount(self._objects.pop(yx))
+        except KeyError:
+            pass
+
+        if not self._is_default(obj):
+            self._count(obj)
+            self._objects[yx] = obj
+
+    def fill(self, area: Area, factory: GridObjectFactory):
+        self._check_area(area)
+        for y in area.y_coordinates():
+            for x in area.x_coordinates():
+                self[y, x] = factory()
+
+    def swap(self, p: Position, q: Position):
+        self[p], self[q] = self[q], self[p]
+
+    def subgrid(self, area: Area) -> Grid:
+        return Grid(
+            [
+                [
+                    self._objects.get((y, x), self.default)
+                    if 0 <= y < self.shape.height and 0 <= x < self.shape.width
+                    else Hidden()
+                    for x in area.x_coordinates()
+                ]
+                for y in area.y_coordinates()
+            ]
+        )
+
+    def __mul__(self, other: Orientation) -> SparseGrid:
+        try:
+            rotation_function = _sparse_rotation_functions[other]
+        except KeyError:
+            return NotImplemented
+
+        height, width = self.shape.height, self.shape.width
+        rotated = SparseGrid(
+            (height, width)
+            if other in (Orientation.F, Orientation.B)
+            else (width, height),
+            factory=lambda: self.default,
+        )
+        rotated._type_counts = self._type_counts.copy()
+        rotated._color_counts = self._color_counts.copy()
+        rotated._objects = {
+            rotation_function(y, x, height, width): obj
+            for (y, x), obj in self._objects.items()
+        }
+        return rotated
+
+    __rmul__ = __mul__
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.shape.height}x{self.shape.width} default={self.default} objects={self._objects}>'
+
+
+def _decrement(counter: Counter, key):
+    counter[key] -= 1
+    if counter[key] == 0:
+        del counter[key]
+
+
 def _rotate_matrix_forward(data):
     return data
 
@@ -210,3 +505,13 @@ _grid_rotation_functions = {
     Orientation.B: _rotate_matrix_backward,
     Orientation.L: _rotate_matrix_right,
 }
+
+
+# for SparseGrid.__mul__, maps (y, x) to the rotated (y, x), consistently with
+# the matrix rotations above
+_sparse_rotation_functions = {
+    Orientation.F: lambda y, x, height, width: (y, x),
+    Orientation.R: lambda y, x, height, width: (width - 1 - x, y),
+    Orientation.B: lambda y, x, height, width: (height - 1 - y, width - 1 - x),
+    Orientation.L: lambda y, x, height, width: (x, height - 1 - y),
+}
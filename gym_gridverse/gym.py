@@ -1,66 +1,51 @@
 from __future__ import annotations
 
+import contextlib
+import contextvars
 import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 from functools import partial
-from typing import Callable, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import gymnasium as gym
 import numpy as np
 import pkg_resources
+from gymnasium.vector.utils import batch_space, concatenate, create_empty_array
 
+from gym_gridverse.envs.gridworld import GridWorld
 from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.observation import Observation
 from gym_gridverse.outer_env import OuterEnv
 from gym_gridverse.representations.observation_representations import (
     make_observation_representation,
 )
-from gym_gridverse.representations.spaces import Space, SpaceType
+from gym_gridverse.representations.representation import (
+    ObservationRepresentation,
+    StateRepresentation,
+)
+from gym_gridverse.representations.spaces import Space
 from gym_gridverse.representations.state_representations import (
     make_state_representation,
 )
+from gym_gridverse.rng import reset_gv_rng
+from gym_gridverse.state import State
 
 import pygame
 from gym_gridverse.rendering_gv_objects import *
-from gym_gridverse.grid_object import (
-    Beacon,
-    Color,
-    Door,
-    Exit,
-    Floor,
-    GridObject,
-    Hidden,
-    Key,
-    MovingObstacle,
-    Telepod,
-    Wall,
-)
-from gym_gridverse.geometry import Orientation
-
-orientation_as_degrees = {
-    Orientation.F: 0,
-    Orientation.L: 270,
-    Orientation.B: 180,
-    Orientation.R: 90,
-}
-
-
-NONE = (191, 182, 168)
-RED = (204, 78, 92)
-GREEN = (147, 190, 139)
-BLUE = (135, 206, 235)
-YELLOW = (255, 235, 138)
-ORANGE = (255, 179, 102)
-PURPLE = (180, 160, 200)
-
-
-colormap = {
-    Color.NONE: NONE,
-    Color.RED: RED,
-    Color.GREEN: GREEN,
-    Color.BLUE: BLUE,
-    Color.YELLOW: YELLOW,
-    Color.ORANGE: ORANGE,
-    Color.PURPLE: PURPLE,
-}
+from gym_gridverse.rendering_tiles import get_tile_atlas
 
 
 def outer_space_to_gym_space(space: Dict[str, Space]) -> gym.spaces.Space:
@@ -69,13 +54,75 @@ def outer_space_to_gym_space(space: Dict[str, Space]) -> gym.spaces.Space:
             k: gym.spaces.Box(
                 low=v.lower_bound,
                 high=v.upper_bound,
-                dtype=float if v.space_type is SpaceType.CONTINUOUS else int,
+                dtype=v.lower_bound.dtype,
             )
             for k, v in space.items()
         }
     )
 
 
+class LazyRepresentation(Mapping):
+    """Representation dictionary which is only converted upon first access
+
+    Used for the representations added to the info dictionary, see
+    :py:meth:`GymEnvironment.set_outputs`;  a representation which is never
+    accessed is never converted.  The conversion is bound to the state at the
+    time of the step, so it remains valid after further steps.
+
+    NOTE:  the observation of a past step is computed anew from its state;
+    for stochastic observation functions, it is a fresh sample (drawn from a
+    generator of the :py:class:`GymEnvironment`, see
+    :py:meth:`GymEnvironment.reset`), rather than the observation which the
+    environment would have produced at that step.
+
+    Pickling converts the representation, and only includes the converted
+    arrays, e.g., in the info dictionaries sent by vectorized environments.
+    """
+
+    def __init__(self, convert: Callable[[], Dict[str, np.ndarray]]):
+        self._convert = convert
+        self._data: Optional[Dict[str, np.ndarray]] = None
+
+    @property
+    def converted(self) -> bool:
+        """Whether the representation has already been converted."""
+        return self._data is not None
+
+    def _get_data(self) -> Dict[str, np.ndarray]:
+        if self._data is None:
+            self._data = self._convert()
+
+        return self._data
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._get_data()[key]
+
+    def __iter__(self):
+        return iter(self._get_data())
+
+    def __len__(self) -> int:
+        return len(self._get_data())
+
+    def __repr__(self) -> str:
+        if self._data is None:
+            return f'{type(self).__name__}(<not converted>)'
+
+        return f'{type(self).__name__}({self._data!r})'
+
+    def __reduce__(self):
+        # the conversion references the whole environment
+        return _converted_representation, (self._get_data(),)
+
+
+def _converted_representation(
+    data: Dict[str, np.ndarray]
+) -> LazyRepresentation:
+    """Returns an already converted :py:class:`LazyRepresentation`"""
+    representation = LazyRepresentation(data.copy)
+    representation._data = data
+    return representation
+
+
 class GymEnvironment(gym.Env):
     metadata = {
         "render_modes": [
@@ -94,6 +141,17 @@ class GymEnvironment(gym.Env):
 
         self.outer_env = outer_env
 
+        # Representation returned by reset/step, and lazy representations
+        # added to the info dictionary;  see `set_outputs`.
+        self.output = 'observation'
+        self.info_outputs: Tuple[str, ...] = ()
+
+        # Generator of the observations of past states, which are converted
+        # after the environment moved on;  kept apart from the environment
+        # generator, so that the dynamics do not depend on which lazy
+        # representations are accessed, and when.
+        self._deferred_rng = np.random.default_rng()
+
         # Environment state space, if any.
         self.state_space = (
             outer_space_to_gym_space(outer_env.state_representation.space)
@@ -132,27 +190,138 @@ class GymEnvironment(gym.Env):
         self.window = None
         self.clock = None
 
-    def set_state_representation(self, name: str):
-        """Changes the state representation."""
+        # `self.canvas` holds the last frame rendered in human-mode, and
+        # `self.canvas_tile_indices` the atlas tiles it is composed of
+        self.canvas = None
+        self.canvas_tile_indices = None
+
+        # tiles used to compose rgb_array frames without drawing, shared
+        # across environments with the same scaling
+        self.tile_atlas = get_tile_atlas(self.window_scaling)
+
+    def set_state_representation(self, name: str, **kwargs):
+        """Changes the state representation.
+
+        Keyword arguments (e.g., ``dtype``) are passed to
+        :py:func:`~gym_gridverse.representations.state_representations.make_state_representation`.
+        """
         # TODO: test
         self.outer_env.state_representation = make_state_representation(
-            name, self.outer_env.inner_env.state_space
+            name, self.outer_env.inner_env.state_space, **kwargs
         )
         self.state_space = outer_space_to_gym_space(
             self.outer_env.state_representation.space
         )
+        if self.output == 'state':
+            self.observation_space = self.state_space
+
+    def set_observation_representation(self, name: str, **kwargs):
+        """Changes the observation representation.
 
-    def set_observation_representation(self, name: str):
-        """Changes the observation representation."""
+        Keyword arguments (e.g., ``dtype``) are passed to
+        :py:func:`~gym_gridverse.representations.observation_representations.make_observation_representation`.
+        """
         # TODO: test
         self.outer_env.observation_representation = (
             make_observation_representation(
-                name, self.outer_env.inner_env.observation_space
+                name, self.outer_env.inner_env.observation_space, **kwargs
             )
         )
-        self.observation_space = outer_space_to_gym_space(
-            self.outer_env.observation_representation.space
-        )
+        if self.output == 'observation':
+            self.observation_space = outer_space_to_gym_space(
+                self.outer_env.observation_representation.space
+            )
+
+    def set_outputs(
+        self, output: str = 'observation', *, info: Iterable[str] = ()
+    ):
+        """Selects the representations produced by :py:meth:`reset` and :py:meth:`step`.
+
+        Only the `output` representation is converted at every step, and
+        returned in place of the observation (the observation space is
+        updated accordingly);  each of the `info` representations is added
+        to the info dictionary as a :py:class:`LazyRepresentation`, and only
+        converted if accessed.  E.g., ``set_outputs('state')`` never
+        computes observations, and ``set_outputs(info=['state'])`` only
+        converts the states requested by the caller.
+
+        For stochastic observation functions, the lazy observations of past
+        steps are fresh samples, see :py:class:`LazyRepresentation`.
+
+        Args:
+            output (str): either "observation" or "state"
+            info (Iterable[str]): names of the representations added to the info dictionary
+        """
+        info = tuple(info)
+        for name in (output, *info):
+            if self._representation(name) is None:
+                raise ValueError(f'{name} representation not available')
+
+        representation = self._representation(output)
+        assert representation is not None
+
+        self.output = output
+        self.info_outputs = info
+        self.observation_space = outer_space_to_gym_space(representation.space)
+
+    @contextlib.contextmanager
+    def outputs_selected(
+        self, output: str = 'observation', *, info: Iterable[str] = ()
+    ) -> Iterator[None]:
+        """Selects outputs as :py:meth:`set_outputs`, only within the context
+
+        Args:
+            output (str): either "observation" or "state"
+            info (Iterable[str]): names of the representations added to the info dictionary
+        """
+        selected = self.output, self.info_outputs, self.observation_space
+        self.set_outputs(output, info=info)
+        try:
+            yield
+        finally:
+            self.output, self.info_outputs, self.observation_space = selected
+
+    def _representation(
+        self, name: str
+    ) -> Optional[Union[StateRepresentation, ObservationRepresentation]]:
+        if name == 'observation':
+            return self.outer_env.observation_representation
+        if name == 'state':
+            return self.outer_env.state_representation
+
+        raise ValueError(f'invalid representation {name}')
+
+    def _convert(self, name: str, state: State) -> Dict[str, np.ndarray]:
+        """Converts the state, or its observation, to its representation"""
+        inner_env = self.outer_env.inner_env
+        if name == 'state':
+            state_representation = self.outer_env.state_representation
+            assert state_representation is not None
+            return state_representation.convert(state)
+
+        # the memoized observation is only valid for the current state
+        if inner_env.state is state:
+            observation = inner_env.observation
+        elif isinstance(inner_env, GridWorld):
+            observation = inner_env.functional_observation(
+                state, rng=self._deferred_rng
+            )
+        else:
+            observation = inner_env.functional_observation(state)
+        observation_representation = self.outer_env.observation_representation
+        assert observation_representation is not None
+        return observation_representation.convert(observation)
+
+    def _outputs(self, info: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """Returns the output representation, and adds the info ones to info"""
+        if not self.info_outputs:
+            return self.state if self.output == 'state' else self.observation
+
+        state = self.outer_env.inner_env.state
+        for name in self.info_outputs:
+            info[name] = LazyRepresentation(partial(self._convert, name, state))
+
+        return self._convert(self.output, state)
 
     @property
     def state(self) -> Dict[str, np.ndarray]:
@@ -173,12 +342,14 @@ class GymEnvironment(gym.Env):
         """Resets the state of the environment.
 
         Returns:
-            Dict[str, numpy.ndarray]: initial observation
+            Tuple[Dict[str, numpy.ndarray], Dict]: (initial observation, info dictionary)
         """
         # Set seeding
         super().reset(seed=seed)
         if seed is not None:
             self.outer_env.inner_env.set_seed(seed)
+            (seed_sequence,) = np.random.SeedSequence(seed).spawn(1)
+            self._deferred_rng = np.random.default_rng(seed_sequence)
 
         self.outer_env.reset()
 
@@ -187,7 +358,10 @@ class GymEnvironment(gym.Env):
             or self.render_mode == "human_observation"
         ):
             self._render_frame()
-        return self.observation, {}
+
+        info: Dict[str, Any] = {}
+        output = self._outputs(info)
+        return output, info
 
     def step(self, action: int):
         """Runs the environment dynamics for one timestep.
@@ -206,7 +380,10 @@ class GymEnvironment(gym.Env):
             or self.render_mode == "human_observation"
         ):
             self._render_frame()
-        return self.observation, reward, terminated, False, {}
+
+        info: Dict[str, Any] = {}
+        output = self._outputs(info)
+        return output, reward, terminated, False, info
 
     def render(self):
         if (
@@ -249,133 +426,216 @@ class GymEnvironment(gym.Env):
         else:
             raise ValueError('Render mode not recognized!')
 
+        # rgb_array frames are composed from pre-rasterized tiles
+        if (
+            self.render_mode == "rgb_array_state"
+            or self.render_mode == "rgb_array_observation"
+        ):
+            return self.tile_atlas.render(state_or_observation)
+
         # Do the rendering
         grid_height = grid_shape.height
         grid_width = grid_shape.width
         window_height = grid_height * self.window_scaling
         window_width = grid_width * self.window_scaling
-        if (
-            self.render_mode == "human_state"
-            or self.render_mode == "human_observation"
+
+        # The window and canvas persist across frames, and are only recreated
+        # if the size of the rendered grid changes
+        if self.window is None or self.window.get_size() != (
+            window_width,
+            window_height,
         ):
             self.window = pygame.display.set_mode((window_width, window_height))
-
-        # Render state or observation
-        canvas = pygame.Surface((window_width, window_height))
-        canvas.fill((255, 255, 255))
-        for position in state_or_observation.grid.area.positions():
-            obj = state_or_observation.grid[position]
-            # Modify y position because pyglet (0, 0) is bottom left,
-            # while GV (0, 0) is top left
-            obj_position = (position.x, position.y)
-
-            if isinstance(obj, Floor):
-                create_floor(canvas, obj_position, self.window_scaling)
-
-            elif isinstance(obj, Hidden):
-                create_hidden(canvas, obj_position, self.window_scaling)
-
-            elif isinstance(obj, Wall):
-                create_wall(canvas, obj_position, self.window_scaling)
-
-            elif isinstance(obj, Key):
-                create_key(canvas, obj_position, self.window_scaling)
-
-            elif isinstance(obj, Door):
-                if obj.is_open:
-                    create_door_open(canvas, obj_position, self.window_scaling)
-                elif obj.is_locked:
-                    create_door_closed_locked(
-                        canvas, obj_position, self.window_scaling
-                    )
-                else:
-                    create_door_closed_unlocked(
-                        canvas, obj_position, self.window_scaling
-                    )
-
-            elif isinstance(obj, Exit):
-                color = colormap[obj.color]
-                create_exit(canvas, obj_position, self.window_scaling, color)
-
-            elif isinstance(obj, MovingObstacle):
-                create_moving_obstacle(
-                    canvas, obj_position, self.window_scaling
-                )
-
-            elif isinstance(obj, Telepod):
-                create_portal(canvas, obj_position, self.window_scaling)
-
-            elif isinstance(obj, Beacon):
-                color = colormap[obj.color]
-                create_beacon(canvas, obj_position, self.window_scaling, color)
-            else:
-                create_unknown(canvas, obj_position, self.window_scaling)
-
-        # Draw agent
-        agent = state_or_observation.agent
-        agent_position = (agent.position.x, agent.position.y)
-        agent_orientation = orientation_as_degrees[agent.orientation]
-        create_agent(
-            canvas,
-            agent_position,
-            agent_orientation,
-            (1, 1),
-            self.window_scaling,
+            self.canvas = pygame.Surface((window_width, window_height))
+            self.canvas_tile_indices = None
+
+        # Only the cells whose tile (object or agent overlay) changed since
+        # the last frame are repainted
+        tile_indices = self.tile_atlas.tile_indices(state_or_observation)
+        dirty_cells = (
+            np.argwhere(tile_indices >= 0)
+            if self.canvas_tile_indices is None
+            else np.argwhere(tile_indices != self.canvas_tile_indices)
         )
+        self.canvas_tile_indices = tile_indices
+
+        dirty_rects = []
+        for y, x in dirty_cells:
+            rect = pygame.Rect(
+                x * self.window_scaling,
+                y * self.window_scaling,
+                self.window_scaling,
+                self.window_scaling,
+            )
+            tile_surface = self.tile_atlas.tile_surface(tile_indices[y, x])
+            self.canvas.blit(tile_surface, rect)
+            dirty_rects.append(rect)
 
-        # Draw grid
-        create_grid(canvas, (grid_width, grid_height), self.window_scaling)
+        # The window contents are lost if it gets exposed, e.g., after being
+        # covered by another window
+        if pygame.event.get(pygame.VIDEOEXPOSE):
+            dirty_rects = [self.canvas.get_rect()]
 
-        if (
-            self.render_mode == "human_state"
-            or self.render_mode == "human_observation"
-        ):
-            # The following line copies our drawings from `canvas` to the visible window
-            self.window.blit(canvas, canvas.get_rect())
-            pygame.event.pump()
-            pygame.display.update()
-
-            # We need to ensure that human-rendering occurs at the predefined framerate.
-            # The following line will automatically add a delay to keep the framerate stable.
-            self.clock.tick(self.metadata["render_fps"])
-        else:  # rgb_array
-            return np.transpose(
-                np.array(pygame.surfarray.pixels3d(canvas)), axes=(1, 0, 2)
-            )
+        # The following lines copy the dirty regions of `canvas` to the visible window
+        for rect in dirty_rects:
+            self.window.blit(self.canvas, rect, rect)
+        pygame.event.pump()
+        pygame.display.update(dirty_rects)
+
+        # We need to ensure that human-rendering occurs at the predefined framerate.
+        # The following line will automatically add a delay to keep the framerate stable.
+        self.clock.tick(self.metadata["render_fps"])
 
     def close(self):
         if self.window is not None:
             pygame.display.quit()
             pygame.quit()
+            self.window = None
+            self.clock = None
+            self.canvas = None
+            self.canvas_tile_indices = None
 
 
 class GymStateWrapper(gym.Wrapper):
     """
     Gym Wrapper to replace the standard observation representation with state instead.
 
-    Doesn't change underlying environment, won't change render
+    Doesn't change underlying environment, won't change render.  The state
+    is selected as output of the underlying environment only for the duration
+    of each :py:meth:`reset` and :py:meth:`step` (see
+    :py:meth:`GymEnvironment.outputs_selected`);  the observation is moved to
+    `info['observation']` as a :py:class:`LazyRepresentation`, and is only
+    computed if accessed.
     """
 
     def __init__(self, env: GymEnvironment):
         # Make sure we have a valid state representation
         if env.state_space is None:
-            ValueError('GymEnvironment does not have a state space')
+            raise ValueError('GymEnvironment does not have a state space')
 
         super().__init__(env)
         self.observation_space = env.state_space
 
+        # The wrapped environment produces the state, and the observation
+        # only if requested
+        gym_env = env.unwrapped
+        assert isinstance(gym_env, GymEnvironment)
+        self._gym_env = gym_env
+        self.info_outputs: Tuple[str, ...] = (
+            ('observation',)
+            if gym_env.outer_env.observation_representation is not None
+            else ()
+        )
+
     @property
     def observation(self) -> Dict[str, np.ndarray]:
         return self.env.state
 
-    def reset(self, **kwargs) -> Dict[str, np.ndarray]:
+    def reset(
+        self,
+        *,
+        seed: Optional[int] = None,
+        options: Optional[dict] = None,
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
         """reset the environment state
 
         Returns:
-            Dict[str, numpy.ndarray]: initial state
+            Tuple[Dict[str, numpy.ndarray], Dict]: (initial state, info dictionary)
+        """
+        with self._gym_env.outputs_selected('state', info=self.info_outputs):
+            return self.env.reset(seed=seed, options=options)
+
+    def step(self, action: int):
+        """performs environment step
+
+        Args:
+            action (int): agent's action
+
+        Returns:
+            Tuple[Dict[str, numpy.ndarray], float, bool, bool, Dict]: (state, reward, terminated, truncated, info dictionary)
+        """
+        with self._gym_env.outputs_selected('state', info=self.info_outputs):
+            return self.env.step(action)
+
+
+class GymHistoryWrapper(gym.Wrapper):
+    """
+    Gym Wrapper to replace each observation array with its last frames.
+
+    Each array of the wrapped (dict) observation gains a leading axis of size
+    `num_frames`, ordered from oldest to most recent;  at the start of an
+    episode, the history is padded with the initial observation.
+
+    Frames are written once into a buffer of `capacity` frames, and the
+    returned arrays are views of its last `num_frames` frames.  Once the
+    buffer is full, the last frames are moved back to its start, so a
+    returned observation remains valid for at least
+    `capacity - 2 * num_frames` further frames, where a step writes one frame
+    and a reset writes `num_frames` frames;  copy the arrays to keep them
+    longer.  In particular, if `capacity >= 3 * num_frames` (e.g., by
+    default), the last history of an episode remains valid after the
+    following reset, e.g., as `info['final_observation']` of gymnasium vector
+    environments.
+    """
+
+    def __init__(
+        self,
+        env: gym.Env,
+        num_frames: int,
+        *,
+        capacity: Optional[int] = None,
+    ):
+        """Wraps an environment with dict observations
+
+        Args:
+            env (gym.Env): environment with `gym.spaces.Dict` of `gym.spaces.Box` observations
+            num_frames (int): number of stacked frames
+            capacity (Optional[int]): number of frames in the buffer, defaults to `64 * num_frames`
+        """
+        if num_frames <= 0:
+            raise ValueError(f'num_frames ({num_frames}) should be positive')
+
+        if capacity is None:
+            capacity = 64 * num_frames
+        if capacity < num_frames:
+            raise ValueError(
+                f'capacity ({capacity}) should be at least num_frames ({num_frames})'
+            )
+
+        super().__init__(env)
+        self.num_frames = num_frames
+        self.capacity = capacity
+
+        # each array of the observation gains a leading axis of frames
+        self.observation_space = batch_space(env.observation_space, num_frames)
+        buffers = create_empty_array(
+            env.observation_space, n=capacity, fn=np.empty
+        )
+        assert isinstance(buffers, dict)
+        self._buffers: Dict[str, np.ndarray] = buffers
+        # index of the buffer frame after the most recent one
+        self._end = num_frames
+
+    @property
+    def observation(self) -> Dict[str, np.ndarray]:
+        """Returns the last frames, as views of the buffer."""
+        start = self._end - self.num_frames
+        return {
+            k: buffer[start : self._end] for k, buffer in self._buffers.items()
+        }
+
+    def reset(self, **kwargs):
+        """reset the environment state, and the history
+
+        Returns:
+            Tuple[Dict[str, numpy.ndarray], Dict]: (initial history, info dictionary)
         """
         observation, info = self.env.reset(**kwargs)
-        info['observation'] = observation
+
+        # the padded history is written after the previous one, rather than
+        # over it, so that the last history of the episode remains valid
+        for _ in range(self.num_frames):
+            self._append(observation)
 
         return self.observation, info
 
@@ -386,13 +646,222 @@ class GymStateWrapper(gym.Wrapper):
             action (int): agent's action
 
         Returns:
-            Tuple[Dict[str, numpy.ndarray], float, bool, bool, Dict]: (state, reward, terminated, truncated, info dictionary)
+            Tuple[Dict[str, numpy.ndarray], float, bool, bool, Dict]: (history, reward, terminated, truncated, info dictionary)
         """
         observation, reward, terminated, truncated, info = self.env.step(action)
-        info['observation'] = observation
-
+        self._append(observation)
         return self.observation, reward, terminated, truncated, info
 
+    def _append(self, observation: Dict[str, np.ndarray]):
+        """Writes a frame after the most recent one"""
+        # the most recent frames are moved back to the start of the buffer,
+        # once every `capacity - num_frames + 1` frames
+        if self._end == self.capacity:
+            start = self.capacity - self.num_frames + 1
+            for buffer in self._buffers.values():
+                buffer[: self.num_frames - 1] = buffer[start:]
+            self._end = self.num_frames - 1
+
+        for k, buffer in self._buffers.items():
+            buffer[self._end] = observation[k]
+        self._end += 1
+
+
+def _run_in_context(
+    context: contextvars.Context, env_fn: Callable[[], gym.Env]
+) -> Callable[[], gym.Env]:
+    """Returns an environment factory which runs within the context"""
+    return lambda: context.run(env_fn)
+
+
+class ThreadVectorEnv(gym.vector.SyncVectorEnv):
+    """Vectorized environment which steps its environments in a thread pool
+
+    Each environment runs within its own :py:class:`contextvars.Context`,
+    which holds its own library rng (see
+    :py:func:`~gym_gridverse.rng.get_gv_rng`) and inherits the debugging flag
+    of the creating context;  seeded resets also seed the library rng of each
+    environment.  Results are the same as those of
+    :py:class:`gymnasium.vector.SyncVectorEnv`.
+
+    NOTE:  environments only step in parallel while the GIL is released, e.g.,
+    within NumPy kernels, or on free-threaded Python builds.
+    """
+
+    def __init__(
+        self,
+        env_fns: Iterable[Callable[[], gym.Env]],
+        *,
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ):
+        """Creates the environments, each within its own context
+
+        Args:
+            env_fns (Iterable[Callable[[], gym.Env]]): environment factories
+            max_workers (Optional[int]): number of threads, defaults to one per environment
+            **kwargs: forwarded to :py:class:`gymnasium.vector.SyncVectorEnv`
+        """
+        env_fns = list(env_fns)
+        self._contexts = [contextvars.copy_context() for _ in env_fns]
+        for context in self._contexts:
+            context.run(reset_gv_rng)
+
+        super().__init__(
+            [
+                _run_in_context(context, env_fn)
+                for context, env_fn in zip(self._contexts, env_fns)
+            ],
+            **kwargs,
+        )
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.num_envs if max_workers is None else max_workers,
+            thread_name_prefix='ThreadVectorEnv',
+        )
+
+    def _map(self, function: Callable[[int], Any]) -> List[Any]:
+        """Calls function on each environment index, within its context"""
+
+        def run(i: int) -> Any:
+            return self._contexts[i].run(function, i)
+
+        futures = [self._executor.submit(run, i) for i in range(self.num_envs)]
+        return [future.result() for future in futures]
+
+    def reset_wait(
+        self,
+        seed: Optional[Union[int, List[int]]] = None,
+        options: Optional[dict] = None,
+    ):
+        """Resets the environments in parallel
+
+        Args:
+            seed (Optional[Union[int, List[int]]]): reset seeds, incremented per environment if int
+            options (Optional[dict]): reset options
+
+        Returns:
+            Tuple[Any, dict]: (batch of observations, batch of infos)
+        """
+        seeds: List[Optional[int]]
+        if seed is None:
+            seeds = [None for _ in range(self.num_envs)]
+        elif isinstance(seed, int):
+            seeds = [seed + i for i in range(self.num_envs)]
+        else:
+            seeds = list(seed)
+        assert len(seeds) == self.num_envs
+
+        def reset(i: int):
+            kwargs: Dict[str, Any] = {}
+            env_seed = seeds[i]
+            if env_seed is not None:
+                reset_gv_rng(env_seed)
+                kwargs['seed'] = env_seed
+            if options is not None:
+                kwargs['options'] = options
+
+            return self.envs[i].reset(**kwargs)
+
+        self._terminateds[:] = False
+        self._truncateds[:] = False
+        observations = []
+        infos: dict = {}
+        for i, (observation, info) in enumerate(self._map(reset)):
+            observations.append(observation)
+            infos = self._add_info(infos, info, i)
+
+        self.observations = concatenate(
+            self.single_observation_space, observations, self.observations
+        )
+        return (
+            deepcopy(self.observations) if self.copy else self.observations
+        ), infos
+
+    def step_wait(self):
+        """Steps the environments in parallel, resetting those which are done
+
+        Returns:
+            Tuple[Any, numpy.ndarray, numpy.ndarray, numpy.ndarray, dict]: batches of (observations, rewards, terminateds, truncateds, infos)
+        """
+        actions = list(self._actions)
+
+        def step(i: int):
+            env = self.envs[i]
+            observation, reward, terminated, truncated, info = env.step(
+                actions[i]
+            )
+
+            if terminated or truncated:
+                old_observation, old_info = observation, info
+                observation, info = env.reset()
+                info['final_observation'] = old_observation
+                info['final_info'] = old_info
+
+            return observation, reward, terminated, truncated, info
+
+        observations = []
+        infos: dict = {}
+        for i, (
+            observation,
+            self._rewards[i],
+            self._terminateds[i],
+            self._truncateds[i],
+            info,
+        ) in enumerate(self._map(step)):
+            observations.append(observation)
+            infos = self._add_info(infos, info, i)
+
+        self.observations = concatenate(
+            self.single_observation_space, observations, self.observations
+        )
+        return (
+            deepcopy(self.observations) if self.copy else self.observations,
+            np.copy(self._rewards),
+            np.copy(self._terminateds),
+            np.copy(self._truncateds),
+            infos,
+        )
+
+    def close_extras(self, **kwargs):
+        """Shuts down the thread pool, and closes the environments"""
+        self._executor.shutdown()
+        super().close_extras(**kwargs)
+
+
+def render_batch(
+    envs: Sequence[GymEnvironment],
+    render_mode: str = "rgb_array_observation",
+) -> np.ndarray:
+    """Renders the current state or observation of multiple environments
+
+    The environments must share the same window scaling, and their states (or
+    observations) must have the same shape.  The frames are composed in a
+    single vectorized call, see
+    :py:meth:`~gym_gridverse.rendering_tiles.TileAtlas.render_batch`.
+
+    Args:
+        envs (Sequence[GymEnvironment]): environments to render
+        render_mode (str): either "rgb_array_state" or "rgb_array_observation"
+
+    Returns:
+        numpy.ndarray: (N, height * window_scaling, width * window_scaling, 3) uint8 array
+    """
+    data: List[Union[State, Observation]]
+    if render_mode == "rgb_array_state":
+        data = [env.outer_env.inner_env.state for env in envs]
+    elif render_mode == "rgb_array_observation":
+        data = [env.outer_env.inner_env.observation for env in envs]
+    else:
+        raise ValueError(f'invalid render mode {render_mode}')
+
+    window_scalings = set(env.window_scaling for env in envs)
+    if len(window_scalings) != 1:
+        raise ValueError(f'inconsistent window scalings {window_scalings}')
+
+    (window_scaling,) = window_scalings
+    return get_tile_atlas(window_scaling).render_batch(data)
+
 
 STRING_TO_YAML_FILE: Dict[str, str] = {
     "GV-Crossing-5x5-v0": "gv_crossing.5x5.yaml",
@@ -2,7 +2,7 @@ from typing import Dict, Optional, Tuple
 
 import numpy as np
 
-from gym_gridverse.envs.inner_env import Action, InnerEnv
+from gym_gridverse.envs.inner_env import Action, InnerEnv, Snapshot
 from gym_gridverse.representations.representation import (
     ObservationRepresentation,
     StateRepresentation,
@@ -54,6 +54,22 @@ class OuterEnv:
         """
         return self.inner_env.step(action)
 
+    def snapshot(self) -> Snapshot:
+        """Returns a token which can be used to restore the current environment
+
+        Returns:
+            Snapshot:
+        """
+        return self.inner_env.snapshot()
+
+    def restore(self, snapshot: Snapshot):
+        """Restores the environment to a snapshot
+
+        Args:
+            snapshot (Snapshot): token returned by :py:meth:`snapshot`
+        """
+        self.inner_env.restore(snapshot)
+
     @property
     def state(self) -> Dict[str, np.ndarray]:
         """Returns the representation of the current state.
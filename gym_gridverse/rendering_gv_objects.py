@@ -2,9 +2,91 @@ import pygame
 import math
 import numpy as np
 
+from gym_gridverse.geometry import Orientation
+from gym_gridverse.grid_object import (
+    Beacon,
+    Color,
+    Door,
+    Exit,
+    Floor,
+    GridObject,
+    Hidden,
+    Key,
+    MovingObstacle,
+    Telepod,
+    Wall,
+)
+
 RAD2DEG = 180 / math.pi
 DEG2RAD = math.pi / 180
 
+orientation_as_degrees = {
+    Orientation.F: 0,
+    Orientation.L: 270,
+    Orientation.B: 180,
+    Orientation.R: 90,
+}
+
+
+NONE = (191, 182, 168)
+RED = (204, 78, 92)
+GREEN = (147, 190, 139)
+BLUE = (135, 206, 235)
+YELLOW = (255, 235, 138)
+ORANGE = (255, 179, 102)
+PURPLE = (180, 160, 200)
+
+
+colormap = {
+    Color.NONE: NONE,
+    Color.RED: RED,
+    Color.GREEN: GREEN,
+    Color.BLUE: BLUE,
+    Color.YELLOW: YELLOW,
+    Color.ORANGE: ORANGE,
+    Color.PURPLE: PURPLE,
+}
+
+
+def create_grid_object(surface, obj: GridObject, obj_position, window_scaling):
+    """Draws the grid-object using the appropriate `create_*` function"""
+    if isinstance(obj, Floor):
+        create_floor(surface, obj_position, window_scaling)
+
+    elif isinstance(obj, Hidden):
+        create_hidden(surface, obj_position, window_scaling)
+
+    elif isinstance(obj, Wall):
+        create_wall(surface, obj_position, window_scaling)
+
+    elif isinstance(obj, Key):
+        create_key(surface, obj_position, window_scaling)
+
+    elif isinstance(obj, Door):
+        if obj.is_open:
+            create_door_open(surface, obj_position, window_scaling)
+        elif obj.is_locked:
+            create_door_closed_locked(surface, obj_position, window_scaling)
+        else:
+            create_door_closed_unlocked(surface, obj_position, window_scaling)
+
+    elif isinstance(obj, Exit):
+        color = colormap[obj.color]
+        create_exit(surface, obj_position, window_scaling, color)
+
+    elif isinstance(obj, MovingObstacle):
+        create_moving_obstacle(surface, obj_position, window_scaling)
+
+    elif isinstance(obj, Telepod):
+        create_portal(surface, obj_position, window_scaling)
+
+    elif isinstance(obj, Beacon):
+        color = colormap[obj.color]
+        create_beacon(surface, obj_position, window_scaling, color)
+
+    else:
+        create_unknown(surface, obj_position, window_scaling)
+
 
 def create_wall(surface, obj_position, window_scaling):
     # Create brick background
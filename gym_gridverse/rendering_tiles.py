@@ -0,0 +1,262 @@
+"""Frame rendering based on a pre-rasterized atlas of grid-object tiles"""
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+import pygame
+
+from gym_gridverse.geometry import Orientation
+from gym_gridverse.grid_object import Color, GridObject
+from gym_gridverse.observation import Observation
+from gym_gridverse.rendering_gv_objects import (
+    create_agent,
+    create_grid,
+    create_grid_object,
+    orientation_as_degrees,
+)
+from gym_gridverse.state import State
+
+TileKey = Tuple[Type[GridObject], int, Color, Optional[Orientation]]
+"""Identifies a tile:  object type, state index, color, and agent orientation"""
+
+
+class TileAtlas:
+    """An atlas of pre-rasterized tiles, used to compose RGB frames.
+
+    Each tile is the `window_scaling x window_scaling` image of a single cell,
+    including its grid lines, as drawn by the `create_*` functions in
+    :py:mod:`~gym_gridverse.rendering_gv_objects`.  A tile is identified by the
+    grid-object type, state index and color, and by the orientation of the
+    agent if the agent occupies the cell.  Tiles are rasterized with pygame the
+    first time they are needed;  afterwards, frames are composed entirely by
+    numpy fancy-indexing into the atlas.
+
+    NOTE:  pygame rasterizes float coordinates, so a tile drawn at the origin
+    may differ from the same object drawn directly on a larger canvas by a few
+    edge pixels.
+    """
+
+    def __init__(self, window_scaling: int = 50):
+        """Creates an empty atlas
+
+        Args:
+            window_scaling (int): size of each tile, in pixels
+        """
+        self.window_scaling = window_scaling
+
+        self._tile_indices: Dict[TileKey, int] = {}
+        self._tiles: List[np.ndarray] = []
+        self._tile_surfaces: Dict[int, pygame.Surface] = {}
+        self._atlas: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    @property
+    def atlas(self) -> np.ndarray:
+        """Returns all rasterized tiles as a single array
+
+        Returns:
+            numpy.ndarray: (num_tiles, window_scaling, window_scaling, 3) uint8 array
+        """
+        if self._atlas is None or len(self._atlas) != len(self._tiles):
+            self._atlas = np.stack(self._tiles)
+
+        return self._atlas
+
+    def tile_index(
+        self,
+        grid_object: GridObject,
+        orientation: Optional[Orientation] = None,
+    ) -> int:
+        """Returns the atlas index of a tile, rasterizing it if necessary
+
+        Args:
+            grid_object (GridObject): object occupying the cell
+            orientation (Optional[Orientation]): orientation of the agent, if the agent occupies the cell
+
+        Returns:
+            int: index of the tile in the atlas
+        """
+        key = (
+            type(grid_object),
+            grid_object.state_index,
+            grid_object.color,
+            orientation,
+        )
+
+        try:
+            return self._tile_indices[key]
+        except KeyError:
+            index = self._tile_indices[key] = len(self._tiles)
+            self._tiles.append(self._rasterize(grid_object, orientation))
+            return index
+
+    def tile(
+        self,
+        grid_object: GridObject,
+        orientation: Optional[Orientation] = None,
+    ) -> np.ndarray:
+        """Returns the image of a tile, rasterizing it if necessary
+
+        Args:
+            grid_object (GridObject): object occupying the cell
+            orientation (Optional[Orientation]): orientation of the agent, if the agent occupies the cell
+
+        Returns:
+            numpy.ndarray: (window_scaling, window_scaling, 3) uint8 array
+        """
+        return self._tiles[self.tile_index(grid_object, orientation)]
+
+    def tile_surface(self, index: int) -> pygame.Surface:
+        """Returns a rasterized tile as a pygame surface
+
+        Args:
+            index (int): index of the tile in the atlas
+
+        Returns:
+            pygame.Surface: (window_scaling, window_scaling) surface
+        """
+        if index not in self._tile_surfaces:
+            tile = np.transpose(self._tiles[index], axes=(1, 0, 2))
+            self._tile_surfaces[index] = pygame.surfarray.make_surface(tile)
+
+        return self._tile_surfaces[index]
+
+    def tile_indices(self, data: Union[State, Observation]) -> np.ndarray:
+        """Returns the atlas index of each cell
+
+        Args:
+            data (Union[State, Observation]): the state or observation to render
+
+        Returns:
+            numpy.ndarray: (height, width) int array of tile indices
+        """
+        grid = data.grid
+        indices = np.empty(grid.shape.as_tuple, dtype=int)
+        for y in range(grid.shape.height):
+            for x in range(grid.shape.width):
+                indices[y, x] = self.tile_index(grid[y, x])
+
+        agent = data.agent
+        if grid.area.contains(agent.position):
+            indices[agent.position.yx] = self.tile_index(
+                grid[agent.position], agent.orientation
+            )
+
+        return indices
+
+    def render(self, data: Union[State, Observation]) -> np.ndarray:
+        """Renders a state or observation as an RGB image
+
+        Args:
+            data (Union[State, Observation]): the state or observation to render
+
+        Returns:
+            numpy.ndarray: (height * window_scaling, width * window_scaling, 3) uint8 array
+        """
+        return self._compose(self.tile_indices(data))
+
+    def render_batch(
+        self, data: Sequence[Union[State, Observation]]
+    ) -> np.ndarray:
+        """Renders a batch of states or observations as RGB images
+
+        All states or observations must have grids of the same shape.  The
+        tiles of all images are gathered with a single fancy-indexing
+        operation.
+
+        Args:
+            data (Sequence[Union[State, Observation]]): the states or observations to render
+
+        Returns:
+            numpy.ndarray: (N, height * window_scaling, width * window_scaling, 3) uint8 array
+        """
+        if len(data) == 0:
+            raise ValueError('cannot render an empty batch')
+
+        shapes = set(d.grid.shape for d in data)
+        if len(shapes) != 1:
+            raise ValueError(
+                f'cannot render grids of different shapes {shapes}'
+            )
+
+        indices = np.stack([self.tile_indices(d) for d in data])
+        return self._compose(indices)
+
+    def _compose(self, indices: np.ndarray) -> np.ndarray:
+        """Gathers tiles and arranges them into images
+
+        Args:
+            indices (numpy.ndarray): (..., height, width) int array of tile indices
+
+        Returns:
+            numpy.ndarray: (..., height * window_scaling, width * window_scaling, 3) uint8 array
+        """
+        *batch_shape, height, width = indices.shape
+        size = self.window_scaling
+        ndim = len(batch_shape)
+
+        # (..., height, width, size, size, 3) -> (..., height, size, width, size, 3)
+        tiles = self.atlas[indices]
+        axes = tuple(range(ndim)) + tuple(ndim + i for i in (0, 2, 1, 3, 4))
+        return tiles.transpose(axes).reshape(
+            *batch_shape, height * size, width * size, 3
+        )
+
+    def _rasterize(
+        self,
+        grid_object: GridObject,
+        orientation: Optional[Orientation],
+    ) -> np.ndarray:
+        size = self.window_scaling
+        surface = pygame.Surface((size, size))
+        surface.fill((255, 255, 255))
+
+        create_grid_object(surface, grid_object, (0, 0), size)
+        if orientation is not None:
+            create_agent(
+                surface,
+                (0, 0),
+                orientation_as_degrees[orientation],
+                (1, 1),
+                size,
+            )
+        create_grid(surface, (1, 1), size)
+
+        return np.transpose(
+            np.array(pygame.surfarray.pixels3d(surface)), axes=(1, 0, 2)
+        )
+
+
+@lru_cache()
+def get_tile_atlas(window_scaling: int = 50) -> TileAtlas:
+    """Returns a tile atlas shared by all renderers with the same scaling
+
+    Args:
+        window_scaling (int): size of each tile, in pixels
+
+    Returns:
+        TileAtlas:
+    """
+    return TileAtlas(window_scaling)
+
+
+def render_batch(
+    data: Sequence[Union[State, Observation]],
+    *,
+    window_scaling: int = 50,
+) -> np.ndarray:
+    """Renders a batch of states or observations as RGB images
+
+    Uses the shared tile atlas associated with the given scaling, see
+    :py:func:`get_tile_atlas`.
+
+    Args:
+        data (Sequence[Union[State, Observation]]): the states or observations to render
+        window_scaling (int): size of each cell, in pixels
+
+    Returns:
+        numpy.ndarray: (N, height * window_scaling, width * window_scaling, 3) uint8 array
+    """
+    return get_tile_atlas(window_scaling).render_batch(data)
@@ -1,6 +1,7 @@
-from typing import Dict, Iterable, Sequence, Tuple, Type
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Type
 
 import numpy as np
+from numpy.typing import DTypeLike
 
 from gym_gridverse.debugging import gv_debug
 from gym_gridverse.grid_object import Color, GridObject, Hidden, NoneGridObject
@@ -8,12 +9,17 @@ from gym_gridverse.observation import Observation
 from gym_gridverse.representations.representation import (
     ArrayRepresentation,
     ObservationRepresentation,
+    cast_space,
     compact_grid_object_representation_convert,
     compact_grid_object_representation_space,
     default_grid_object_representation_convert,
     default_grid_object_representation_space,
     no_overlap_grid_object_representation_convert,
     no_overlap_grid_object_representation_space,
+    one_hot_grid_object_representation_convert,
+    one_hot_grid_object_representation_space,
+    packed_one_hot_grid_object_representation_convert,
+    packed_one_hot_grid_object_representation_space,
 )
 from gym_gridverse.representations.spaces import Space
 from gym_gridverse.spaces import ObservationSpace
@@ -46,8 +52,11 @@ def _sorted_colors(colors: Iterable[Color]) -> Sequence[Color]:
 
 
 class ArrayObservationRepresentation(ArrayRepresentation[Observation]):
-    def __init__(self, observation_space: ObservationSpace):
+    def __init__(
+        self, observation_space: ObservationSpace, *, dtype: DTypeLike = int
+    ):
         self.observation_space = observation_space
+        self.dtype = np.dtype(dtype)
 
 
 class GridObjectObservationRepresentation(ArrayRepresentation[GridObject]):
@@ -58,16 +67,23 @@ class GridObjectObservationRepresentation(ArrayRepresentation[GridObject]):
 def make_observation_representation(
     name: str,
     observation_space: ObservationSpace,
+    *,
+    dtype: Optional[DTypeLike] = None,
 ) -> ObservationRepresentation:
     """Factory function for observation representations
 
+    The ``one-hot`` and ``one-hot-packed`` representations are built from
+    the ``compact`` indices;  ``one-hot-packed`` packs 8 one-hot channels in
+    each byte, which can be unpacked using :py:func:`numpy.unpackbits` along
+    the last axis.
+
     Args:
         name (str): name of the representation
         observation_space (ObservationSpace): inner-environment observation space
+        dtype (Optional[DTypeLike]): dtype of the arrays, defaults to int for index representations, and to uint8 for one-hot representations
     Returns:
         ObservationRepresentation:
     """
-    # TODO: test
 
     grid_object_representation: GridObjectObservationRepresentation
 
@@ -75,56 +91,46 @@ def make_observation_representation(
         grid_object_representation = DefaultGridObjectObservationRepresentation(
             observation_space
         )
-        representations = {
-            'grid': GridObservationRepresentation(
-                observation_space, grid_object_representation
-            ),
-            'agent_id_grid': AgentIDGridObservationRepresentation(
-                observation_space
-            ),
-            'item': ItemObservationRepresentation(
-                observation_space, grid_object_representation
-            ),
-        }
-        return DictObservationRepresentation(observation_space, representations)
-
-    if name == 'no-overlap':
-        # NOTE:  only `grid` and `item` require a separate no-overlap representation
+    elif name == 'no-overlap':
         grid_object_representation = (
             NoOverlapGridObjectObservationRepresentation(observation_space)
         )
-        representations = {
-            'grid': GridObservationRepresentation(
-                observation_space, grid_object_representation
-            ),
-            'agent_id_grid': AgentIDGridObservationRepresentation(
-                observation_space
-            ),
-            'item': ItemObservationRepresentation(
-                observation_space, grid_object_representation
-            ),
-        }
-        return DictObservationRepresentation(observation_space, representations)
-
-    if name == 'compact':
-        # NOTE:  only `grid` and `item` require a separate compact representation
+    elif name == 'compact':
         grid_object_representation = CompactGridObjectObservationRepresentation(
             observation_space
         )
-        representations = {
-            'grid': GridObservationRepresentation(
-                observation_space, grid_object_representation
-            ),
-            'agent_id_grid': AgentIDGridObservationRepresentation(
-                observation_space
-            ),
-            'item': ItemObservationRepresentation(
-                observation_space, grid_object_representation
-            ),
-        }
-        return DictObservationRepresentation(observation_space, representations)
+    elif name == 'one-hot':
+        grid_object_representation = OneHotGridObjectObservationRepresentation(
+            observation_space
+        )
+    elif name == 'one-hot-packed':
+        grid_object_representation = (
+            PackedOneHotGridObjectObservationRepresentation(observation_space)
+        )
+    else:
+        raise ValueError(f'invalid name {name}')
+
+    if dtype is None:
+        dtype = np.uint8 if name.startswith('one-hot') else int
+
+    # NOTE:  only `grid` and `item` depend on the grid-object representation
+    representations = {
+        'grid': GridObservationRepresentation(
+            observation_space, grid_object_representation, dtype=dtype
+        ),
+        'agent_id_grid': AgentIDGridObservationRepresentation(
+            observation_space, dtype=dtype
+        ),
+        'item': ItemObservationRepresentation(
+            observation_space, grid_object_representation, dtype=dtype
+        ),
+    }
 
-    raise ValueError(f'invalid name {name}')
+    # checks early that the dtype can represent the spaces
+    for representation in representations.values():
+        representation.space
+
+    return DictObservationRepresentation(observation_space, representations)
 
 
 # representation composition
@@ -161,8 +167,10 @@ class GridObservationRepresentation(ArrayObservationRepresentation):
         self,
         observation_space: ObservationSpace,
         grid_object_representation: GridObjectObservationRepresentation,
+        *,
+        dtype: DTypeLike = int,
     ):
-        super().__init__(observation_space)
+        super().__init__(observation_space, dtype=dtype)
         self.grid_object_representation = grid_object_representation
 
     @property
@@ -175,7 +183,9 @@ class GridObservationRepresentation(ArrayObservationRepresentation):
         lower_bound = np.tile(lower_bound, (height, width, 1))
         upper_bound = self.grid_object_representation.space.upper_bound
         upper_bound = np.tile(upper_bound, (height, width, 1))
-        return Space(space_type, lower_bound, upper_bound)
+        return cast_space(
+            Space(space_type, lower_bound, upper_bound), self.dtype
+        )
 
     def convert(self, observation: Observation) -> np.ndarray:
         return np.array(
@@ -188,7 +198,7 @@ class GridObservationRepresentation(ArrayObservationRepresentation):
                 ]
                 for y in range(observation.grid.shape.height)
             ],
-            int,
+            self.dtype,
         )
 
 
@@ -197,18 +207,20 @@ class ItemObservationRepresentation(ArrayObservationRepresentation):
         self,
         observation_space: ObservationSpace,
         grid_object_representation: GridObjectObservationRepresentation,
+        *,
+        dtype: DTypeLike = int,
     ):
-        super().__init__(observation_space)
+        super().__init__(observation_space, dtype=dtype)
         self.grid_object_representation = grid_object_representation
 
     @property
     def space(self) -> Space:
-        return self.grid_object_representation.space
+        return cast_space(self.grid_object_representation.space, self.dtype)
 
     def convert(self, observation: Observation) -> np.ndarray:
         return self.grid_object_representation.convert(
             observation.agent.grid_object
-        )
+        ).astype(self.dtype, copy=False)
 
 
 class AgentIDGridObservationRepresentation(ArrayObservationRepresentation):
@@ -221,12 +233,14 @@ class AgentIDGridObservationRepresentation(ArrayObservationRepresentation):
             raise ValueError(f'negative height or width ({height, width})')
 
         return Space.make_discrete_space(
-            np.zeros((height, width), dtype=int),
-            np.ones((height, width), dtype=int),
+            np.zeros((height, width), dtype=self.dtype),
+            np.ones((height, width), dtype=self.dtype),
         )
 
     def convert(self, observation: Observation) -> np.ndarray:
-        grid_agent_position = np.zeros(observation.grid.shape.as_tuple, int)
+        grid_agent_position = np.zeros(
+            observation.grid.shape.as_tuple, self.dtype
+        )
         grid_agent_position[observation.agent.position.yx] = 1
         return grid_agent_position
 
@@ -372,3 +386,61 @@ class CompactGridObjectObservationRepresentation(
             self._grid_object_color_map,
             grid_object,
         )
+
+
+class OneHotGridObjectObservationRepresentation(
+    CompactGridObjectObservationRepresentation
+):
+    """The one-hot representation for a grid-object
+
+    Sets the channels of the compact type, status, and color indices.  See
+    :func:`gym_gridverse.representations.representation.one_hot_grid_object_representation_space`
+    and
+    :func:`gym_gridverse.representations.representation.one_hot_grid_object_representation_convert`
+    for more information.
+    """
+
+    def __init__(self, observation_space: ObservationSpace):
+        super().__init__(observation_space)
+        self._num_channels = int(self._grid_object_color_map.max()) + 1
+
+    @property
+    def space(self) -> Space:
+        return one_hot_grid_object_representation_space(self._num_channels)
+
+    def convert(self, grid_object: GridObject) -> np.ndarray:
+        return one_hot_grid_object_representation_convert(
+            self._grid_object_type_map,
+            self._grid_object_status_map,
+            self._grid_object_color_map,
+            self._num_channels,
+            grid_object,
+        )
+
+
+class PackedOneHotGridObjectObservationRepresentation(
+    OneHotGridObjectObservationRepresentation
+):
+    """The bit-packed one-hot representation for a grid-object
+
+    Packs the one-hot channels into bytes.  See
+    :func:`gym_gridverse.representations.representation.packed_one_hot_grid_object_representation_space`
+    and
+    :func:`gym_gridverse.representations.representation.packed_one_hot_grid_object_representation_convert`
+    for more information.
+    """
+
+    @property
+    def space(self) -> Space:
+        return packed_one_hot_grid_object_representation_space(
+            self._num_channels
+        )
+
+    def convert(self, grid_object: GridObject) -> np.ndarray:
+        return packed_one_hot_grid_object_representation_convert(
+            self._grid_object_type_map,
+            self._grid_object_status_map,
+            self._grid_object_color_map,
+            self._num_channels,
+            grid_object,
+        )
@@ -2,6 +2,7 @@ import abc
 from typing import Dict, Generic, Set, Type, TypeVar
 
 import numpy as np
+from numpy.typing import DTypeLike
 
 from gym_gridverse.grid_object import Color, GridObject
 from gym_gridverse.observation import Observation
@@ -54,6 +55,32 @@ class ObservationRepresentation:
 T = TypeVar('T', State, Observation, GridObject)
 
 
+def cast_space(space: Space, dtype: DTypeLike) -> Space:
+    """Returns the space with bounds of the given dtype
+
+    Args:
+        space (Space): space to cast
+        dtype (DTypeLike): dtype of the bounds, and of the represented arrays
+
+    Returns:
+        Space: space with the same bounds, of the given dtype
+    """
+    dtype = np.dtype(dtype)
+    if np.issubdtype(dtype, np.integer) and space.lower_bound.size > 0:
+        info = np.iinfo(dtype)
+        if (
+            space.lower_bound.min() < info.min
+            or space.upper_bound.max() > info.max
+        ):
+            raise ValueError(f'dtype {dtype} cannot represent space bounds')
+
+    return Space(
+        space.space_type,
+        space.lower_bound.astype(dtype),
+        space.upper_bound.astype(dtype),
+    )
+
+
 class ArrayRepresentation(Generic[T]):
     @property
     @abc.abstractmethod
@@ -276,3 +303,104 @@ def compact_grid_object_representation_convert(
             grid_object_color_map[k],
         ]
     )
+
+
+def one_hot_grid_object_representation_space(num_channels: int) -> Space:
+    """The one-hot space of the representation
+
+    Returns a :py:class:`~gym_gridverse.representations.spaces.Space`
+    representing the space of a grid-object represented as a binary vector,
+    with one channel per compact index.
+
+    NOTE: used by
+    :class:`~gym_gridverse.representations.state_representations.OneHotGridObjectStateRepresentation`
+    and
+    :class:`~gym_gridverse.representations.observation_representations.OneHotGridObjectObservationRepresentation`,
+    refactored here because of DRY.
+    """
+
+    return Space.make_discrete_space(
+        np.zeros(num_channels, dtype=int),
+        np.ones(num_channels, dtype=int),
+    )
+
+
+def one_hot_grid_object_representation_convert(
+    grid_object_type_map: np.ndarray,
+    grid_object_state_map: np.ndarray,
+    grid_object_color_map: np.ndarray,
+    num_channels: int,
+    grid_object: GridObject,
+) -> np.ndarray:
+    """The one-hot conversion of a grid-object
+
+    Converts a :py:class:`~gym_gridverse.grid_object.GridObject` into a binary
+    vector, where the channels at the compact type-index, status-index, and
+    color-index are set.
+
+    NOTE: used by
+    :class:`~gym_gridverse.representations.state_representations.OneHotGridObjectStateRepresentation`
+    and
+    :class:`~gym_gridverse.representations.observation_representations.OneHotGridObjectObservationRepresentation`,
+    refactored here because of DRY.
+    """
+
+    one_hot = np.zeros(num_channels, dtype=int)
+    one_hot[
+        compact_grid_object_representation_convert(
+            grid_object_type_map,
+            grid_object_state_map,
+            grid_object_color_map,
+            grid_object,
+        )
+    ] = 1
+    return one_hot
+
+
+def packed_one_hot_grid_object_representation_space(num_channels: int) -> Space:
+    """The bit-packed one-hot space of the representation
+
+    Returns a :py:class:`~gym_gridverse.representations.spaces.Space`
+    representing the space of a grid-object represented as a binary vector
+    packed into bytes, i.e., each byte holds 8 consecutive one-hot channels
+    (see :py:func:`numpy.packbits` and :py:func:`numpy.unpackbits`).
+
+    NOTE: used by
+    :class:`~gym_gridverse.representations.state_representations.PackedOneHotGridObjectStateRepresentation`
+    and
+    :class:`~gym_gridverse.representations.observation_representations.PackedOneHotGridObjectObservationRepresentation`,
+    refactored here because of DRY.
+    """
+
+    num_bytes = (num_channels + 7) // 8
+    return Space.make_categorical_space(np.full(num_bytes, 255))
+
+
+def packed_one_hot_grid_object_representation_convert(
+    grid_object_type_map: np.ndarray,
+    grid_object_state_map: np.ndarray,
+    grid_object_color_map: np.ndarray,
+    num_channels: int,
+    grid_object: GridObject,
+) -> np.ndarray:
+    """The bit-packed one-hot conversion of a grid-object
+
+    Converts a :py:class:`~gym_gridverse.grid_object.GridObject` into its
+    one-hot binary vector, packed into bytes.
+
+    NOTE: used by
+    :class:`~gym_gridverse.representations.state_representations.PackedOneHotGridObjectStateRepresentation`
+    and
+    :class:`~gym_gridverse.representations.observation_representations.PackedOneHotGridObjectObservationRepresentation`,
+    refactored here because of DRY.
+    """
+
+    return np.packbits(
+        one_hot_grid_object_representation_convert(
+            grid_object_type_map,
+            grid_object_state_map,
+            grid_object_color_map,
+            num_channels,
+            grid_object,
+        )
+    )
@@ -1,18 +1,25 @@
-from typing import Dict, Iterable, Sequence, Tuple, Type
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Type
 
 import numpy as np
+from numpy.typing import DTypeLike
 
 from gym_gridverse.debugging import gv_debug
+from gym_gridverse.geometry import Orientation
 from gym_gridverse.grid_object import Color, GridObject, NoneGridObject
 from gym_gridverse.representations.representation import (
     ArrayRepresentation,
     StateRepresentation,
+    cast_space,
     compact_grid_object_representation_convert,
     compact_grid_object_representation_space,
     default_grid_object_representation_convert,
     default_grid_object_representation_space,
     no_overlap_grid_object_representation_convert,
     no_overlap_grid_object_representation_space,
+    one_hot_grid_object_representation_convert,
+    one_hot_grid_object_representation_space,
+    packed_one_hot_grid_object_representation_convert,
+    packed_one_hot_grid_object_representation_space,
 )
 from gym_gridverse.representations.spaces import Space
 from gym_gridverse.spaces import StateSpace
@@ -46,8 +53,9 @@ def _sorted_colors(colors: Iterable[Color]) -> Sequence[Color]:
 
 
 class ArrayStateRepresentation(ArrayRepresentation[State]):
-    def __init__(self, state_space: StateSpace):
+    def __init__(self, state_space: StateSpace, *, dtype: DTypeLike = int):
         self.state_space = state_space
+        self.dtype = np.dtype(dtype)
 
 
 class GridObjectStateRepresentation(ArrayRepresentation[GridObject]):
@@ -58,16 +66,27 @@ class GridObjectStateRepresentation(ArrayRepresentation[GridObject]):
 def make_state_representation(
     name: str,
     state_space: StateSpace,
+    *,
+    dtype: Optional[DTypeLike] = None,
+    float_dtype: DTypeLike = float,
+    egocentric: bool = False,
 ) -> StateRepresentation:
     """Factory function for state representations
 
+    The ``one-hot`` and ``one-hot-packed`` representations are built from
+    the ``compact`` indices;  ``one-hot-packed`` packs 8 one-hot channels in
+    each byte, which can be unpacked using :py:func:`numpy.unpackbits` along
+    the last axis.
+
     Args:
         name (str): name of the representation
         state_space (StateSpace): inner-environment state space
+        dtype (Optional[DTypeLike]): dtype of the integer arrays, defaults to int for index representations, and to uint8 for one-hot representations
+        float_dtype (DTypeLike): dtype of the floating arrays
+        egocentric (bool): whether to include the agent-centered grid, as `egocentric_grid`
     Returns:
         StateRepresentation:
     """
-    # TODO: test
 
     grid_object_representation: GridObjectStateRepresentation
 
@@ -75,53 +94,53 @@ def make_state_representation(
         grid_object_representation = DefaultGridObjectStateRepresentation(
             state_space
         )
-        representations = {
-            'grid': GridStateRepresentation(
-                state_space, grid_object_representation
-            ),
-            'agent_id_grid': AgentIDGridStateRepresentation(state_space),
-            'agent': AgentStateRepresentation(state_space),
-            'item': ItemStateRepresentation(
-                state_space, grid_object_representation
-            ),
-        }
-        return DictStateRepresentation(state_space, representations)
-
-    if name == 'no-overlap':
-        # NOTE:  only `grid` and `item` require a separate no-overlap representation
+    elif name == 'no-overlap':
         grid_object_representation = NoOverlapGridObjectStateRepresentation(
             state_space
         )
-        representations = {
-            'grid': GridStateRepresentation(
-                state_space, grid_object_representation
-            ),
-            'agent_id_grid': AgentIDGridStateRepresentation(state_space),
-            'agent': AgentStateRepresentation(state_space),
-            'item': ItemStateRepresentation(
-                state_space, grid_object_representation
-            ),
-        }
-        return DictStateRepresentation(state_space, representations)
-
-    if name == 'compact':
-        # NOTE:  only `grid` and `item` require a separate compact representation
+    elif name == 'compact':
         grid_object_representation = CompactGridObjectStateRepresentation(
             state_space
         )
-        representations = {
-            'grid': GridStateRepresentation(
-                state_space, grid_object_representation
-            ),
-            'agent_id_grid': AgentIDGridStateRepresentation(state_space),
-            'agent': AgentStateRepresentation(state_space),
-            'item': ItemStateRepresentation(
-                state_space, grid_object_representation
-            ),
-        }
-        return DictStateRepresentation(state_space, representations)
+    elif name == 'one-hot':
+        grid_object_representation = OneHotGridObjectStateRepresentation(
+            state_space
+        )
+    elif name == 'one-hot-packed':
+        grid_object_representation = PackedOneHotGridObjectStateRepresentation(
+            state_space
+        )
+    else:
+        raise ValueError(f'invalid name {name}')
+
+    if dtype is None:
+        dtype = np.uint8 if name.startswith('one-hot') else int
+
+    grid_representation = GridStateRepresentation(
+        state_space, grid_object_representation, dtype=dtype
+    )
+
+    # NOTE:  only `grid` and `item` depend on the grid-object representation
+    representations: Dict[str, ArrayStateRepresentation] = {
+        'grid': grid_representation,
+        'agent_id_grid': AgentIDGridStateRepresentation(
+            state_space, dtype=dtype
+        ),
+        'agent': AgentStateRepresentation(state_space, dtype=float_dtype),
+        'item': ItemStateRepresentation(
+            state_space, grid_object_representation, dtype=dtype
+        ),
+    }
+    if egocentric:
+        representations['egocentric_grid'] = EgocentricGridStateRepresentation(
+            state_space, grid_representation
+        )
+
+    # checks early that the dtypes can represent the spaces
+    for representation in representations.values():
+        representation.space
 
-    raise ValueError(f'invalid name {name}')
+    return DictStateRepresentation(state_space, representations)
 
 
 # representation composition
@@ -136,6 +155,15 @@ class DictStateRepresentation(StateRepresentation):
         super().__init__(state_space)
         self.representations = representations
 
+        # egocentric grids reuse the array of their grid representation
+        self._grid_keys = {
+            key: grid_key
+            for key, representation in representations.items()
+            if isinstance(representation, EgocentricGridStateRepresentation)
+            for grid_key, grid_representation in representations.items()
+            if grid_representation is representation.grid_representation
+        }
+
     @property
     def space(self) -> Dict[str, Space]:
         return {
@@ -147,10 +175,24 @@ class DictStateRepresentation(StateRepresentation):
         if gv_debug() and not self.state_space.contains(state):
             raise ValueError('state-space does not contain state')
 
-        return {
-            key: representation.convert(state)
-            for key, representation in self.representations.items()
-        }
+        arrays: Dict[str, np.ndarray] = {}
+        for key, representation in self.representations.items():
+            if key in self._grid_keys:
+                grid_key = self._grid_keys[key]
+                if grid_key not in arrays:
+                    arrays[grid_key] = self.representations[grid_key].convert(
+                        state
+                    )
+                assert isinstance(
+                    representation, EgocentricGridStateRepresentation
+                )
+                arrays[key] = representation.convert_grid(
+                    state, arrays[grid_key]
+                )
+            elif key not in arrays:
+                arrays[key] = representation.convert(state)
+
+        return {key: arrays[key] for key in self.representations}
 
 
 # dict field representations
@@ -161,8 +203,10 @@ class GridStateRepresentation(ArrayStateRepresentation):
         self,
         state_space: StateSpace,
         grid_object_representation: GridObjectStateRepresentation,
+        *,
+        dtype: DTypeLike = int,
     ):
-        super().__init__(state_space)
+        super().__init__(state_space, dtype=dtype)
         self.grid_object_representation = grid_object_representation
 
     @property
@@ -175,7 +219,9 @@ class GridStateRepresentation(ArrayStateRepresentation):
         lower_bound = np.tile(lower_bound, (height, width, 1))
         upper_bound = self.grid_object_representation.space.upper_bound
         upper_bound = np.tile(upper_bound, (height, width, 1))
-        return Space(space_type, lower_bound, upper_bound)
+        return cast_space(
+            Space(space_type, lower_bound, upper_bound), self.dtype
+        )
 
     def convert(self, state: State) -> np.ndarray:
         return np.array(
@@ -186,7 +232,7 @@ class GridStateRepresentation(ArrayStateRepresentation):
                 ]
                 for y in range(state.grid.shape.height)
             ],
-            int,
+            self.dtype,
         )
 
 
@@ -195,16 +241,20 @@ class ItemStateRepresentation(ArrayStateRepresentation):
         self,
         state_space: StateSpace,
         grid_object_representation: GridObjectStateRepresentation,
+        *,
+        dtype: DTypeLike = int,
     ):
-        super().__init__(state_space)
+        super().__init__(state_space, dtype=dtype)
         self.grid_object_representation = grid_object_representation
 
     @property
     def space(self) -> Space:
-        return self.grid_object_representation.space
+        return cast_space(self.grid_object_representation.space, self.dtype)
 
     def convert(self, state: State) -> np.ndarray:
-        return self.grid_object_representation.convert(state.agent.grid_object)
+        return self.grid_object_representation.convert(
+            state.agent.grid_object
+        ).astype(self.dtype, copy=False)
 
 
 class AgentIDGridStateRepresentation(ArrayStateRepresentation):
@@ -217,27 +267,30 @@ class AgentIDGridStateRepresentation(ArrayStateRepresentation):
             raise ValueError(f'negative height or width ({height, width})')
 
         return Space.make_discrete_space(
-            np.zeros((height, width), dtype=int),
-            np.ones((height, width), dtype=int),
+            np.zeros((height, width), dtype=self.dtype),
+            np.ones((height, width), dtype=self.dtype),
         )
 
     def convert(self, state: State) -> np.ndarray:
-        grid_agent_position = np.zeros(state.grid.shape.as_tuple, int)
+        grid_agent_position = np.zeros(state.grid.shape.as_tuple, self.dtype)
         grid_agent_position[state.agent.position.yx] = 1
         return grid_agent_position
 
 
 class AgentStateRepresentation(ArrayStateRepresentation):
+    def __init__(self, state_space: StateSpace, *, dtype: DTypeLike = float):
+        super().__init__(state_space, dtype=dtype)
+
     @property
     def space(self) -> Space:
         # 4 (last) entries for a one-hot encoding of the orientation
         return Space.make_continuous_space(
-            np.array([-1.0, -1.0, 0.0, 0.0, 0.0, 0.0]),
-            np.array([1.0, 1.0, 1.0, 1.0, 1.0, 1.0]),
+            np.array([-1.0, -1.0, 0.0, 0.0, 0.0, 0.0], dtype=self.dtype),
+            np.array([1.0, 1.0, 1.0, 1.0, 1.0, 1.0], dtype=self.dtype),
         )
 
     def convert(self, state: State) -> np.ndarray:
-        agent_array = np.zeros(6)
+        agent_array = np.zeros(6, self.dtype)
 
         # normalized between -1 and 1
         y = (2 * state.agent.position.y - state.grid.shape.height + 1) / (
@@ -255,6 +308,87 @@ class AgentStateRepresentation(ArrayStateRepresentation):
         return agent_array
 
 
+class EgocentricGridStateRepresentation(ArrayStateRepresentation):
+    """The grid, centered on the agent and rotated so that the agent faces up
+
+    The array has a fixed (2M-1, 2M-1) spatial shape, where M is the largest
+    grid dimension, so that the whole grid is contained for any agent pose;
+    the agent is at the center, and cells outside the grid are represented
+    as :py:class:`~gym_gridverse.grid_object.NoneGridObject`.  The array
+    produced by the grid representation is copied into a persistent padded
+    array, from which the agent-centered window is sliced and rotated;  when
+    both are part of a :py:class:`DictStateRepresentation`, the grid is
+    converted only once, see :py:meth:`convert_grid`.
+    """
+
+    def __init__(
+        self,
+        state_space: StateSpace,
+        grid_representation: GridStateRepresentation,
+    ):
+        super().__init__(state_space, dtype=grid_representation.dtype)
+        self.grid_representation = grid_representation
+
+        height = self.state_space.grid_shape.height
+        width = self.state_space.grid_shape.width
+        self._margin = max(height, width) - 1
+        padding = grid_representation.grid_object_representation.convert(
+            NoneGridObject()
+        )
+        self._padded = np.tile(
+            padding.astype(self.dtype),
+            (height + 2 * self._margin, width + 2 * self._margin, 1),
+        )
+
+    @property
+    def space(self) -> Space:
+        size = 2 * self._margin + 1
+        grid_object_space = (
+            self.grid_representation.grid_object_representation.space
+        )
+
+        space_type = grid_object_space.space_type
+        lower_bound = np.tile(grid_object_space.lower_bound, (size, size, 1))
+        upper_bound = np.tile(grid_object_space.upper_bound, (size, size, 1))
+        return cast_space(
+            Space(space_type, lower_bound, upper_bound), self.dtype
+        )
+
+    def convert(self, state: State) -> np.ndarray:
+        return self.convert_grid(state, self.grid_representation.convert(state))
+
+    def convert_grid(self, state: State, grid: np.ndarray) -> np.ndarray:
+        """Returns the agent-centered window of an already converted grid
+
+        Args:
+            state (State): the state which the grid was converted from
+            grid (np.ndarray): the output of the grid representation
+
+        Returns:
+            np.ndarray:
+        """
+        margin = self._margin
+        size = 2 * margin + 1
+        height, width = grid.shape[:2]
+        self._padded[margin : margin + height, margin : margin + width] = grid
+
+        y, x = state.agent.position.yx
+        window = self._padded[y : y + size, x : x + size]
+        return np.rot90(
+            window, _orientation_rotations[state.agent.orientation]
+        ).copy()
+
+
+# number of counter-clockwise quarter turns which bring the agent orientation
+# to face up, i.e., towards decreasing y
+_orientation_rotations = {
+    Orientation.F: 0,
+    Orientation.R: 1,
+    Orientation.B: 2,
+    Orientation.L: 3,
+}
+
+
 # grid-object representations
 
 
@@ -384,3 +518,59 @@ class CompactGridObjectStateRepresentation(GridObjectStateRepresentation):
             self._grid_object_color_map,
             grid_object,
         )
+
+
+class OneHotGridObjectStateRepresentation(CompactGridObjectStateRepresentation):
+    """The one-hot representation for a grid-object
+
+    Sets the channels of the compact type, status, and color indices.  See
+    :func:`gym_gridverse.representations.representation.one_hot_grid_object_representation_space`
+    and
+    :func:`gym_gridverse.representations.representation.one_hot_grid_object_representation_convert`
+    for more information.
+    """
+
+    def __init__(self, state_space: StateSpace):
+        super().__init__(state_space)
+        self._num_channels = int(self._grid_object_color_map.max()) + 1
+
+    @property
+    def space(self) -> Space:
+        return one_hot_grid_object_representation_space(self._num_channels)
+
+    def convert(self, grid_object: GridObject) -> np.ndarray:
+        return one_hot_grid_object_representation_convert(
+            self._grid_object_type_map,
+            self._grid_object_status_map,
+            self._grid_object_color_map,
+            self._num_channels,
+            grid_object,
+        )
+
+
+class PackedOneHotGridObjectStateRepresentation(
+    OneHotGridObjectStateRepresentation
+):
+    """The bit-packed one-hot representation for a grid-object
+
+    Packs the one-hot channels into bytes.  See
+    :func:`gym_gridverse.representations.representation.packed_one_hot_grid_object_representation_space`
+    and
+    :func:`gym_gridverse.representations.representation.packed_one_hot_grid_object_representation_convert`
+    for more information.
+    """
+
+    @property
+    def space(self) -> Space:
+        return packed_one_hot_grid_object_representation_space(
+            self._num_channels
+        )
+
+    def convert(self, grid_object: GridObject) -> np.ndarray:
+        return packed_one_hot_grid_object_representation_convert(
+            self._grid_object_type_map,
+            self._grid_object_status_map,
+            self._grid_object_color_map,
+            self._num_channels,
+            grid_object,
+        )
@@ -1,27 +1,36 @@
-from typing import List, Optional, Sequence, TypeVar
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, TypeVar
 
+import numpy as np
 import numpy.random as rnd
 
 from gymnasium.utils.seeding import np_random
 
-# library-level generator, used if one is not provided (e.g. by environment)
-_gv_rng: Optional[rnd.Generator] = None
+# library-level generator, used if one is not provided (e.g. by environment);
+# context-local, so that each thread (or asyncio task) has its own generator
+_gv_rng: ContextVar[Optional[rnd.Generator]] = ContextVar(
+    'gv_rng', default=None
+)
+
 
 def make_rng(seed: Optional[int] = None) -> rnd.Generator:
     """make a new rng object"""
     _rng, seed = np_random(seed)
     return _rng
 
+
 def reset_gv_rng(seed: Optional[int] = None) -> rnd.Generator:
-    """reset the gym-gridverse module rng"""
-    global _gv_rng
-    _gv_rng = make_rng(seed)
-    return _gv_rng
+    """reset the gym-gridverse module rng of the current context"""
+    rng = make_rng(seed)
+    _gv_rng.set(rng)
+    return rng
 
 
 def get_gv_rng() -> rnd.Generator:
-    """get (and reset if necessary) gym-gridverse module rng"""
-    return reset_gv_rng() if _gv_rng is None else _gv_rng
+    """get (and reset if necessary) gym-gridverse module rng of the current context"""
+    rng = _gv_rng.get()
+    return reset_gv_rng() if rng is None else rng
 
 
 def get_gv_rng_if_none(rng: Optional[rnd.Generator]) -> rnd.Generator:
@@ -29,6 +38,172 @@ def get_gv_rng_if_none(rng: Optional[rnd.Generator]) -> rnd.Generator:
     return get_gv_rng() if rng is None else rng
 
 
+@contextmanager
+def gv_rng_context(
+    rng: Optional[rnd.Generator] = None,
+) -> Iterator[rnd.Generator]:
+    """use a generator as gym-gridverse module rng within a context
+
+    The previous generator is restored on exit.
+
+    Args:
+        rng (Optional[Generator]): generator, a new one if None
+    Returns:
+        Iterator[Generator]: the generator used within the context
+    """
+    if rng is None:
+        rng = make_rng()
+
+    token = _gv_rng.set(rng)
+    try:
+        yield rng
+    finally:
+        _gv_rng.reset(token)
+
+
+RngState = Tuple[Any, ...]
+"""opaque rng state, see :py:func:`get_rng_state`"""
+
+
+def get_rng_state(rng: rnd.Generator) -> RngState:
+    """returns the state of the rng, which can be restored by set_rng_state"""
+    if isinstance(rng, BufferedGenerator):
+        # the block is replaced rather than modified, and can be shared
+        return (rng.bit_generator.state, rng._block, rng._index)
+
+    return (rng.bit_generator.state,)
+
+
+def set_rng_state(rng: rnd.Generator, state: RngState):
+    """restores a state returned by get_rng_state"""
+    rng.bit_generator.state = state[0]
+
+    if isinstance(rng, BufferedGenerator):
+        _, rng._block, rng._index = state
+
+
+class BufferedGenerator(rnd.Generator):
+    """Generator which serves scalar draws from a prefetched block of uniforms.
+
+    Scalar calls to :py:meth:`choice`, :py:meth:`integers`, and
+    :py:meth:`random` (which the library functions make many of, e.g.,
+    ``rng.choice(len(positions))``) are served from a block of uniform
+    samples, which is refilled ``block_size`` samples at a time;  all other
+    calls are forwarded to :py:class:`numpy.random.Generator`.  The drawn
+    values are fully determined by the bit generator and the sequence of
+    calls, but differ from those of a plain Generator with the same bit
+    generator.
+    """
+
+    def __init__(self, bit_generator: rnd.BitGenerator, block_size: int = 256):
+        if block_size <= 0:
+            raise ValueError(f'block_size ({block_size}) should be positive')
+
+        super().__init__(bit_generator)
+        self.block_size = block_size
+        self._block: np.ndarray = np.empty(0)
+        self._index = 0
+
+    def __reduce__(self):
+        return (
+            self.__class__,
+            (self.bit_generator, self.block_size),
+            {'_block': self._block, '_index': self._index},
+        )
+
+    def __setstate__(self, state):
+        self._block = state['_block']
+        self._index = state['_index']
+
+    def _uniform(self) -> float:
+        if self._index == len(self._block):
+            self._block = rnd.Generator.random(self, self.block_size)
+            self._index = 0
+
+        u = self._block[self._index]
+        self._index += 1
+        return float(u)
+
+    def choice(self, a, size=None, replace=True, p=None, axis=0, shuffle=True):
+        if size is None and p is None and isinstance(a, (int, np.integer)):
+            if a <= 0:
+                raise ValueError('a must be a positive integer')
+
+            return int(self._uniform() * a)
+
+        return super().choice(a, size, replace, p, axis, shuffle)
+
+    def integers(
+        self, low, high=None, size=None, dtype=np.int64, endpoint=False
+    ):
+        if (
+            size is None
+            and dtype is np.int64
+            and isinstance(low, (int, np.integer))
+            and isinstance(high, (int, np.integer, type(None)))
+        ):
+            if high is None:
+                low, high = 0, low
+            if endpoint:
+                high += 1
+            if low >= high:
+                raise ValueError('low >= high')
+
+            return int(low + int(self._uniform() * (high - low)))
+
+        return super().integers(low, high, size, dtype, endpoint)
+
+    def random(self, size=None, dtype=np.float64, out=None):
+        if size is None and dtype is np.float64 and out is None:
+            return self._uniform()
+
+        return super().random(size, dtype, out)
+
+
+class RngStreams:
+    """Counter-based random streams, keyed by (seed, env index, episode).
+
+    Each stream is a :py:class:`BufferedGenerator` over a
+    :py:class:`~numpy.random.Philox` bit generator, whose key is derived from
+    the seed, and whose counter starts at a disjoint offset determined by the
+    env index and episode.  Hence, the randomness of each episode does not
+    depend on which process runs it, or on how many episodes other
+    environments ran before it.
+    """
+
+    def __init__(self, seed: Optional[int] = None, *, block_size: int = 256):
+        """Derives the stream key from the seed
+
+        Args:
+            seed (Optional[int]): root seed, generated from OS entropy if None
+            block_size (int): number of uniform samples prefetched at a time
+        """
+        seed_sequence = rnd.SeedSequence(seed)
+        self.seed: int = seed_sequence.entropy  # type: ignore
+        self.block_size = block_size
+        self._key = seed_sequence.generate_state(2, np.uint64)
+
+    def generator(self, env_index: int, episode: int) -> BufferedGenerator:
+        """Returns the generator of an episode of an environment
+
+        Args:
+            env_index (int): index of the environment, non-negative
+            episode (int): index of the episode, non-negative
+        Returns:
+            BufferedGenerator:
+        """
+        if env_index < 0 or episode < 0:
+            raise ValueError(
+                f'env_index ({env_index}) and episode ({episode}) should be non-negative'
+            )
+
+        # the counter increments from the lowest word, so that streams with
+        # different (episode, env_index) high words never overlap
+        counter = np.array([0, 0, episode, env_index], dtype=np.uint64)
+        bit_generator = rnd.Philox(key=self._key, counter=counter)
+        return BufferedGenerator(bit_generator, self.block_size)
+
+
 # auxiliary methods solve typing issues associated with rng sampling
 
 T = TypeVar('T')
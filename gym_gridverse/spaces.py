@@ -193,10 +193,9 @@ class ObservationSpace:
         grid_objs_in_space = observation.grid.object_types().issubset(
             self._grid_object_types
         )
-        grid_objs_colors_in_space = set(
-            observation.grid[pos].color
-            for pos in observation.grid.area.positions()
-        ).issubset(self.colors)
+        grid_objs_colors_in_space = observation.grid.colors().issubset(
+            self.colors
+        )
         agent_obj_color_in_space = (
             observation.agent.grid_object.color in self.colors
         )
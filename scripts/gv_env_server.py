@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+import argparse
+import os
+import secrets
+import signal
+from functools import partial
+
+from gym_gridverse.env_server import EnvServer
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.outer_env import OuterEnv
+from gym_gridverse.representations.observation_representations import (
+    make_observation_representation,
+)
+from gym_gridverse.representations.state_representations import (
+    make_state_representation,
+)
+
+
+def make_env(path: str) -> OuterEnv:
+    """Makes a GV "outer" environment."""
+    inner_env = factory_env_from_yaml(path)
+    state_representation = make_state_representation(
+        'default',
+        inner_env.state_space,
+    )
+    observation_representation = make_observation_representation(
+        'default',
+        inner_env.observation_space,
+    )
+    return OuterEnv(
+        inner_env,
+        state_representation=state_representation,
+        observation_representation=observation_representation,
+    )
+
+
+def load_authkey(path: str) -> bytes:
+    """Reads the authentication key, or creates a random one readable only by the user."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+
+    authkey = secrets.token_bytes(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(authkey)
+
+    return authkey
+
+
+def main(args):
+    authkey_file = (
+        args.authkey_file
+        if args.authkey_file is not None
+        else f'{args.address}.key'
+    )
+    server = EnvServer(
+        partial(make_env, args.path),
+        args.address,
+        batch_window=args.batch_window,
+        authkey=load_authkey(authkey_file),
+    )
+
+    def close(signum, frame):
+        server.close()
+
+    signal.signal(signal.SIGINT, close)
+    signal.signal(signal.SIGTERM, close)
+
+    print(f'serving {args.path} on {args.address} (authkey {authkey_file})')
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', help='env YAML file')
+    parser.add_argument('address', help='path of the Unix domain socket')
+    parser.add_argument(
+        '--batch-window',
+        type=float,
+        default=0.001,
+        help='seconds to wait for further requests once one is received (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--authkey-file',
+        help='file with the key shared with the clients, created if missing (default:  ADDRESS.key)',
+    )
+    main(parser.parse_args())
@@ -1,12 +1,24 @@
 #!/usr/bin/env python
 import argparse
+import cProfile
+import functools
+import gc
+import json
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
 
 import gymnasium as gym
 import tqdm
 
+import gym_gridverse.envs.transition_functions as transition_functions
 from gym_gridverse.debugging import reset_gv_debug
+from gym_gridverse.envs.gridworld import GridWorld
 from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
-from gym_gridverse.gym import GymEnvironment
+from gym_gridverse.gym import STRING_TO_YAML_FILE, GymEnvironment
 from gym_gridverse.outer_env import OuterEnv
 from gym_gridverse.representations.observation_representations import (
     make_observation_representation,
@@ -15,6 +27,15 @@ from gym_gridverse.representations.state_representations import (
     make_state_representation,
 )
 
+COMPONENTS = [
+    'copy',
+    'transition',
+    'reward',
+    'terminating',
+    'observation',
+    'representation',
+]
+
 
 def make_env(id_or_path: str) -> GymEnvironment:
     try:
@@ -38,28 +59,281 @@ def make_env(id_or_path: str) -> GymEnvironment:
         env = GymEnvironment(outer_env)
 
     else:
-        if not isinstance(env, GymEnvironment):
+        if not isinstance(env.unwrapped, GymEnvironment):
             raise ValueError(
                 f'gym id {id_or_path} is not associated with a GridVerse environment'
             )
 
+        env = env.unwrapped
+
     return env
 
 
-if __name__ == '__main__':
-    parser = argparse.ArgumentParser()
-    parser.add_argument('id_or_path', help='Gym env id or env YAML file')
-    parser.add_argument('--timesteps', type=int, default=1_000_000)
-    args = parser.parse_args()
+class ComponentStats:
+    """Time and traced memory of the calls to a component"""
 
-    reset_gv_debug(False)
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        # memory allocated during a call, above the memory before the call
+        self.peak_bytes = 0
+        self.max_peak_bytes = 0
+        # memory still allocated after a call
+        self.net_bytes = 0
+
+    def as_dict(self, num_steps: int) -> Dict[str, float]:
+        return {
+            'calls_per_step': self.calls / num_steps,
+            'seconds_per_step': self.seconds / num_steps,
+            'peak_bytes_per_call': self.peak_bytes / max(self.calls, 1),
+            'max_peak_bytes': self.max_peak_bytes,
+            'net_bytes_per_step': self.net_bytes / num_steps,
+        }
+
+
+class AllocationProfiler:
+    """Attributes the traced memory of each step to the env components
+
+    Components are profiled by wrapping the functions of the environment;
+    each wrapped call resets the tracemalloc peak, so that the peak measured
+    at the end of the call is the memory allocated by the call itself.
+    Components are never nested within each other.
+    """
+
+    def __init__(self):
+        self.stats = {component: ComponentStats() for component in COMPONENTS}
+
+    def wrap(self, component: str, function: Callable) -> Callable:
+        stats = self.stats[component]
+
+        # functools.wraps preserves the signature, e.g., the `context`
+        # keyword detected by GridWorld
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start_bytes, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            start_time = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stats.seconds += time.perf_counter() - start_time
+                end_bytes, peak_bytes = tracemalloc.get_traced_memory()
+                stats.calls += 1
+                stats.peak_bytes += peak_bytes - start_bytes
+                stats.max_peak_bytes = max(
+                    stats.max_peak_bytes, peak_bytes - start_bytes
+                )
+                stats.net_bytes += end_bytes - start_bytes
+
+        return wrapper
+
+    def instrument(self, env: GymEnvironment):
+        inner_env = env.outer_env.inner_env
+        if not isinstance(inner_env, GridWorld):
+            raise ValueError('allocation profiling requires a GridWorld')
 
-    env = make_env(args.id_or_path)
-    env.reset()
+        # the copy is made by `transition_with_copy`, through the module global
+        transition_functions.fast_copy = self.wrap(
+            'copy', transition_functions.fast_copy
+        )
+        inner_env._transition_function = self.wrap(
+            'transition', inner_env._transition_function
+        )
+        inner_env._reward_function = self.wrap(
+            'reward', inner_env._reward_function
+        )
+        inner_env._termination_function = self.wrap(
+            'terminating', inner_env._termination_function
+        )
+        inner_env._observation_function = self.wrap(
+            'observation', inner_env._observation_function
+        )
+        for representation in [
+            env.outer_env.state_representation,
+            env.outer_env.observation_representation,
+        ]:
+            if representation is not None:
+                # the instance attribute shadows the bound method
+                setattr(
+                    representation,
+                    'convert',
+                    self.wrap('representation', representation.convert),
+                )
+
+
+class GCMonitor:
+    """Counts garbage collections and their pause times"""
 
-    for _ in tqdm.trange(args.timesteps):
+    def __init__(self):
+        self.collections = [0, 0, 0]
+        self.seconds = 0.0
+        self._start_time = 0.0
+
+    def __enter__(self):
+        gc.callbacks.append(self._callback)
+        return self
+
+    def __exit__(self, *args):
+        gc.callbacks.remove(self._callback)
+
+    def _callback(self, phase: str, info: Dict[str, int]):
+        if phase == 'start':
+            self._start_time = time.perf_counter()
+        else:
+            self.collections[info['generation']] += 1
+            self.seconds += time.perf_counter() - self._start_time
+
+
+def run_steps(env: GymEnvironment, timesteps: int, *, progress: bool = False):
+    env.reset(seed=0)
+    env.action_space.seed(0)
+
+    steps = tqdm.trange(timesteps) if progress else range(timesteps)
+    for _ in steps:
         action = env.action_space.sample()
-        _, _, done, _ = env.step(action)
+        _, _, terminated, truncated, _ = env.step(action)
 
-        if done:
+        if terminated or truncated:
             env.reset()
+
+
+def profile_allocations(
+    id_or_path: str, timesteps: int, *, num_sites: int
+) -> Dict:
+    """Profiles the allocations of an env, and returns a JSON-able report"""
+    env = make_env(id_or_path)
+    profiler = AllocationProfiler()
+    fast_copy = transition_functions.fast_copy
+    profiler.instrument(env)
+
+    profile = cProfile.Profile()
+    tracemalloc.start()
+    try:
+        start_time = time.perf_counter()
+        with GCMonitor() as gc_monitor:
+            profile.enable()
+            run_steps(env, timesteps)
+            profile.disable()
+        seconds = time.perf_counter() - start_time
+
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+        transition_functions.fast_copy = fast_copy
+
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+    allocation_sites = [
+        {
+            'file': statistic.traceback[0].filename,
+            'line': statistic.traceback[0].lineno,
+            'bytes': statistic.size,
+            'blocks': statistic.count,
+        }
+        for statistic in snapshot.statistics('lineno')[:num_sites]
+    ]
+
+    stats = pstats.Stats(profile)
+    functions: List[Dict] = []
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in sorted(
+        stats.stats.items(),  # type: ignore
+        key=lambda item: item[1][2],
+        reverse=True,
+    )[:num_sites]:
+        functions.append(
+            {
+                'function': f'{filename}:{line}({name})',
+                'calls': calls,
+                'tottime': tottime,
+                'cumtime': cumtime,
+            }
+        )
+
+    return {
+        'timesteps': timesteps,
+        'steps_per_second': timesteps / seconds,
+        'peak_bytes': peak_bytes,
+        'components': {
+            component: component_stats.as_dict(timesteps)
+            for component, component_stats in profiler.stats.items()
+        },
+        'gc': {
+            'collections': gc_monitor.collections,
+            'pause_seconds': gc_monitor.seconds,
+        },
+        'allocation_sites': allocation_sites,
+        'functions': functions,
+    }
+
+
+def main_alloc(args):
+    ids_or_paths = args.id_or_path or list(STRING_TO_YAML_FILE)
+    timesteps = 1_000 if args.timesteps is None else args.timesteps
+
+    report = {
+        'python': sys.version,
+        'platform': platform.platform(),
+        'envs': {},
+    }
+    for id_or_path in tqdm.tqdm(ids_or_paths, disable=args.output is None):
+        report['envs'][id_or_path] = profile_allocations(
+            id_or_path, timesteps, num_sites=args.num_sites
+        )
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+def main_speed(args):
+    if len(args.id_or_path) != 1:
+        raise ValueError('speed mode requires exactly one env')
+
+    timesteps = 1_000_000 if args.timesteps is None else args.timesteps
+    env = make_env(args.id_or_path[0])
+    run_steps(env, timesteps, progress=True)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'id_or_path',
+        nargs='*',
+        help='Gym env id or env YAML file (alloc mode:  all registered envs if none)',
+    )
+    parser.add_argument('--mode', choices=['speed', 'alloc'], default='speed')
+    parser.add_argument(
+        '--timesteps',
+        type=int,
+        default=None,
+        help='number of steps per env (default:  1M in speed mode, 1K in alloc mode)',
+    )
+    parser.add_argument(
+        '--num-sites',
+        type=int,
+        default=20,
+        help='number of allocation sites and functions reported (alloc mode)',
+    )
+    parser.add_argument(
+        '--output', default=None, help='JSON output file (alloc mode)'
+    )
+    args = parser.parse_args(argv)
+
+    reset_gv_debug(False)
+
+    if args.mode == 'alloc':
+        main_alloc(args)
+    else:
+        main_speed(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+"""Benchmarks the start-up cost of GridVerse workers.
+
+Every measurement runs in a fresh interpreter, so that nothing is already
+imported or cached:  the cold ``import gym_gridverse``, ``gym.make`` of each
+registered environment, and its first ``reset()``.  The import is also broken
+down by module by parsing the output of ``python -X importtime``.  Results
+can be stored as a JSON baseline, and compared against later runs.
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from typing_extensions import TypedDict
+
+IMPORT_CODE = '''
+import json, time
+start = time.perf_counter()
+import gym_gridverse
+print(json.dumps({'import': time.perf_counter() - start}))
+'''
+
+MAKE_CODE = '''
+import json, sys, time
+start = time.perf_counter()
+import gym_gridverse
+import gymnasium as gym
+imported = time.perf_counter()
+env = gym.make(sys.argv[1])
+made = time.perf_counter()
+env.reset(seed=0)
+reset = time.perf_counter()
+print(json.dumps({
+    'import': imported - start,
+    'make': made - imported,
+    'reset': reset - made,
+}))
+'''
+
+IMPORTTIME_PATTERN = re.compile(
+    r'^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|(?P<indent>\s*)(?P<module>\S+)$'
+)
+
+
+class ModuleTime(TypedDict):
+    module: str
+    self: float
+    cumulative: float
+    depth: int
+
+
+def run_python(code: str, *args: str) -> Dict[str, float]:
+    """Runs code in a fresh interpreter, and returns its JSON output with the process wall time"""
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, '-c', code, *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+
+    timings = json.loads(process.stdout.splitlines()[-1])
+    timings['process'] = wall
+    return timings
+
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    return {
+        key: {
+            'median': statistics.median(sample[key] for sample in samples),
+            'min': min(sample[key] for sample in samples),
+        }
+        for key in samples[0]
+    }
+
+
+def measure_import(repeats: int) -> Dict[str, Dict[str, float]]:
+    return summarize([run_python(IMPORT_CODE) for _ in range(repeats)])
+
+
+def measure_make(env_id: str, repeats: int) -> Dict[str, Dict[str, float]]:
+    return summarize([run_python(MAKE_CODE, env_id) for _ in range(repeats)])
+
+
+def measure_importtime(num_modules: int) -> Dict:
+    """Parses ``-X importtime``, and returns per-module and per-package times in seconds"""
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import gym_gridverse'],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    modules: List[ModuleTime] = []
+    for line in process.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match is not None:
+            modules.append(
+                {
+                    'module': match['module'],
+                    'self': int(match['self']) * 1e-6,
+                    'cumulative': int(match['cumulative']) * 1e-6,
+                    'depth': len(match['indent']) // 2,
+                }
+            )
+
+    packages: Dict[str, float] = defaultdict(float)
+    for module in modules:
+        packages[module['module'].split('.')[0]] += module['self']
+
+    return {
+        'total': sum(module['self'] for module in modules),
+        'packages': dict(
+            sorted(packages.items(), key=lambda item: item[1], reverse=True)
+        ),
+        'modules': sorted(
+            modules, key=lambda module: module['cumulative'], reverse=True
+        )[:num_modules],
+    }
+
+
+def flatten(results: Dict) -> Dict[str, float]:
+    """Returns the median timings, keyed by measurement"""
+    flat = {
+        f'import/{key}': value['median']
+        for key, value in results['import'].items()
+    }
+    for env_id, timings in results['envs'].items():
+        flat.update(
+            {
+                f'{env_id}/{key}': value['median']
+                for key, value in timings.items()
+            }
+        )
+    return flat
+
+
+def compare(results: Dict, baseline: Dict, max_slowdown: float) -> bool:
+    """Prints the ratio of each timing to its baseline, and returns whether all are within max_slowdown"""
+    current = flatten(results)
+    previous = flatten(baseline)
+
+    ok = True
+    for key in sorted(current.keys() & previous.keys()):
+        ratio = current[key] / previous[key]
+        flag = ''
+        if ratio > max_slowdown:
+            flag = '  SLOWER'
+            ok = False
+        print(
+            f'{key:<45} {previous[key] * 1e3:9.1f}ms -> {current[key] * 1e3:9.1f}ms'
+            f' ({ratio:5.2f}x){flag}'
+        )
+
+    return ok
+
+
+def print_results(results: Dict):
+    timings = results['import']
+    print(
+        f'import gym_gridverse:  {timings["import"]["median"] * 1e3:.1f}ms'
+        f' (process {timings["process"]["median"] * 1e3:.1f}ms)'
+    )
+
+    print('\nimport time by package (-X importtime, self):')
+    for package, seconds in list(results['importtime']['packages'].items())[
+        :10
+    ]:
+        print(f'  {package:<30} {seconds * 1e3:9.1f}ms')
+
+    print('\nslowest modules (-X importtime, cumulative):')
+    for module in results['importtime']['modules']:
+        print(f'  {module["module"]:<50} {module["cumulative"] * 1e3:9.1f}ms')
+
+    if results['envs']:
+        print(f'\n{"env":<30} {"make":>9} {"reset":>9} {"process":>9}')
+    for env_id, timings in results['envs'].items():
+        print(
+            f'{env_id:<30}'
+            f' {timings["make"]["median"] * 1e3:7.1f}ms'
+            f' {timings["reset"]["median"] * 1e3:7.1f}ms'
+            f' {timings["process"]["median"] * 1e3:7.1f}ms'
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        'env_ids',
+        nargs='*',
+        help='gym ids to make and reset (default:  all registered GV ids)',
+    )
+    parser.add_argument(
+        '--repeats',
+        type=int,
+        default=5,
+        help='fresh processes per measurement',
+    )
+    parser.add_argument(
+        '--num-modules',
+        type=int,
+        default=20,
+        help='number of slowest modules reported',
+    )
+    parser.add_argument('--output', help='JSON results file')
+    parser.add_argument('--save-baseline', help='store results as baseline')
+    parser.add_argument('--baseline', help='compare against stored baseline')
+    parser.add_argument(
+        '--max-slowdown',
+        type=float,
+        default=1.2,
+        help='ratio to the baseline above which the comparison fails',
+    )
+    args = parser.parse_args(argv)
+
+    env_ids = args.env_ids
+    if not env_ids:
+        from gym_gridverse.gym import STRING_TO_YAML_FILE
+
+        env_ids = list(STRING_TO_YAML_FILE)
+
+    results = {
+        'python': sys.version,
+        'repeats': args.repeats,
+        'import': measure_import(args.repeats),
+        'importtime': measure_importtime(args.num_modules),
+        'envs': {
+            env_id: measure_make(env_id, args.repeats) for env_id in env_ids
+        },
+    }
+    print_results(results)
+
+    for filename in [args.output, args.save_baseline]:
+        if filename is not None:
+            with open(filename, 'w') as f:
+                json.dump(results, f, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        print(f'\ncomparison with {args.baseline}:')
+        if not compare(results, baseline, args.max_slowdown):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
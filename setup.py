@@ -54,8 +54,10 @@ setup(
         'scripts/gv_control_loop_gym.py',
         'scripts/gv_control_loop_inner.py',
         'scripts/gv_control_loop_outer.py',
+        'scripts/gv_env_server.py',
         'scripts/gv_profile.py',
         'scripts/gv_record.py',
+        'scripts/gv_startup.py',
         'scripts/gv_viewer.py',
         'scripts/gv_yaml.py',
         'scripts/gv_yaml_schema.py',
@@ -0,0 +1,203 @@
+import math
+from collections import Counter
+from typing import Type
+
+import numpy as np
+import numpy.random as rnd
+import pytest
+
+from gym_gridverse.action import Action
+from gym_gridverse.envs import batch_reset_functions, reset_functions
+from gym_gridverse.envs.batch_reset_functions import buffered, factory
+from gym_gridverse.envs.oracle import ShortestPathOracle
+from gym_gridverse.geometry import Shape
+from gym_gridverse.grid_object import Beacon, Color, Exit, MovingObstacle, Wall
+from gym_gridverse.representations.representation import (
+    default_grid_object_representation_convert,
+)
+
+CASES = [
+    ('empty', {'shape': Shape(6, 7)}),
+    (
+        'empty',
+        {'shape': Shape(6, 7), 'random_agent': True, 'random_exit': True},
+    ),
+    ('rooms', {'shape': Shape(10, 13), 'layout': (2, 3)}),
+    ('dynamic_obstacles', {'shape': Shape(8, 8), 'num_obstacles': 6}),
+    (
+        'dynamic_obstacles',
+        {'shape': Shape(8, 8), 'num_obstacles': 6, 'random_agent': True},
+    ),
+    ('keydoor', {'shape': Shape(5, 9)}),
+    ('crossing', {'shape': Shape(9, 11), 'num_rivers': 3, 'object_type': Wall}),
+    ('teleport', {'shape': Shape(7, 7)}),
+    ('memory', {'shape': Shape(7, 9), 'colors': {Color.RED, Color.BLUE}}),
+    (
+        'memory_rooms',
+        {
+            'shape': Shape(9, 9),
+            'layout': (2, 2),
+            'colors': {Color.RED, Color.GREEN, Color.BLUE},
+            'num_beacons': 2,
+            'num_exits': 3,
+        },
+    ),
+]
+
+
+def type_counts(state) -> Counter:
+    return Counter(
+        type(state.grid[position]) for position in state.grid.area.positions()
+    )
+
+
+@pytest.mark.parametrize('name,kwargs', CASES)
+def test_batch_matches_sequential(name: str, kwargs):
+    rng = rnd.default_rng(0)
+    batch = batch_reset_functions.batch_reset_function_registry[name](
+        20, **kwargs, rng=rng
+    )
+    assert len(batch) == 20
+
+    sequential_state = reset_functions.reset_function_registry[name](
+        **kwargs, rng=rng
+    )
+    for state in batch.states():
+        assert state.grid.shape == sequential_state.grid.shape
+        assert not state.grid[state.agent.position].blocks_movement
+
+        # the number of rivers across the path depends on the sampled rivers
+        if name != 'crossing':
+            assert type_counts(state) == type_counts(sequential_state)
+
+
+@pytest.mark.parametrize('name,kwargs', CASES)
+def test_batch_compact(name: str, kwargs):
+    batch = batch_reset_functions.batch_reset_function_registry[name](
+        5, **kwargs, rng=rnd.default_rng(0)
+    )
+    compact = batch.compact()
+
+    for i, state in enumerate(batch.states()):
+        for position in state.grid.area.positions():
+            np.testing.assert_array_equal(
+                compact[i, position.y, position.x],
+                default_grid_object_representation_convert(
+                    state.grid[position]
+                ),
+            )
+
+
+@pytest.mark.parametrize(
+    'name,kwargs',
+    [
+        ('rooms', {'shape': Shape(10, 13), 'layout': (2, 3)}),
+        (
+            'crossing',
+            {'shape': Shape(9, 11), 'num_rivers': 3, 'object_type': Wall},
+        ),
+        (
+            'crossing',
+            {'shape': Shape(9, 9), 'num_rivers': 10, 'object_type': Wall},
+        ),
+    ],
+)
+def test_batch_exit_reachable(name: str, kwargs):
+    batch = batch_reset_functions.batch_reset_function_registry[name](
+        50, **kwargs, rng=rnd.default_rng(0)
+    )
+    oracle = ShortestPathOracle(list(Action))
+
+    for state in batch.states():
+        assert math.isfinite(oracle.distance(state))
+
+
+def test_batch_sampling_is_uniform():
+    # 4x4 interior, one exit cell, 15 possible agent positions
+    batch = batch_reset_functions.empty(
+        3_000, Shape(6, 6), random_agent=True, rng=rnd.default_rng(0)
+    )
+    positions, counts = np.unique(
+        batch.agent_position, axis=0, return_counts=True
+    )
+    assert len(positions) == 15
+    assert counts.min() > 150
+
+
+def test_batch_memory_colors():
+    batch = batch_reset_functions.memory(
+        100, Shape(7, 9), {Color.RED, Color.BLUE}, rng=rnd.default_rng(0)
+    )
+
+    for state in batch.states():
+        beacon = state.grid[5, 1]
+        assert isinstance(beacon, Beacon)
+        exits = [state.grid[1, 1], state.grid[1, 7]]
+        assert all(isinstance(exit, Exit) for exit in exits)
+        assert sorted(exit.color.value for exit in exits) == sorted(
+            [Color.RED.value, Color.BLUE.value]
+        )
+        assert beacon.color in [exit.color for exit in exits]
+
+
+def test_batch_objects_are_distinct():
+    state = batch_reset_functions.keydoor(1, Shape(5, 9)).state(0)
+    assert state.grid[1, 1] is not state.grid[1, 2]
+
+
+def test_buffered():
+    calls = []
+
+    def batch_reset_function(n, *, rng=None):
+        calls.append(n)
+        return batch_reset_functions.dynamic_obstacles(
+            n, Shape(6, 6), 3, random_agent=True, rng=rng
+        )
+
+    reset_function = buffered(batch_reset_function, 4)
+    states = [reset_function(rng=rnd.default_rng(i)) for i in range(6)]
+
+    assert calls == [4, 4]
+    assert all(
+        sum(
+            isinstance(obj, MovingObstacle)
+            for row in state.grid.objects
+            for obj in row
+        )
+        == 3
+        for state in states
+    )
+
+    with pytest.raises(ValueError):
+        buffered(batch_reset_function, 0)
+
+
+def test_batch_too_many_obstacles():
+    with pytest.raises(ValueError):
+        batch_reset_functions.dynamic_obstacles(2, Shape(4, 4), 4)
+
+
+@pytest.mark.parametrize('name,kwargs', CASES)
+def test_factory_valid(name: str, kwargs):
+    batch = factory(name, **kwargs)(3, rng=rnd.default_rng(0))
+    assert batch.grid.shape == (3, *kwargs['shape'].as_tuple)
+
+
+@pytest.mark.parametrize(
+    'name,kwargs,exception',
+    [
+        ('invalid', {}, ValueError),
+        ('empty', {}, ValueError),
+        ('rooms', {}, ValueError),
+        ('keydoor', {}, ValueError),
+    ],
+)
+def test_factory_invalid(name: str, kwargs, exception: Type[Exception]):
+    with pytest.raises(exception):
+        factory(name, **kwargs)
+
+
+def test_registry_names():
+    assert set(batch_reset_functions.batch_reset_function_registry) <= set(
+        reset_functions.reset_function_registry
+    )
@@ -0,0 +1,125 @@
+import pytest
+
+from gym_gridverse.envs.gridworld import GridWorld
+from gym_gridverse.envs.observation_cache import ObservationCache
+from gym_gridverse.envs.observation_functions import factory
+from gym_gridverse.envs.reset_functions import reset_function_registry
+from gym_gridverse.envs.yaml.factory import factory_env_from_data
+from gym_gridverse.geometry import Area, Position, Shape
+from gym_gridverse.grid_object import Wall
+from gym_gridverse.rng import make_rng
+
+AREA = Area((-6, 0), (-3, 3))
+
+
+@pytest.mark.parametrize(
+    'name', ['fully_transparent', 'partially_occluded', 'raytracing']
+)
+def test_observation_cache(name: str):
+    observation_function = factory(name, area=AREA)
+    observation_cache = ObservationCache(observation_function)
+    assert observation_cache.enabled
+
+    reset_function = reset_function_registry['rooms']
+    state = reset_function(shape=Shape(13, 13), layout=(3, 3), rng=make_rng(0))
+    positions = [
+        position
+        for position in state.grid.area.positions()
+        if not state.grid[position].blocks_movement
+    ]
+
+    # every pose is visited twice
+    for _ in range(2):
+        for position in positions:
+            state.agent.position = position
+            observation = observation_cache(state)
+            assert observation == observation_function(state)
+
+    info = observation_cache.cache_info()
+    assert info.misses == info.currsize <= len(positions)
+    assert info.hits == 2 * len(positions) - info.misses
+
+
+def test_observation_cache_copy():
+    observation_function = factory('raytracing', area=AREA)
+    observation_cache = ObservationCache(observation_function)
+
+    reset_function = reset_function_registry['empty']
+    state = reset_function(shape=Shape(7, 7))
+
+    observation = observation_cache(state)
+    observation.grid[Position(0, 0)] = Wall()
+    assert observation_cache(state) == observation_function(state)
+    assert observation_cache.cache_info().hits == 1
+
+
+def test_observation_cache_maxsize():
+    observation_function = factory('fully_transparent', area=AREA)
+    observation_cache = ObservationCache(observation_function, maxsize=2)
+
+    reset_function = reset_function_registry['empty']
+    state = reset_function(shape=Shape(7, 7))
+
+    for x in [1, 2, 3, 1]:
+        state.agent.position = Position(1, x)
+        observation_cache(state)
+
+    info = observation_cache.cache_info()
+    assert info.hits == 0
+    assert info.misses == 4
+    assert info.currsize == 2
+
+    observation_cache.cache_clear()
+    assert observation_cache.cache_info() == (0, 0, 2, 0)
+
+    with pytest.raises(ValueError):
+        ObservationCache(observation_function, maxsize=0)
+
+
+def test_observation_cache_stochastic():
+    observation_function = factory('stochastic_raytracing', area=AREA)
+    observation_cache = ObservationCache(observation_function)
+    assert not observation_cache.enabled
+
+    reset_function = reset_function_registry['empty']
+    state = reset_function(shape=Shape(7, 7))
+
+    observation_cache(state, rng=make_rng(0))
+    observation_cache(state, rng=make_rng(0))
+    assert observation_cache.cache_info() == (0, 0, 1024, 0)
+
+
+@pytest.mark.parametrize('observation_cache_size', [0, 16])
+def test_gridworld_observation_cache(observation_cache_size: int):
+    data = {
+        'state_space': {
+            'objects': ['Wall', 'Floor', 'Exit'],
+            'colors': ['NONE'],
+        },
+        'observation_space': {
+            'objects': ['Wall', 'Floor', 'Exit'],
+            'colors': ['NONE'],
+        },
+        'reset_function': {'name': 'empty', 'shape': [4, 4]},
+        'transition_functions': [{'name': 'move_agent'}],
+        'reward_functions': [{'name': 'living_reward'}],
+        'observation_function': {
+            'name': 'raytracing',
+            'area': [[-6, 0], [-3, 3]],
+        },
+        'terminating_function': {'name': 'reach_exit'},
+        'observation_cache_size': observation_cache_size,
+    }
+    env = factory_env_from_data(data)
+    assert isinstance(env, GridWorld)
+
+    env.reset()
+    expected = env.observation
+    env.reset()
+    assert env.observation == expected
+
+    if observation_cache_size == 0:
+        assert env.observation_cache is None
+    else:
+        assert env.observation_cache is not None
+        assert env.observation_cache.cache_info().hits >= 1
@@ -0,0 +1,207 @@
+import math
+from collections import defaultdict, deque
+
+import numpy as np
+import pkg_resources
+import pytest
+
+from gym_gridverse.action import Action
+from gym_gridverse.agent import Agent
+from gym_gridverse.envs.oracle import ShortestPathOracle
+from gym_gridverse.envs.reward_functions import dijkstra
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.geometry import Orientation, Position
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import Color, Door, Exit, Floor, Wall
+from gym_gridverse.rng import reset_gv_rng
+from gym_gridverse.state import State
+
+
+def make_env(name: str):
+    path = pkg_resources.resource_filename(
+        'gym_gridverse', f'registered_envs/{name}.yaml'
+    )
+    return factory_env_from_yaml(path)
+
+
+def make_state(
+    position: Position = Position(1, 1), orientation=Orientation.F
+) -> State:
+    """3x5 corridor with an exit at the east end"""
+    grid = Grid(
+        [
+            [Wall(), Wall(), Wall(), Wall(), Wall()],
+            [Wall(), Floor(), Floor(), Exit(), Wall()],
+            [Wall(), Wall(), Wall(), Wall(), Wall()],
+        ]
+    )
+    return State(grid, Agent(position, orientation))
+
+
+def brute_force_distances(env, state: State, actions):
+    """Backwards breadth-first search over the poses reached by the env"""
+
+    def pose(state: State):
+        return state.agent.position, state.agent.orientation
+
+    # forward search for the pose graph
+    predecessors = defaultdict(set)
+    goals = []
+    visited = {pose(state)}
+    queue = deque([state])
+    while queue:
+        state = queue.popleft()
+        if isinstance(state.grid[state.agent.position], Exit):
+            goals.append(pose(state))
+
+        for action in actions:
+            next_state, _, _ = env.functional_step(state, action)
+            predecessors[pose(next_state)].add(pose(state))
+            if pose(next_state) not in visited:
+                visited.add(pose(next_state))
+                queue.append(next_state)
+
+    # backward search for the distances
+    distances = {goal: 0 for goal in goals}
+    queue = deque(goals)
+    while queue:
+        p = queue.popleft()
+        for predecessor in predecessors[p]:
+            if predecessor not in distances:
+                distances[predecessor] = distances[p] + 1
+                queue.append(predecessor)
+
+    return {p: distances.get(p, math.inf) for p in visited}
+
+
+def test_oracle_corridor():
+    actions = list(Action)
+    oracle = ShortestPathOracle(actions)
+
+    # facing east: move right, then forward twice;  or move left twice
+    state = make_state(Position(1, 1), Orientation.F)
+    assert oracle.distance(state) == 2
+    assert oracle.optimal_actions(state) == [Action.MOVE_RIGHT]
+
+    state = make_state(Position(1, 1), Orientation.R)
+    assert oracle.distance(state) == 2
+    assert oracle.optimal_actions(state) == [Action.MOVE_FORWARD]
+
+    state = make_state(Position(1, 3), Orientation.R)
+    assert oracle.distance(state) == 0
+    assert oracle.optimal_actions(state) == []
+
+
+def test_oracle_turns_only():
+    actions = [Action.MOVE_FORWARD, Action.TURN_LEFT, Action.TURN_RIGHT]
+    oracle = ShortestPathOracle(actions)
+
+    state = make_state(Position(1, 1), Orientation.L)
+    assert oracle.distance(state) == 4
+    assert set(oracle.optimal_actions(state)) == {
+        Action.TURN_LEFT,
+        Action.TURN_RIGHT,
+    }
+
+
+def test_oracle_unreachable():
+    oracle = ShortestPathOracle(list(Action))
+    state = make_state()
+    state.grid[Position(1, 2)] = Door(Door.Status.LOCKED, Color.RED)
+
+    assert math.isinf(oracle.distance(state))
+    assert oracle.optimal_actions(state) == []
+
+
+def test_oracle_cache():
+    oracle = ShortestPathOracle(list(Action), maxsize=1)
+
+    oracle.distance(make_state(Position(1, 1)))
+    oracle.distance(make_state(Position(1, 2), Orientation.B))
+    assert oracle.cache_info().hits == 1
+    assert oracle.cache_info().misses == 1
+
+    # a different layout replaces the cached one
+    state = make_state()
+    state.grid[Position(1, 2)] = Wall()
+    oracle.distance(state)
+    assert oracle.cache_info().misses == 2
+    assert oracle.cache_info().currsize == 1
+
+    oracle.cache_clear()
+    assert oracle.cache_info() == (0, 0, 1, 0)
+
+    with pytest.raises(ValueError):
+        ShortestPathOracle(list(Action), maxsize=0)
+
+
+def test_oracle_grid_modified_in_place():
+    oracle = ShortestPathOracle(list(Action))
+    state = make_state()
+    assert oracle.distance(state) == 2.0
+
+    # grids are modified in place by the transition functions
+    state.grid[1, 2] = Wall()
+    assert oracle.distance(state) == math.inf
+
+    state.grid[1, 2] = Floor()
+    assert oracle.distance(state) == 2.0
+    assert oracle.cache_info().hits == 1
+
+
+@pytest.mark.parametrize('name', ['gv_four_rooms.9x9', 'gv_nine_rooms.13x13'])
+def test_oracle_matches_dijkstra(name: str):
+    """with all four relative moves, pose distances are position distances"""
+    reset_gv_rng(0)
+    state = make_env(name).functional_reset()
+    actions = [
+        Action.MOVE_FORWARD,
+        Action.MOVE_BACKWARD,
+        Action.MOVE_LEFT,
+        Action.MOVE_RIGHT,
+    ]
+    oracle = ShortestPathOracle(actions)
+
+    (exit_position,) = state.grid.find(Exit)
+    layout = tuple(
+        tuple(not grid_object.blocks_movement for grid_object in row)
+        for row in state.grid.objects
+    )
+    expected = dijkstra(layout, exit_position.yx)
+
+    # the agent can not stand on blocking cells, which dijkstra never reaches
+    free = np.array(layout)
+    distances, _ = oracle.tables(state)
+    for orientation in range(len(Orientation)):
+        np.testing.assert_array_equal(
+            distances[:, :, orientation][free], expected[free]
+        )
+
+
+@pytest.mark.parametrize(
+    'name', ['gv_empty.8x8', 'gv_four_rooms.9x9', 'gv_nine_rooms.13x13']
+)
+def test_oracle_matches_env(name: str):
+    reset_gv_rng(0)
+    env = make_env(name)
+    actions = env.action_space.actions
+    oracle = ShortestPathOracle(actions)
+
+    state = env.functional_reset()
+    expected = brute_force_distances(env, state, actions)
+    for (position, orientation), distance in expected.items():
+        assert (
+            oracle.distance(State(state.grid, Agent(position, orientation)))
+            == distance
+        )
+
+    # following any optimal action reaches the exit in distance steps
+    rng = np.random.default_rng(0)
+    distance = oracle.distance(state)
+    for _ in range(int(distance)):
+        optimal_actions = oracle.optimal_actions(state)
+        action = optimal_actions[rng.integers(len(optimal_actions))]
+        state, _, _ = env.functional_step(state, action)
+
+    assert isinstance(state.grid[state.agent.position], Exit)
+    assert oracle.cache_info().misses == 1
@@ -0,0 +1,94 @@
+from typing import List, Optional, Tuple
+
+import pkg_resources
+import pytest
+
+from gym_gridverse.envs.gridworld import GridWorld
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.outer_env import OuterEnv
+from gym_gridverse.representations.observation_representations import (
+    make_observation_representation,
+)
+from gym_gridverse.rng import RngStreams, reset_gv_rng
+from gym_gridverse.state import State
+
+
+def make_env() -> GridWorld:
+    path = pkg_resources.resource_filename(
+        'gym_gridverse', 'registered_envs/gv_dynamic_obstacles.7x7.yaml'
+    )
+    env = factory_env_from_yaml(path)
+    assert isinstance(env, GridWorld)
+    return env
+
+
+def rollout(env: GridWorld, num_steps: int) -> List[Tuple[State, float, bool]]:
+    action = env.action_space.actions[0]
+    trajectory = []
+    for _ in range(num_steps):
+        reward, done = env.step(action)
+        trajectory.append((env.state, reward, done))
+        if done:
+            env.reset()
+
+    return trajectory
+
+
+@pytest.mark.parametrize('seed', [None, 1337])
+@pytest.mark.parametrize('streams', [False, True])
+def test_gridworld_snapshot_restore(seed: Optional[int], streams: bool):
+    reset_gv_rng(0)
+    env = make_env()
+    if seed is not None:
+        env.set_seed(seed)
+    if streams:
+        env.set_rng_streams(RngStreams(seed))
+
+    env.reset()
+    rollout(env, 3)
+
+    snapshot = env.snapshot()
+    observation = env.observation
+    trajectory = rollout(env, 20)
+
+    # branches multiple times from the same snapshot
+    for _ in range(3):
+        env.restore(snapshot)
+        assert env.observation == observation
+        assert rollout(env, 20) == trajectory
+
+
+def test_gridworld_snapshot_shares_state():
+    env = make_env()
+    env.reset()
+
+    snapshot = env.snapshot()
+    state = env.state
+    assert snapshot.state is state
+
+    rollout(env, 5)
+    env.restore(snapshot)
+    assert env.state is state
+
+
+def test_outer_env_snapshot_restore():
+    inner_env = make_env()
+    inner_env.set_seed(0)
+    env = OuterEnv(
+        inner_env,
+        observation_representation=make_observation_representation(
+            'default', inner_env.observation_space
+        ),
+    )
+    env.reset()
+
+    snapshot = env.snapshot()
+    action = env.action_space.actions[0]
+    reward, done = env.step(action)
+    observation = env.observation
+
+    env.restore(snapshot)
+    assert env.step(action) == (reward, done)
+    assert env.observation.keys() == observation.keys()
+    for key in observation:
+        assert (env.observation[key] == observation[key]).all()
@@ -0,0 +1,218 @@
+import inspect
+from typing import Optional
+from unittest.mock import MagicMock
+
+import numpy.random as rnd
+import pytest
+
+from gym_gridverse.action import Action
+from gym_gridverse.agent import Agent
+from gym_gridverse.envs.reward_functions import (
+    factory as reward_factory,
+    reach_exit_memory,
+    reduce_sum,
+    reward_function_registry,
+)
+from gym_gridverse.envs.step_context import (
+    ContextFunctions,
+    StateContext,
+    StepContext,
+    accepts_context,
+)
+from gym_gridverse.envs.terminating_functions import (
+    factory as terminating_factory,
+    reduce_any,
+    terminating_function_registry,
+)
+from gym_gridverse.geometry import Orientation, Position
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import (
+    Beacon,
+    Color,
+    Exit,
+    Floor,
+    GridObject,
+    Wall,
+)
+from gym_gridverse.state import State
+
+
+def make_state() -> State:
+    grid = Grid.from_shape((4, 5))
+    grid[0, 3] = Beacon(Color.RED)
+    grid[1, 1] = Wall()
+    grid[2, 4] = Exit(Color.BLUE)
+    grid[3, 0] = Beacon(Color.BLUE)
+    return State(grid, Agent(Position(2, 1), Orientation.F))
+
+
+def test_state_context():
+    state = make_state()
+    state_context = StateContext(state)
+
+    assert isinstance(state_context.object_under_agent, Floor)
+    assert state_context.positions(Beacon) == [Position(0, 3), Position(3, 0)]
+    assert state_context.positions(Exit) == [Position(2, 4)]
+    assert state_context.positions(GridObject) == list(
+        state.grid.area.positions()
+    )
+    assert state_context.beacon_color is Color.RED
+
+    state.grid[0, 3] = Floor()
+    state.grid[3, 0] = Floor()
+    assert StateContext(state).beacon_color is None
+
+
+@pytest.mark.parametrize(
+    'action,expected',
+    [
+        (Action.MOVE_FORWARD, Position(1, 1)),
+        (Action.MOVE_RIGHT, Position(2, 2)),
+        (Action.TURN_LEFT, Position(2, 1)),
+    ],
+)
+def test_step_context_intended_next_position(
+    action: Action, expected: Position
+):
+    state = make_state()
+    context = StepContext(state, action, state)
+    assert context.intended_next_position == expected
+
+
+def test_step_context_memoized():
+    state = make_state()
+    context = StepContext(state, Action.MOVE_FORWARD, state)
+
+    positions_by_type = context.next_state_context.positions_by_type
+    assert context.next_state_context.positions_by_type is positions_by_type
+
+
+def test_reach_exit_memory_without_beacon():
+    state = make_state()
+    state.grid[0, 3] = Floor()
+    state.grid[3, 0] = Floor()
+    context = StepContext(state, Action.MOVE_FORWARD, state)
+
+    # the missing Beacon is not silently treated as a bad exit
+    with pytest.raises(StopIteration):
+        reach_exit_memory(state, Action.MOVE_FORWARD, state, context=context)
+
+
+def test_accepts_context():
+    def function_with_context(state, action, next_state, *, context=None):
+        ...
+
+    def function_without_context(state, action, next_state):
+        ...
+
+    assert accepts_context(function_with_context)
+    assert not accepts_context(function_without_context)
+    assert accepts_context(reward_function_registry['reduce_sum'])
+    assert not accepts_context(reward_function_registry['living_reward'])
+
+
+def test_reduce_factory_checks_context_once(monkeypatch):
+    reward_function = reward_factory(
+        'reduce_sum',
+        reward_functions=[
+            reward_factory('living_reward'),
+            reward_factory('reach_exit'),
+        ],
+    )
+    terminating_function = terminating_factory(
+        'reduce_any',
+        terminating_functions=[terminating_factory('reach_exit')],
+    )
+    reward_functions = reward_function.keywords['reward_functions']
+    assert isinstance(reward_functions, ContextFunctions)
+    assert reward_functions.accepts == (False, True)
+
+    # signatures are not inspected again when the functions are called
+    def signature(*args, **kwargs):
+        raise AssertionError('signature inspected')
+
+    monkeypatch.setattr(inspect, 'signature', signature)
+    state = make_state()
+    assert reward_function(state, Action.MOVE_FORWARD, state) == -1.0
+    assert not terminating_function(state, Action.MOVE_FORWARD, state)
+
+
+def test_reduce_sum_shared_context():
+    contexts = []
+
+    def reward_with_context(
+        state: State,
+        action: Action,
+        next_state: State,
+        *,
+        rng: Optional[rnd.Generator] = None,
+        context: Optional[StepContext] = None,
+    ) -> float:
+        contexts.append(context)
+        return 1.0
+
+    reward_without_context = MagicMock(return_value=2.0)
+
+    state = make_state()
+    reward = reduce_sum(
+        state,
+        Action.MOVE_FORWARD,
+        state,
+        reward_functions=[
+            reward_with_context,
+            reward_with_context,
+            reward_without_context,
+        ],
+    )
+
+    assert reward == 4.0
+    assert len(contexts) == 2
+    assert contexts[0] is contexts[1]
+    assert isinstance(contexts[0], StepContext)
+    assert 'context' not in reward_without_context.call_args.kwargs
+
+
+def test_reduce_any_shared_context():
+    contexts = []
+
+    def terminating_with_context(
+        state: State,
+        action: Action,
+        next_state: State,
+        *,
+        rng: Optional[rnd.Generator] = None,
+        context: Optional[StepContext] = None,
+    ) -> bool:
+        contexts.append(context)
+        return False
+
+    state = make_state()
+    context = StepContext(state, Action.MOVE_FORWARD, state)
+    terminal = reduce_any(
+        state,
+        Action.MOVE_FORWARD,
+        state,
+        terminating_functions=[terminating_with_context],
+        context=context,
+    )
+
+    assert not terminal
+    assert contexts == [context]
+
+
+@pytest.mark.parametrize(
+    'registry', [reward_function_registry, terminating_function_registry]
+)
+def test_registry_context_is_protocol_parameter(registry):
+    signature = inspect.signature(registry['reach_exit'])
+    protocol_names = [
+        parameter.name
+        for parameter in registry.get_protocol_parameters(signature)
+    ]
+    nonprotocol_names = [
+        parameter.name
+        for parameter in registry.get_nonprotocol_parameters(signature)
+    ]
+
+    assert 'context' in protocol_names
+    assert 'context' not in nonprotocol_names
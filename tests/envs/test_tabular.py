@@ -0,0 +1,119 @@
+import itertools as itt
+
+import numpy as np
+import pkg_resources
+import pytest
+
+from gym_gridverse.envs.tabular import (
+    enumerate_outcomes,
+    make_tabular_mdp,
+    state_key,
+)
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.rng import choice, choices, shuffle
+
+
+def make_env(name: str):
+    path = pkg_resources.resource_filename(
+        'gym_gridverse', f'registered_envs/{name}.yaml'
+    )
+    return factory_env_from_yaml(path)
+
+
+def test_enumerate_outcomes():
+    # rng is an EnumeratingRng, used in place of a numpy Generator
+    def function(rng):
+        x = choice(rng, 'ab')
+        y = rng.integers(1, 3, endpoint=True) if x == 'a' else 0
+        return x, y
+
+    outcomes = dict(enumerate_outcomes(function))
+    assert outcomes == pytest.approx(
+        {('a', 1): 1 / 6, ('a', 2): 1 / 6, ('a', 3): 1 / 6, ('b', 0): 1 / 2}
+    )
+
+
+def test_enumerate_outcomes_multiple():
+    outcomes = dict(
+        enumerate_outcomes(lambda rng: tuple(shuffle(rng, [1, 2, 3])))
+    )
+    assert set(outcomes) == set(itt.permutations([1, 2, 3]))
+    assert sum(outcomes.values()) == pytest.approx(1.0)
+
+    outcomes = dict(
+        enumerate_outcomes(
+            lambda rng: tuple(choices(rng, 'abc', size=2, replace=False))
+        )
+    )
+    assert set(outcomes) == set(itt.permutations('abc', 2))
+    assert sum(outcomes.values()) == pytest.approx(1.0)
+
+
+def test_enumerate_outcomes_errors():
+    with pytest.raises(ValueError):
+        list(enumerate_outcomes(lambda rng: rng.random()))
+
+    with pytest.raises(RuntimeError):
+        list(enumerate_outcomes(lambda rng: rng.integers(10), max_outcomes=5))
+
+
+@pytest.mark.parametrize(
+    'name', ['gv_empty.4x4', 'gv_keydoor.5x5', 'gv_dynamic_obstacles.5x5']
+)
+def test_make_tabular_mdp(name: str):
+    env = make_env(name)
+    mdp = make_tabular_mdp(env)
+
+    assert len(mdp.P) == len(mdp.R) == len(mdp.D) == len(mdp.actions)
+    assert mdp.initial.sum() == pytest.approx(1.0)
+    assert len(set(map(state_key, mdp.states))) == mdp.num_states
+
+    for P in mdp.P:
+        row_sums = np.bincount(P.rows, weights=P.data, minlength=mdp.num_states)
+        np.testing.assert_allclose(row_sums, 1.0)
+
+    # each transition matches the environment
+    rng = np.random.default_rng(0)
+    for s in rng.choice(mdp.num_states, size=10):
+        for a, action in enumerate(mdp.actions):
+            P, R, D = mdp.P[a], mdp.R[a], mdp.D[a]
+            (entries,) = np.nonzero(P.rows == s)
+            next_state, reward, terminal = env.functional_step(
+                mdp.states[s], action
+            )
+            next_key = state_key(next_state)
+            assert any(
+                state_key(mdp.states[P.cols[i]]) == next_key
+                and R.data[i] == reward
+                and D.data[i] == terminal
+                for i in entries
+            )
+
+
+def test_make_tabular_mdp_empty():
+    mdp = make_tabular_mdp(make_env('gv_empty.4x4'))
+
+    # 2x2 room with an exit, in every orientation
+    assert mdp.num_states == 4 * 4
+
+    # the agent starts on any cell other than the exit
+    (initial,) = np.nonzero(mdp.initial)
+    assert len(initial) == 3 * 4
+    np.testing.assert_allclose(mdp.initial[initial], 1 / 12)
+    assert mdp.expected_rewards().shape == (len(mdp.actions), mdp.num_states)
+
+
+def test_make_tabular_mdp_workers():
+    env = make_env('gv_dynamic_obstacles.5x5')
+    mdp = make_tabular_mdp(env)
+    mdp_workers = make_tabular_mdp(env, num_workers=2, chunk_size=16)
+
+    assert mdp_workers.states == mdp.states
+    np.testing.assert_array_equal(mdp_workers.initial, mdp.initial)
+    for P, P_workers in zip(mdp.P, mdp_workers.P):
+        np.testing.assert_array_equal(P_workers.toarray(), P.toarray())
+
+
+def test_make_tabular_mdp_max_states():
+    with pytest.raises(RuntimeError):
+        make_tabular_mdp(make_env('gv_keydoor.5x5'), max_states=10)
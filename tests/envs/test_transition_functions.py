@@ -12,10 +12,15 @@ from gym_gridverse.envs.reset_functions import dynamic_obstacles
 from gym_gridverse.envs.transition_functions import (
     actuate_box,
     actuate_door,
+    compile_transition_table,
+    dispatch,
     factory,
+    get_responds_to,
     move_agent,
     move_obstacles,
+    move_obstacles_simultaneous,
     pickndrop,
+    responds_to,
     teleport,
     transition_with_copy,
     turn_agent,
@@ -34,6 +39,7 @@ from gym_gridverse.grid_object import (
     Telepod,
     Wall,
 )
+from gym_gridverse.rng import make_rng
 from gym_gridverse.state import State
 
 
@@ -362,6 +368,69 @@ def test_move_obstacles(
     assert state.grid == expected_state.grid
 
 
+@pytest.mark.parametrize(
+    'objects,expected_objects',
+    [
+        (
+            [[Floor(), MovingObstacle(), MovingObstacle()]],
+            [[MovingObstacle(), Floor(), MovingObstacle()]],
+        ),
+        (
+            [[MovingObstacle(), Floor(), MovingObstacle()]],
+            [[Floor(), MovingObstacle(), MovingObstacle()]],
+        ),
+        (
+            [[MovingObstacle(), MovingObstacle(), Floor()]],
+            [[MovingObstacle(), Floor(), MovingObstacle()]],
+        ),
+        (
+            [[MovingObstacle(), Wall()], [Wall(), MovingObstacle()]],
+            [[MovingObstacle(), Wall()], [Wall(), MovingObstacle()]],
+        ),
+    ],
+)
+def test_move_obstacles_simultaneous(
+    objects: List[List[GridObject]],
+    expected_objects: List[List[GridObject]],
+):
+    state = State(Grid(objects), MagicMock())
+    expected_state = State(Grid(expected_objects), MagicMock())
+
+    action = MagicMock()
+    move_obstacles_simultaneous(state, action)
+    assert state.grid == expected_state.grid
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_move_obstacles_simultaneous_stochastic(seed: int):
+    rng = make_rng(seed)
+    state = dynamic_obstacles(Shape(9, 9), num_obstacles=10, rng=rng)
+    next_state = copy.deepcopy(state)
+
+    rng_mock = MagicMock(wraps=rng)
+    move_obstacles_simultaneous(next_state, Action.PICK_N_DROP, rng=rng_mock)
+    assert rng_mock.random.call_count == 1
+
+    def obstacle_positions(state):
+        return {
+            position
+            for position in state.grid.area.positions()
+            if isinstance(state.grid[position], MovingObstacle)
+        }
+
+    positions = obstacle_positions(state)
+    next_positions = obstacle_positions(next_state)
+    assert len(next_positions) == len(positions)
+
+    # every obstacle either stays in place or moves onto a previous floor
+    for next_position in next_positions - positions:
+        assert isinstance(state.grid[next_position], Floor)
+        assert any(
+            Position.manhattan_distance(next_position, position) == 1
+            for position in positions - next_positions
+        )
+
+
 @pytest.mark.parametrize(
     'door_state,door_color,key_color,action,expected_state',
     [
@@ -546,8 +615,10 @@ def test_teleport(
     'name,kwargs',
     [
         ('chain', {'transition_functions': []}),
+        ('dispatch', {'transition_table': {}}),
         ('pickndrop', {}),
         ('move_obstacles', {}),
+        ('move_obstacles_simultaneous', {}),
         ('actuate_door', {}),
         ('actuate_box', {}),
         ('teleport', {}),
@@ -561,9 +632,68 @@ def test_factory_valid(name: str, kwargs):
     'name,kwargs',
     [
         ('chain', {}),
+        ('dispatch', {}),
         ('invalid', {}),
     ],
 )
 def test_factory_invalid(name: str, kwargs):
     with pytest.raises(ValueError):
         factory(name, **kwargs)
+
+
+def test_responds_to():
+    @responds_to(Action.ACTUATE, Action.PICK_N_DROP)
+    def transition_function(state, action, *, rng=None):
+        pass
+
+    assert get_responds_to(transition_function) == {
+        Action.ACTUATE,
+        Action.PICK_N_DROP,
+    }
+    assert get_responds_to(factory('actuate_door')) == {Action.ACTUATE}
+    assert get_responds_to(factory('move_obstacles')) is None
+
+
+def test_compile_transition_table():
+    transition_functions = [
+        factory('move_agent'),
+        factory('move_obstacles'),
+        factory('turn_agent'),
+        factory('actuate_door'),
+        factory('actuate_box'),
+    ]
+    (
+        move_agent_,
+        move_obstacles_,
+        turn_agent_,
+        actuate_door_,
+        actuate_box_,
+    ) = transition_functions
+    transition_table = compile_transition_table(transition_functions)
+
+    assert set(transition_table) == set(Action)
+    assert transition_table[Action.MOVE_LEFT] == (move_agent_, move_obstacles_)
+    assert transition_table[Action.TURN_RIGHT] == (move_obstacles_, turn_agent_)
+    assert transition_table[Action.ACTUATE] == (
+        move_obstacles_,
+        actuate_door_,
+        actuate_box_,
+    )
+    assert transition_table[Action.PICK_N_DROP] == (move_obstacles_,)
+
+
+def test_dispatch():
+    declared = MagicMock()
+    declared.responds_to = frozenset([Action.ACTUATE])
+    undeclared = MagicMock(spec=lambda state, action, *, rng=None: None)
+
+    transition_table = compile_transition_table([declared, undeclared])
+    state = MagicMock()
+
+    dispatch(state, Action.MOVE_FORWARD, transition_table=transition_table)
+    declared.assert_not_called()
+    undeclared.assert_called_once_with(state, Action.MOVE_FORWARD, rng=None)
+
+    dispatch(state, Action.ACTUATE, transition_table=transition_table)
+    declared.assert_called_once_with(state, Action.ACTUATE, rng=None)
+    assert undeclared.call_count == 2
@@ -0,0 +1,142 @@
+import pytest
+from schema import SchemaError
+
+from gym_gridverse.envs.gridworld import GridWorld
+from gym_gridverse.envs.observation_cache import ObservationCache
+from gym_gridverse.envs.observation_functions import factory
+from gym_gridverse.envs.reset_functions import reset_function_registry
+from gym_gridverse.envs.visibility_table import VisibilityTable
+from gym_gridverse.envs.yaml.factory import factory_env_from_data
+from gym_gridverse.geometry import Area, Orientation, Position, Shape
+from gym_gridverse.grid_object import Door
+from gym_gridverse.rng import make_rng
+
+AREA = Area((-6, 0), (-3, 3))
+
+
+@pytest.mark.parametrize(
+    'name', ['fully_transparent', 'partially_occluded', 'raytracing']
+)
+@pytest.mark.parametrize('precompute', [False, True])
+def test_visibility_table(name: str, precompute: bool):
+    observation_function = factory(name, area=AREA)
+    visibility_table = VisibilityTable(
+        observation_function, precompute=precompute
+    )
+    assert visibility_table.enabled
+
+    reset_function = reset_function_registry['rooms']
+    state = reset_function(shape=Shape(13, 13), layout=(3, 3), rng=make_rng(0))
+    positions = [
+        position
+        for position in state.grid.area.positions()
+        if not state.grid[position].blocks_movement
+    ]
+
+    visibility_table.reset(state)
+    if precompute:
+        assert len(visibility_table) == 4 * len(positions)
+        assert visibility_table.hits == 0
+
+    for position in positions:
+        for orientation in Orientation:
+            state.agent.position = position
+            state.agent.orientation = orientation
+            observation = visibility_table(state)
+            assert observation == observation_function(state)
+
+    assert len(visibility_table) == 4 * len(positions)
+    assert visibility_table.misses == 4 * len(positions)
+
+
+def test_visibility_table_dynamic_blocker():
+    observation_function = factory('raytracing', area=AREA)
+    visibility_table = VisibilityTable(observation_function)
+
+    reset_function = reset_function_registry['keydoor']
+    state = reset_function(shape=Shape(7, 7), rng=make_rng(0))
+    (door_position,) = (
+        position
+        for position in state.grid.area.positions()
+        if isinstance(state.grid[position], Door)
+    )
+    state.agent.position = Position(door_position.y, door_position.x - 1)
+    state.agent.orientation = Orientation.R
+
+    door = state.grid[door_position]
+    observation_closed = observation_function(state)
+    assert visibility_table(state) == observation_closed
+
+    door.state = Door.Status.OPEN
+    observation_open = observation_function(state)
+    assert observation_open != observation_closed
+    assert visibility_table(state) == observation_open
+    assert visibility_table.misses == 2
+
+    door.state = Door.Status.LOCKED
+    assert visibility_table(state) == observation_closed
+    assert visibility_table.hits == 1
+    assert len(visibility_table) == 2
+
+
+def test_visibility_table_stochastic():
+    observation_function = factory('stochastic_raytracing', area=AREA)
+    visibility_table = VisibilityTable(observation_function, precompute=True)
+    assert not visibility_table.enabled
+
+    reset_function = reset_function_registry['empty']
+    state = reset_function(shape=Shape(7, 7))
+
+    visibility_table.reset(state)
+    visibility_table(state, rng=make_rng(0))
+    assert len(visibility_table) == 0
+
+
+def test_visibility_table_observation_cache():
+    observation_function = factory('raytracing', area=AREA)
+    visibility_table = VisibilityTable(observation_function)
+    observation_cache = ObservationCache(visibility_table)
+    assert observation_cache.enabled
+
+    reset_function = reset_function_registry['empty']
+    state = reset_function(shape=Shape(7, 7))
+
+    assert observation_cache(state) == observation_function(state)
+    assert observation_cache(state) == observation_function(state)
+    assert observation_cache.cache_info().hits == 1
+    assert visibility_table.misses == 1
+
+
+@pytest.mark.parametrize('visibility_table', ['lazy', 'precompute'])
+def test_gridworld_visibility_table(visibility_table: str):
+    data = {
+        'state_space': {
+            'objects': ['Wall', 'Floor', 'Exit'],
+            'colors': ['NONE'],
+        },
+        'observation_space': {
+            'objects': ['Wall', 'Floor', 'Exit'],
+            'colors': ['NONE'],
+        },
+        'reset_function': {'name': 'empty', 'shape': [4, 4]},
+        'transition_functions': [{'name': 'move_agent'}],
+        'reward_functions': [{'name': 'living_reward'}],
+        'observation_function': {
+            'name': 'raytracing',
+            'area': [[-6, 0], [-3, 3]],
+        },
+        'terminating_function': {'name': 'reach_exit'},
+        'visibility_table': visibility_table,
+    }
+    env = factory_env_from_data(data)
+    assert isinstance(env, GridWorld)
+    assert env.visibility_table is not None
+    assert env.visibility_table.precompute == (visibility_table == 'precompute')
+
+    env.reset()
+    env.observation
+    assert len(env.visibility_table) > 0
+
+    data['visibility_table'] = 'invalid'
+    with pytest.raises(SchemaError):
+        factory_env_from_data(data)
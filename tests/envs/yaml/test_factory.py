@@ -1,3 +1,4 @@
+import copy
 import glob
 import itertools as itt
 
@@ -5,9 +6,11 @@ import pytest
 from schema import SchemaError
 
 import gym_gridverse.envs.yaml.factory as yaml_factory
+import yaml
 from gym_gridverse.action import Action
 from gym_gridverse.envs import InnerEnv
 from gym_gridverse.geometry import Shape
+from gym_gridverse.grid import SparseGrid
 from gym_gridverse.spaces import ActionSpace
 
 
@@ -114,3 +117,35 @@ def test_factory_rnv_from_yaml(path: str):
         _, done = env.step(action)
         if done:
             env.reset()
+
+
+def test_factory_env_sparse_matches_dense():
+    with open('yaml/gv_dynamic_obstacles_sparse.128x128.yaml') as f:
+        data = yaml.safe_load(f)
+    data['reset_function']['shape'] = [16, 16]
+    data['reset_function']['num_obstacles'] = 8
+    sparse_env = yaml_factory.factory_env_from_data(copy.deepcopy(data))
+    data['reset_function']['sparse'] = False
+    dense_env = yaml_factory.factory_env_from_data(data)
+
+    sparse_env.set_seed(0)
+    dense_env.set_seed(0)
+    sparse_env.reset()
+    dense_env.reset()
+    assert isinstance(sparse_env.state.grid, SparseGrid)
+    assert not isinstance(dense_env.state.grid, SparseGrid)
+
+    # the sparse grid goes through the same steps as the dense one
+    actions = [Action.TURN_LEFT, Action.MOVE_RIGHT, Action.MOVE_FORWARD] * 20
+    for action in actions:
+        sparse_outcome = sparse_env.step(action)
+        dense_outcome = dense_env.step(action)
+
+        assert sparse_outcome == dense_outcome
+        assert isinstance(sparse_env.state.grid, SparseGrid)
+        assert sparse_env.state == dense_env.state
+        assert sparse_env.observation == dense_env.observation
+
+        if dense_outcome[1]:
+            sparse_env.reset()
+            dense_env.reset()
@@ -1,10 +1,27 @@
-from typing import Optional
+import pickle
+from functools import partial
+from typing import Dict, List, Optional
 
 import gymnasium as gym
 import numpy as np
+import pygame
 import pytest
 
-from gym_gridverse.gym import GymStateWrapper
+from gym_gridverse.action import Action
+from gym_gridverse.debugging import gv_debug, gv_debug_context
+from gym_gridverse.envs.gridworld import GridWorld
+from gym_gridverse.envs.observation_functions import (
+    factory as observation_function_factory,
+)
+from gym_gridverse.geometry import Area
+from gym_gridverse.gym import (
+    GymEnvironment,
+    GymHistoryWrapper,
+    GymStateWrapper,
+    LazyRepresentation,
+    ThreadVectorEnv,
+    render_batch,
+)
 
 
 @pytest.mark.parametrize(
@@ -110,3 +127,350 @@ def test_gym_state_wrapper(env_id: str, representation: str):
 
         if terminated or truncated:
             env.reset()
+
+
+def test_gym_state_wrapper_lazy_observation():
+    env = gym.make('GV-Keydoor-5x5-v0')
+    env.set_state_representation('default')
+    env = GymStateWrapper(env)
+    inner_env = env.unwrapped.outer_env.inner_env
+
+    _, info = env.reset(seed=0)
+    for action in [Action.TURN_LEFT, Action.MOVE_FORWARD, Action.PICK_N_DROP]:
+        _, _, _, _, info = env.step(action.value)
+
+        # the observation is only computed upon request
+        assert isinstance(info['observation'], LazyRepresentation)
+        assert not info['observation'].converted
+        assert inner_env._observation is None
+
+        np.testing.assert_equal(
+            dict(info['observation']), env.unwrapped.observation
+        )
+        assert info['observation'].converted
+
+
+def test_gym_state_wrapper_does_not_change_wrapped_env():
+    gym_env = gym.make('GV-Keydoor-5x5-v0').unwrapped
+    assert isinstance(gym_env, GymEnvironment)
+    gym_env.set_state_representation('default')
+    observation_space = gym_env.observation_space
+    env = GymStateWrapper(gym_env)
+
+    state, _ = env.reset(seed=0)
+    np.testing.assert_equal(state, gym_env.state)
+
+    # the wrapped environment itself still returns observations
+    assert gym_env.output == 'observation'
+    assert gym_env.info_outputs == ()
+    assert gym_env.observation_space is observation_space
+    observation, info = gym_env.reset(seed=0)
+    np.testing.assert_equal(observation, gym_env.observation)
+    assert info == {}
+
+
+def test_gym_lazy_representation_pickle():
+    env = gym.make('GV-Keydoor-5x5-v0')
+    env.set_state_representation('default')
+    env = GymStateWrapper(env)
+
+    _, info = env.reset(seed=0)
+    expected = dict(LazyRepresentation(info['observation']._convert))
+
+    # only the converted arrays are pickled, not the environment
+    data = pickle.dumps(info)
+    assert len(data) < len(pickle.dumps({'observation': expected})) + 200
+
+    unpickled = pickle.loads(data)
+    assert isinstance(unpickled['observation'], LazyRepresentation)
+    assert unpickled['observation'].converted
+    np.testing.assert_equal(dict(unpickled['observation']), expected)
+
+
+def test_gym_set_outputs():
+    env = gym.make('GV-DynamicObstacles-7x7-v0').unwrapped
+    env.set_state_representation('default')
+    env.set_outputs('observation', info=['state'])
+
+    observation, info = env.reset(seed=0)
+    np.testing.assert_equal(observation, env.observation)
+
+    states, infos = [], []
+    for _ in range(5):
+        _, _, terminated, _, info = env.step(env.action_space.sample())
+        states.append(env.state)
+        infos.append(info)
+
+        if terminated:
+            break
+
+    # conversions are bound to the state of their step
+    for state, info in zip(states, infos):
+        assert not info['state'].converted
+        np.testing.assert_equal(dict(info['state']), state)
+
+    env.set_outputs('state')
+    np.testing.assert_equal(env.observation_space, env.state_space)
+    state, info = env.reset(seed=0)
+    np.testing.assert_equal(state, env.state)
+    assert info == {}
+
+
+def test_gym_set_outputs_deferred_observation_rng():
+    """deferred observations do not draw from the environment generator"""
+
+    def run(convert_observations: bool) -> list:
+        env = gym.make('GV-DynamicObstacles-7x7-v0').unwrapped
+        assert isinstance(env, GymEnvironment)
+        env.set_state_representation('default')
+        env.set_outputs('state', info=['observation'])
+        inner_env = env.outer_env.inner_env
+        assert isinstance(inner_env, GridWorld)
+        inner_env._observation_function = observation_function_factory(
+            'stochastic_raytracing', area=Area((-6, 0), (-3, 3))
+        )
+
+        states = []
+        state, info = env.reset(seed=0)
+        for _ in range(10):
+            states.append(state)
+            # turning in place never terminates the episode
+            state, _, _, _, next_info = env.step(Action.TURN_LEFT.value)
+
+            if convert_observations:
+                dict(info['observation'])
+            info = next_info
+
+        return states
+
+    np.testing.assert_equal(run(False), run(True))
+
+
+def test_gym_set_outputs_invalid():
+    env = gym.make('GV-Empty-4x4-v0').unwrapped
+
+    with pytest.raises(ValueError):
+        env.set_outputs('invalid')
+
+    # no state representation
+    with pytest.raises(ValueError):
+        env.set_outputs('state')
+    with pytest.raises(ValueError):
+        env.set_outputs(info=['state'])
+    with pytest.raises(ValueError):
+        GymStateWrapper(env)
+
+
+@pytest.mark.parametrize(
+    'render_mode', ['rgb_array_state', 'rgb_array_observation']
+)
+def test_gym_render_batch(render_mode: str):
+    envs: List[GymEnvironment] = []
+    for i in range(3):
+        env = gym.make('GV-Keydoor-7x7-v0', render_mode=render_mode).unwrapped
+        assert isinstance(env, GymEnvironment)
+        env.reset(seed=i)
+        envs.append(env)
+
+    frames = render_batch(envs, render_mode)
+
+    assert frames.shape[0] == 3
+    for frame, env in zip(frames, envs):
+        np.testing.assert_array_equal(frame, env.render())
+
+
+def test_gym_render_human_dirty_rects(monkeypatch):
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+
+    updates = []
+    monkeypatch.setattr(pygame.display, 'update', updates.append)
+
+    env = gym.make('GV-Empty-4x4-v0', render_mode='human_state').unwrapped
+    monkeypatch.setitem(env.metadata, 'render_fps', 1000)
+    env.reset(seed=0)
+
+    # the first frame repaints every cell
+    assert len(updates[-1]) == 4 * 4
+
+    # turning only changes the tile of the cell occupied by the agent
+    action_space = env.outer_env.action_space
+    env.step(action_space.action_to_int(Action.TURN_LEFT))
+    assert len(updates[-1]) == 1
+
+    env.close()
+
+
+@pytest.mark.parametrize('capacity', [None, 3, 5])
+def test_gym_history_wrapper(capacity: Optional[int]):
+    num_frames = 3
+    env = GymHistoryWrapper(
+        gym.make('GV-Memory-5x5-v0'), num_frames, capacity=capacity
+    )
+    frames = GymHistoryWrapper(gym.make('GV-Memory-5x5-v0'), 1)
+
+    assert isinstance(env.observation_space, gym.spaces.Dict)
+    assert isinstance(env.unwrapped.observation_space, gym.spaces.Dict)
+    for key, space in env.observation_space.spaces.items():
+        inner_space = env.unwrapped.observation_space[key]
+        assert inner_space.shape is not None
+        assert space.shape == (num_frames, *inner_space.shape)
+        assert space.dtype == inner_space.dtype
+
+    history, _ = env.reset(seed=0)
+    frame, _ = frames.reset(seed=0)
+    expected = [frame] * num_frames
+    for _ in range(20):
+        assert env.observation_space.contains(history)
+        for key in history:
+            np.testing.assert_array_equal(
+                history[key], np.concatenate([f[key] for f in expected])
+            )
+
+        action = env.action_space.sample()
+        history, _, terminated, truncated, _ = env.step(action)
+        frame, *_ = frames.step(action)
+        expected = expected[1:] + [{k: v.copy() for k, v in frame.items()}]
+
+        if terminated or truncated:
+            history, _ = env.reset()
+            frame, _ = frames.reset()
+            expected = [frame] * num_frames
+
+
+def test_gym_history_wrapper_views():
+    env = GymHistoryWrapper(gym.make('GV-Memory-5x5-v0'), 4)
+    history, _ = env.reset(seed=0)
+    assert all(not array.flags.owndata for array in history.values())
+
+    with pytest.raises(ValueError):
+        GymHistoryWrapper(gym.make('GV-Memory-5x5-v0'), 0)
+
+    with pytest.raises(ValueError):
+        GymHistoryWrapper(gym.make('GV-Memory-5x5-v0'), 4, capacity=3)
+
+
+@pytest.mark.parametrize(
+    'env_id', ['GV-DynamicObstacles-5x5-v0', 'GV-Keydoor-5x5-v0']
+)
+def test_thread_vector_env(env_id: str):
+    make_env = partial(gym.make, env_id)
+    sync_envs = gym.vector.SyncVectorEnv([make_env] * 3)
+    thread_envs = ThreadVectorEnv([make_env] * 3, max_workers=2)
+
+    sync_observations, _ = sync_envs.reset(seed=0)
+    thread_observations, _ = thread_envs.reset(seed=0)
+    for key in sync_observations:
+        np.testing.assert_array_equal(
+            thread_observations[key], sync_observations[key]
+        )
+
+    sync_envs.action_space.seed(0)
+    for _ in range(50):
+        actions = sync_envs.action_space.sample()
+        sync_observations, *sync_results, sync_infos = sync_envs.step(actions)
+        thread_observations, *thread_results, thread_infos = thread_envs.step(
+            actions
+        )
+
+        for key in sync_observations:
+            np.testing.assert_array_equal(
+                thread_observations[key], sync_observations[key]
+            )
+        for thread_result, sync_result in zip(thread_results, sync_results):
+            np.testing.assert_array_equal(thread_result, sync_result)
+        assert thread_infos.keys() == sync_infos.keys()
+
+    sync_envs.close()
+    thread_envs.close()
+
+
+def test_thread_vector_env_contexts():
+    with gv_debug_context(False):
+        envs = ThreadVectorEnv([partial(gym.make, 'GV-Empty-4x4-v0')] * 2)
+
+    # each environment context inherits the debugging flag of its creation
+    assert envs._map(lambda i: gv_debug()) == [False, False]
+    assert gv_debug()
+
+    envs.close()
+
+
+class FrameRecorder(gym.Wrapper):
+    """Records copies of the observations of the current and last episodes"""
+
+    def __init__(self, env: gym.Env):
+        super().__init__(env)
+        self.frames: List[Dict[str, np.ndarray]] = []
+        self.last_episode_frames: List[Dict[str, np.ndarray]] = []
+
+    def reset(self, **kwargs):
+        observation, info = self.env.reset(**kwargs)
+        self.last_episode_frames = self.frames
+        self.frames = [{k: v.copy() for k, v in observation.items()}]
+        return observation, info
+
+    def step(self, action):
+        observation, *rest = self.env.step(action)
+        self.frames.append({k: v.copy() for k, v in observation.items()})
+        return observation, *rest
+
+
+# the final history survives the reset if capacity >= 3 * num_frames
+@pytest.mark.parametrize('capacity', [9, 10, 64])
+def test_gym_history_wrapper_final_observation(capacity: int):
+    num_frames = 3
+    recorders = [
+        FrameRecorder(gym.make('GV-DynamicObstacles-5x5-v0')) for _ in range(2)
+    ]
+    envs = gym.vector.SyncVectorEnv(
+        [
+            partial(GymHistoryWrapper, recorder, num_frames, capacity=capacity)
+            for recorder in recorders
+        ]
+    )
+
+    envs.reset(seed=0)
+    envs.action_space.seed(0)
+    num_final_observations = 0
+    for _ in range(200):
+        *_, infos = envs.step(envs.action_space.sample())
+
+        for i, recorder in enumerate(recorders):
+            if (
+                'final_observation' not in infos
+                or not infos['_final_observation'][i]
+            ):
+                continue
+
+            # the terminal history, padded with the initial observation
+            frames = recorder.last_episode_frames
+            frames = [frames[0]] * num_frames + frames
+            final_observation = infos['final_observation'][i]
+            for key, value in final_observation.items():
+                np.testing.assert_array_equal(
+                    value,
+                    np.stack([f[key] for f in frames[-num_frames:]]),
+                )
+            num_final_observations += 1
+
+    assert num_final_observations > 10
+    envs.close()
+
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+def test_gym_history_wrapper_vector(asynchronous: bool):
+    def make_env():
+        return GymHistoryWrapper(gym.make('GV-Memory-5x5-v0'), 2)
+
+    vector_env_type = (
+        gym.vector.AsyncVectorEnv if asynchronous else gym.vector.SyncVectorEnv
+    )
+    envs = vector_env_type([make_env, make_env])
+
+    observations, _ = envs.reset(seed=0)
+    assert envs.observation_space.contains(observations)
+    for _ in range(10):
+        observations, *_ = envs.step(envs.action_space.sample())
+        assert envs.observation_space.contains(observations)
+
+    envs.close()
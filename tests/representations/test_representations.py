@@ -0,0 +1,173 @@
+import itertools as itt
+
+import numpy as np
+import pkg_resources
+import pytest
+
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.geometry import Orientation, Position
+from gym_gridverse.grid_object import NoneGridObject
+from gym_gridverse.gym import outer_space_to_gym_space
+from gym_gridverse.representations.observation_representations import (
+    make_observation_representation,
+)
+from gym_gridverse.representations.state_representations import (
+    DictStateRepresentation,
+    GridStateRepresentation,
+    make_state_representation,
+)
+
+
+@pytest.fixture
+def env():
+    path = pkg_resources.resource_filename(
+        'gym_gridverse', 'registered_envs/gv_keydoor.5x5.yaml'
+    )
+    env = factory_env_from_yaml(path)
+    env.set_seed(0)
+    env.reset()
+    return env
+
+
+@pytest.mark.parametrize(
+    'name', ['default', 'no-overlap', 'compact', 'one-hot', 'one-hot-packed']
+)
+@pytest.mark.parametrize('dtype', [None, np.uint8, np.int16])
+def test_observation_representation(env, name, dtype):
+    representation = make_observation_representation(
+        name, env.observation_space, dtype=dtype
+    )
+    observation = representation.convert(env.observation)
+    gym_space = outer_space_to_gym_space(representation.space)
+
+    for key, space in representation.space.items():
+        assert space.contains(observation[key])
+        if dtype is not None:
+            assert observation[key].dtype == dtype
+
+    assert gym_space.contains(observation)
+
+
+@pytest.mark.parametrize(
+    'name', ['default', 'no-overlap', 'compact', 'one-hot', 'one-hot-packed']
+)
+def test_state_representation(env, name):
+    representation = make_state_representation(
+        name, env.state_space, dtype=np.uint8, float_dtype=np.float32
+    )
+    state = representation.convert(env.state)
+    gym_space = outer_space_to_gym_space(representation.space)
+
+    assert state['grid'].dtype == np.uint8
+    assert state['agent'].dtype == np.float32
+    for key, space in representation.space.items():
+        assert space.contains(state[key])
+
+    assert gym_space.contains(state)
+
+
+def test_default_dtypes(env):
+    representation = make_observation_representation(
+        'compact', env.observation_space
+    )
+    assert representation.convert(env.observation)['grid'].dtype == int
+
+    representation = make_observation_representation(
+        'one-hot', env.observation_space
+    )
+    assert representation.convert(env.observation)['grid'].dtype == np.uint8
+
+
+def test_one_hot_matches_compact(env):
+    compact = make_observation_representation(
+        'compact', env.observation_space
+    ).convert(env.observation)['grid']
+    one_hot = make_observation_representation(
+        'one-hot', env.observation_space
+    ).convert(env.observation)['grid']
+    packed = make_observation_representation(
+        'one-hot-packed', env.observation_space
+    ).convert(env.observation)['grid']
+
+    # each cell sets exactly the channels of its compact indices
+    assert (one_hot.sum(axis=-1) == 3).all()
+    np.testing.assert_array_equal(
+        np.take_along_axis(one_hot, compact, axis=-1), 1
+    )
+
+    unpacked = np.unpackbits(packed, axis=-1, count=one_hot.shape[-1])
+    np.testing.assert_array_equal(unpacked, one_hot)
+    assert packed.shape[-1] == (one_hot.shape[-1] + 7) // 8
+
+
+def test_invalid_dtype(env):
+    # bit-packed bytes do not fit in int8
+    with pytest.raises(ValueError):
+        make_observation_representation(
+            'one-hot-packed', env.observation_space, dtype=np.int8
+        )
+
+    # categorical indices cannot be floating
+    with pytest.raises(ValueError):
+        make_state_representation('compact', env.state_space, dtype=float)
+
+    with pytest.raises(ValueError):
+        make_state_representation('invalid', env.state_space)
+
+
+@pytest.mark.parametrize('orientation', list(Orientation))
+def test_egocentric_grid(env, orientation: Orientation):
+    representation = make_state_representation(
+        'compact', env.state_space, egocentric=True
+    )
+    assert isinstance(representation, DictStateRepresentation)
+    grid_representation = representation.representations['grid']
+    assert isinstance(grid_representation, GridStateRepresentation)
+    grid_object_representation = grid_representation.grid_object_representation
+
+    state = env.state
+    state.agent.orientation = orientation
+    egocentric = representation.convert(state)['egocentric_grid']
+    assert representation.space['egocentric_grid'].contains(egocentric)
+
+    # the cell at offset (dy, dx) from the center is the one at the same
+    # offset relative to the agent pose, or NoneGridObject
+    height, width = state.grid.shape.as_tuple
+    margin = max(height, width) - 1
+    assert egocentric.shape[:2] == (2 * margin + 1, 2 * margin + 1)
+    for dy, dx in itt.product(range(-margin, margin + 1), repeat=2):
+        position = state.agent.transform * Position(dy, dx)
+        grid_object = (
+            state.grid[position]
+            if state.grid.area.contains(position)
+            else NoneGridObject()
+        )
+        np.testing.assert_array_equal(
+            egocentric[margin + dy, margin + dx],
+            grid_object_representation.convert(grid_object),
+        )
+
+
+def test_egocentric_grid_converts_grid_once(env, monkeypatch):
+    representation = make_state_representation(
+        'compact', env.state_space, egocentric=True
+    )
+    assert isinstance(representation, DictStateRepresentation)
+    egocentric_representation = representation.representations[
+        'egocentric_grid'
+    ]
+    expected = egocentric_representation.convert(env.state)
+
+    calls = []
+    convert = GridStateRepresentation.convert
+
+    def counting_convert(self, state):
+        calls.append(state)
+        return convert(self, state)
+
+    monkeypatch.setattr(GridStateRepresentation, 'convert', counting_convert)
+    arrays = representation.convert(env.state)
+
+    assert len(calls) == 1
+    assert list(arrays) == list(representation.representations)
+    np.testing.assert_array_equal(arrays['egocentric_grid'], expected)
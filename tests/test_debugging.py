@@ -0,0 +1,35 @@
+import threading
+
+from gym_gridverse.debugging import gv_debug, gv_debug_context, reset_gv_debug
+
+
+def test_gv_debug_context():
+    reset_gv_debug(True)
+
+    with gv_debug_context(False):
+        assert not gv_debug()
+
+        with gv_debug_context(True):
+            assert gv_debug()
+
+        assert not gv_debug()
+
+    assert gv_debug()
+    reset_gv_debug()
+
+
+def test_gv_debug_thread_local():
+    reset_gv_debug(True)
+    thread_debug = []
+
+    def target():
+        reset_gv_debug(False)
+        thread_debug.append(gv_debug())
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+
+    assert thread_debug == [False]
+    assert gv_debug()
+    reset_gv_debug()
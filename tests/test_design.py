@@ -10,8 +10,11 @@ from gym_gridverse.design import (
     draw_room,
     draw_room_grid,
     draw_wall_boundary,
+    fill_border,
+    fill_cartesian_product,
+    fill_room_grid,
 )
-from gym_gridverse.geometry import Area
+from gym_gridverse.geometry import Area, Position
 from gym_gridverse.grid import Grid
 from gym_gridverse.grid_object import Floor, Wall
 
@@ -150,3 +153,85 @@ def test_draw_cross_product(
         isinstance(grid[pos], Wall) for pos in grid.area.positions()
     )
     assert len(positions) == num_walls == expected_num_walls
+
+
+@pytest.mark.parametrize(
+    'draw,fill',
+    [
+        (
+            draw_wall_boundary,
+            lambda grid: fill_border(grid, grid.area, Wall),
+        ),
+        (
+            lambda grid: draw_area(grid, Area((1, 3), (0, 4)), Wall, fill=True),
+            lambda grid: grid.fill(Area((1, 3), (0, 4)), Wall),
+        ),
+        (
+            lambda grid: draw_room(grid, Area((1, 3), (0, 4)), Wall),
+            lambda grid: fill_border(grid, Area((1, 3), (0, 4)), Wall),
+        ),
+        (
+            lambda grid: draw_room_grid(grid, [0, 2, 4], [0, 3, 5], Wall),
+            lambda grid: fill_room_grid(grid, [0, 2, 4], [0, 3, 5], Wall),
+        ),
+        (
+            lambda grid: draw_cartesian_product(
+                grid, [4, 0, 1, 3], [5, 2, 3], Wall
+            ),
+            lambda grid: fill_cartesian_product(
+                grid, [4, 0, 1, 3], [5, 2, 3], Wall
+            ),
+        ),
+    ],
+)
+def test_draw_positions(draw, fill):
+    grid = Grid.from_shape((5, 6))
+    positions = draw(grid)
+
+    # drawing the returned positions one by one gives the same grid
+    expected = Grid.from_shape((5, 6))
+    for position in positions:
+        expected[position] = Wall()
+    assert grid == expected
+    assert grid.find(Wall) == sorted(
+        set(positions), key=lambda position: position.yx
+    )
+
+    grid_filled = Grid.from_shape((5, 6))
+    assert fill(grid_filled) is None
+    assert grid_filled == grid
+
+
+def test_draw_cartesian_product_duplicates():
+    grid = Grid.from_shape((5, 6))
+    num_calls = 0
+
+    def factory():
+        nonlocal num_calls
+        num_calls += 1
+        return Wall()
+
+    positions = draw_cartesian_product(grid, [1, 1, 2], [3, 3], factory)
+
+    # repeated coordinates are listed again, but each cell is filled once
+    assert positions == [Position(1, 3)] * 2 * 2 + [Position(2, 3)] * 2
+    assert num_calls == 2
+    assert grid.find(Wall) == [Position(1, 3), Position(2, 3)]
+
+
+@pytest.mark.parametrize(
+    'ys,xs',
+    [
+        ([5], [0]),
+        ([0], [6]),
+        ([-1], [0]),
+        ([0], [-1]),
+    ],
+)
+def test_draw_cartesian_product_out_of_range(ys, xs):
+    grid = Grid.from_shape((5, 6))
+    with pytest.raises(IndexError):
+        draw_cartesian_product(grid, ys, xs, Wall)
+
+    # negative coordinates do not wrap around
+    assert grid == Grid.from_shape((5, 6))
@@ -0,0 +1,225 @@
+import threading
+from functools import partial
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+
+import numpy as np
+import pkg_resources
+import pytest
+
+import gym_gridverse.env_server as env_server
+from gym_gridverse.env_server import EnvClient, EnvServer
+from gym_gridverse.gym import GymEnvironment, outer_env_factory
+
+YAML_FILEPATH = pkg_resources.resource_filename(
+    'gym_gridverse', 'registered_envs/gv_keydoor.5x5.yaml'
+)
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = EnvServer(
+        partial(outer_env_factory, YAML_FILEPATH),
+        str(tmp_path / 'gv.sock'),
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.close()
+    thread.join()
+
+
+def assert_observations_equal(observation, expected):
+    assert observation.keys() == expected.keys()
+    for key in observation:
+        np.testing.assert_array_equal(observation[key], expected[key])
+
+
+def test_env_client(server: EnvServer):
+    client = EnvClient(server.address)
+    env = GymEnvironment(outer_env_factory(YAML_FILEPATH))
+
+    assert client.action_space == env.action_space
+    assert client.observation_space == env.observation_space
+
+    observation, _ = client.reset(seed=0)
+    expected, _ = env.reset(seed=0)
+    assert_observations_equal(observation, expected)
+
+    for action in [0, 3, 4, 1, 2]:
+        observation, reward, terminated, truncated, _ = client.step(action)
+        expected_step = env.step(action)
+        assert_observations_equal(observation, expected_step[0])
+        assert (reward, terminated, truncated) == expected_step[1:4]
+
+    with pytest.raises(IndexError):
+        client.step(env.outer_env.action_space.num_actions)
+
+    with pytest.raises(RuntimeError):
+        client.state
+
+    client.close()
+    with pytest.raises(RuntimeError):
+        client.step(0)
+
+
+def test_env_server_concurrent_clients(server: EnvServer):
+    num_clients = 4
+    clients = [EnvClient(server.address) for _ in range(num_clients)]
+    for client in clients:
+        client.reset(seed=0)
+
+    barrier = threading.Barrier(num_clients)
+    observations = {}
+
+    def step(client: EnvClient):
+        barrier.wait()
+        observations[client] = client.step(0)[0]
+
+    threads = [
+        threading.Thread(target=step, args=(client,)) for client in clients
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # each client is served by its own environment
+    env = GymEnvironment(outer_env_factory(YAML_FILEPATH))
+    env.reset(seed=0)
+    expected, *_ = env.step(0)
+    assert len(observations) == num_clients
+    for observation in observations.values():
+        assert_observations_equal(observation, expected)
+
+    assert server.num_envs == num_clients
+    clients[0].close()
+    clients[1].reset()
+    assert server.num_envs == num_clients - 1
+
+
+def test_env_server_batch_window(tmp_path, monkeypatch):
+    batch_sizes = []
+    original_step_batch = env_server.step_batch
+
+    def step_batch(envs, actions):
+        batch_sizes.append(len(envs))
+        return original_step_batch(envs, actions)
+
+    monkeypatch.setattr(env_server, 'step_batch', step_batch)
+
+    # the batch closes early, once every connected client sent its request
+    server = EnvServer(
+        partial(outer_env_factory, YAML_FILEPATH),
+        str(tmp_path / 'gv.sock'),
+        batch_window=0.5,
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        num_clients = 3
+        clients = [EnvClient(server.address) for _ in range(num_clients)]
+        for client in clients:
+            client.reset(seed=0)
+
+        barrier = threading.Barrier(num_clients)
+
+        def step(client: EnvClient):
+            barrier.wait()
+            client.step(0)
+
+        threads = [
+            threading.Thread(target=step, args=(client,)) for client in clients
+        ]
+        for thread_ in threads:
+            thread_.start()
+        for thread_ in threads:
+            thread_.join()
+
+        assert batch_sizes == [num_clients]
+    finally:
+        server.close()
+        thread.join()
+
+
+def test_env_server_batch_window_invalid(tmp_path):
+    with pytest.raises(ValueError):
+        EnvServer(
+            partial(outer_env_factory, YAML_FILEPATH),
+            str(tmp_path / 'gv.sock'),
+            batch_window=-1.0,
+        )
+
+
+def test_env_server_malformed_requests(server: EnvServer):
+    client = EnvClient(server.address)
+    client.reset(seed=0)
+
+    connection = Client(
+        server.address, family='AF_UNIX', authkey=server.authkey
+    )
+    for request in ['step', (), (0,), ('step',), ('step', 0, 1)]:
+        connection.send(request)
+        status, error = connection.recv()
+        assert status == 'error'
+        assert isinstance(error, (ValueError, TypeError))
+
+    connection.send_bytes(b'not a pickle')
+    status, error = connection.recv()
+    assert status == 'error'
+    assert isinstance(error, ValueError)
+
+    # the server keeps serving its clients
+    connection.send(('reset', 0))
+    assert connection.recv()[0] == 'ok'
+    client.step(0)
+    connection.close()
+    client.close()
+
+
+def test_env_server_authkey(tmp_path):
+    server = EnvServer(
+        partial(outer_env_factory, YAML_FILEPATH),
+        str(tmp_path / 'gv.sock'),
+        authkey=b'secret',
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        with pytest.raises(AuthenticationError):
+            EnvClient(server.address)
+        with pytest.raises(AuthenticationError):
+            EnvClient(server.address, authkey=b'wrong')
+
+        client = EnvClient(server.address, authkey=b'secret')
+        client.reset(seed=0)
+        client.close()
+    finally:
+        server.close()
+        thread.join()
+
+
+def test_env_server_factory_error(tmp_path):
+    calls = []
+
+    def factory():
+        calls.append(None)
+        if len(calls) == 1:
+            raise ValueError('cannot create env')
+
+        return outer_env_factory(YAML_FILEPATH)
+
+    server = EnvServer(factory, str(tmp_path / 'gv.sock'))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        # the error is sent back, and the server keeps accepting clients
+        with pytest.raises(ValueError, match='cannot create env'):
+            EnvClient(server.address)
+
+        client = EnvClient(server.address)
+        client.reset(seed=0)
+        client.close()
+    finally:
+        server.close()
+        thread.join()
@@ -1,12 +1,17 @@
+import copy
+import dataclasses
 import math
+import pickle
 from typing import Sequence
 
+import numpy as np
 import pytest
 
 from gym_gridverse.geometry import (
     Area,
     Orientation,
     Position,
+    Shape,
     Transform,
     get_manhattan_boundary,
 )
@@ -372,3 +377,67 @@ def test_transform_neg_identity(transform: Transform):
 )
 def test_transform_mul_area(transform: Transform, area: Area, expected: Area):
     assert transform * area == expected
+
+
+def test_position_interning():
+    assert Position(2, -3) is Position(2, -3)
+    assert Position(np.int64(2), -3) is Position(2, -3)
+    assert type(Position(np.int64(2), -3).y) is int
+
+    # large coordinates are not interned, but still compared by value
+    assert Position(10**6, 0) == Position(10**6, 0)
+    assert hash(Position(10**6, 0)) == hash(Position(10**6, 0))
+
+    assert Position(1, 2) != Position(2, 1)
+    assert Position(1, 2) != (1, 2)
+
+
+@pytest.mark.parametrize(
+    'obj',
+    [
+        Position(1, 2),
+        Position(10**6, -(10**6)),
+        Shape(3, 4),
+        Area((0, 2), (-1, 3)),
+        Transform(Position(1, 2), Orientation.L),
+    ],
+)
+def test_geometry_slots_and_copy(obj):
+    assert not hasattr(obj, '__dict__')
+
+    for obj_copy in [
+        copy.copy(obj),
+        copy.deepcopy(obj),
+        pickle.loads(pickle.dumps(obj)),
+    ]:
+        assert obj_copy == obj
+        assert hash(obj_copy) == hash(obj)
+
+
+def test_geometry_frozen():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        Position(1, 2).y = 3  # type: ignore
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        Area((0, 1), (0, 1)).ys = (1, 2)  # type: ignore
+
+    assert dataclasses.replace(Position(1, 2), x=3) == Position(1, 3)
+
+
+def test_orientation_mul_matches_transform_mul():
+    area = Area((-2, 1), (-3, 0))
+    for orientation in Orientation:
+        transform = Transform(Position(0, 0), orientation)
+        rotated_positions = {orientation * p for p in area.positions()}
+        assert rotated_positions == set((orientation * area).positions())
+        assert rotated_positions == {transform * p for p in area.positions()}
+
+
+@pytest.mark.parametrize('selection', ['all', 'border', 'inside'])
+def test_area_positions_cached(selection: str):
+    area = Area((1, 4), (2, 4))
+    positions = list(area.positions(selection))
+
+    assert list(Area((1, 4), (2, 4)).positions(selection)) == positions
+    assert len(positions) == len(set(positions))
+    assert all(area.contains(position) for position in positions)
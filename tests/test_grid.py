@@ -1,9 +1,11 @@
+import copy
+import pickle
 from typing import List
 
 import pytest
 
 from gym_gridverse.geometry import Area, Orientation, Position, Shape
-from gym_gridverse.grid import Grid
+from gym_gridverse.grid import Grid, SparseGrid
 from gym_gridverse.grid_object import (
     Box,
     Color,
@@ -102,6 +104,31 @@ def test_grid_object_types():
     grid[1, 1] = Wall()
     assert grid.object_types() == set([Floor, Exit, Wall])
 
+    grid.swap(Position(0, 0), Position(2, 3))
+    assert grid.object_types() == set([Floor, Exit, Wall])
+
+    grid[2, 3] = Floor()
+    grid[1, 1] = Floor()
+    assert grid.object_types() == set([Floor])
+
+
+def test_grid_colors():
+    grid = Grid.from_shape((3, 4))
+    assert grid.colors() == set([Color.NONE])
+
+    grid[0, 0] = Key(Color.RED)
+    grid[0, 1] = Key(Color.RED)
+    grid[1, 1] = Key(Color.BLUE)
+    assert grid.colors() == set([Color.NONE, Color.RED, Color.BLUE])
+
+    grid[0, 0] = Floor()
+    assert grid.colors() == set([Color.NONE, Color.RED, Color.BLUE])
+
+    grid[0, 1] = Floor()
+    assert grid.colors() == set([Color.NONE, Color.BLUE])
+
+    assert grid.subgrid(Area((0, 0), (0, 3))).colors() == set([Color.NONE])
+
 
 def test_grid_get_item():
     grid = Grid.from_shape((3, 4))
@@ -326,3 +353,108 @@ def test_grid_mul(
 
     expected = Grid(expected_objects)
     assert grid * orientation == expected
+
+
+def test_grid_find():
+    grid = Grid.from_shape((3, 4))
+    grid[0, 3] = Key(Color.RED)
+    grid[1, 0] = Exit()
+    grid[2, 1] = Key(Color.BLUE)
+
+    assert grid.find(Key) == [Position(0, 3), Position(2, 1)]
+    assert grid.find(Exit) == [Position(1, 0)]
+    assert grid.find(Box) == []
+    assert len(grid.find(GridObject)) == 12
+
+
+def test_grid_fill():
+    grid = Grid.from_shape((3, 4))
+    grid[0, 0] = Key(Color.RED)
+    grid.fill(Area((0, 1), (0, 2)), Wall)
+
+    assert grid.find(Wall) == [
+        Position(y, x) for y in range(2) for x in range(3)
+    ]
+    assert grid.object_types() == set([Floor, Wall])
+    assert grid.colors() == set([Color.NONE])
+
+    expected = Grid.from_shape((3, 4))
+    for position in Area((0, 1), (0, 2)).positions():
+        expected[position] = Wall()
+    assert grid == expected
+
+    with pytest.raises(IndexError):
+        grid.fill(Area((2, 3), (0, 0)), Wall)
+
+    with pytest.raises(TypeError):
+        grid.fill(Area((0, 0), (0, 0)), lambda: 'not a grid object')  # type: ignore
+    assert grid == expected
+
+
+def make_sparse_grid() -> SparseGrid:
+    grid = SparseGrid((3, 4))
+    grid[0, 3] = Key(Color.RED)
+    grid[1, 0] = Wall()
+    grid[2, 1] = Exit()
+    return grid
+
+
+def test_sparse_grid_get_set_item():
+    grid = make_sparse_grid()
+    assert len(grid) == 3
+    assert grid[0, 0] is grid.default
+    assert grid[0, 3] == Key(Color.RED)
+
+    grid[0, 3] = Floor()
+    assert len(grid) == 2
+    assert grid[0, 3] is grid.default
+
+    grid.swap(Position(1, 0), Position(1, 1))
+    assert len(grid) == 2
+    assert grid[1, 1] == Wall()
+    assert grid.object_types() == set([Floor, Wall, Exit])
+    assert grid.colors() == set([Color.NONE])
+
+    with pytest.raises(IndexError):
+        grid[3, 0]
+
+    with pytest.raises(IndexError):
+        grid[-1, 0] = Wall()
+
+    with pytest.raises(TypeError):
+        grid[0, 0] = 'not a grid object'  # type: ignore
+
+
+def test_sparse_grid_dense_equivalence():
+    sparse_grid = make_sparse_grid()
+    dense_grid = Grid(sparse_grid.objects)
+
+    assert sparse_grid == dense_grid
+    assert dense_grid == sparse_grid
+    assert sparse_grid == SparseGrid.from_grid(dense_grid)
+    assert hash(sparse_grid) == hash(dense_grid)
+
+    assert sparse_grid.object_types() == dense_grid.object_types()
+    assert sparse_grid.colors() == dense_grid.colors()
+    assert sparse_grid.find(Key) == dense_grid.find(Key)
+    assert sparse_grid.find(Floor) == dense_grid.find(Floor)
+
+    for area in [Area((-1, 1), (-1, 1)), Area((-3, 0), (1, 5))]:
+        assert sparse_grid.subgrid(area) == dense_grid.subgrid(area)
+
+    for orientation in Orientation:
+        assert sparse_grid * orientation == dense_grid * orientation
+
+    sparse_grid.fill(Area((1, 2), (0, 1)), Wall)
+    dense_grid.fill(Area((1, 2), (0, 1)), Wall)
+    assert sparse_grid == dense_grid
+    assert sparse_grid.object_types() == dense_grid.object_types()
+
+
+def test_sparse_grid_copy():
+    grid = make_sparse_grid()
+
+    for grid_copy in [copy.deepcopy(grid), pickle.loads(pickle.dumps(grid))]:
+        assert grid_copy == grid
+        grid_copy[0, 0] = Wall()
+        assert grid_copy != grid
@@ -0,0 +1,130 @@
+import numpy as np
+import pygame
+import pytest
+
+from gym_gridverse.envs.reset_functions import reset_function_registry
+from gym_gridverse.geometry import Orientation, Shape
+from gym_gridverse.grid_object import Color, Door, Floor, Key, Wall
+from gym_gridverse.rendering_gv_objects import (
+    create_agent,
+    create_grid,
+    create_grid_object,
+    orientation_as_degrees,
+)
+from gym_gridverse.rendering_tiles import TileAtlas, get_tile_atlas
+from gym_gridverse.rng import make_rng
+
+
+def _render_canvas(data, window_scaling: int) -> np.ndarray:
+    """reference rendering which draws every cell on a single canvas"""
+    height, width = data.grid.shape.as_tuple
+    canvas = pygame.Surface((width * window_scaling, height * window_scaling))
+    canvas.fill((255, 255, 255))
+    for position in data.grid.area.positions():
+        create_grid_object(
+            canvas,
+            data.grid[position],
+            (position.x, position.y),
+            window_scaling,
+        )
+    create_agent(
+        canvas,
+        (data.agent.position.x, data.agent.position.y),
+        orientation_as_degrees[data.agent.orientation],
+        (1, 1),
+        window_scaling,
+    )
+    create_grid(canvas, (width, height), window_scaling)
+    return np.transpose(
+        np.array(pygame.surfarray.pixels3d(canvas)), axes=(1, 0, 2)
+    )
+
+
+@pytest.mark.parametrize('window_scaling', [10, 50])
+def test_tile_atlas_tile(window_scaling: int):
+    atlas = TileAtlas(window_scaling)
+
+    tile = atlas.tile(Wall())
+    assert tile.shape == (window_scaling, window_scaling, 3)
+    assert tile.dtype == np.uint8
+
+
+def test_tile_atlas_tile_index():
+    atlas = TileAtlas(10)
+
+    i = atlas.tile_index(Wall())
+    assert atlas.tile_index(Wall()) == i
+    assert len(atlas) == 1
+
+    # different state, color, or agent orientation require different tiles
+    j = atlas.tile_index(Door(Door.Status.OPEN, Color.RED))
+    k = atlas.tile_index(Door(Door.Status.LOCKED, Color.RED))
+    m = atlas.tile_index(Key(Color.RED))
+    n = atlas.tile_index(Key(Color.BLUE))
+    o = atlas.tile_index(Floor(), Orientation.F)
+    p = atlas.tile_index(Floor(), Orientation.R)
+    assert len({i, j, k, m, n, o, p}) == 7
+    assert len(atlas) == 7
+    assert atlas.atlas.shape == (7, 10, 10, 3)
+
+
+@pytest.mark.parametrize(
+    'name,kwargs',
+    [
+        ('empty', {'shape': Shape(5, 6)}),
+        ('keydoor', {'shape': Shape(7, 7)}),
+        ('teleport', {'shape': Shape(5, 5)}),
+        (
+            'memory',
+            {'shape': Shape(5, 7), 'colors': {Color.RED, Color.BLUE}},
+        ),
+        ('dynamic_obstacles', {'shape': Shape(6, 6), 'num_obstacles': 3}),
+    ],
+)
+def test_tile_atlas_render(name: str, kwargs):
+    window_scaling = 20
+    reset_function = reset_function_registry[name]
+    state = reset_function(**kwargs, rng=make_rng(0))
+
+    atlas = TileAtlas(window_scaling)
+    frame = atlas.render(state)
+    expected = _render_canvas(state, window_scaling)
+
+    assert frame.shape == expected.shape
+    assert frame.dtype == np.uint8
+    # tiles are rasterized at the origin, which may move a few edge pixels
+    assert (frame != expected).any(axis=-1).mean() < 0.01
+
+
+def test_tile_atlas_render_batch():
+    window_scaling = 10
+    reset_function = reset_function_registry['keydoor']
+    rng = make_rng(0)
+    states = [reset_function(shape=Shape(7, 7), rng=rng) for _ in range(5)]
+
+    atlas = TileAtlas(window_scaling)
+    frames = atlas.render_batch(states)
+
+    assert frames.shape == (5, 70, 70, 3)
+    assert frames.dtype == np.uint8
+    for frame, state in zip(frames, states):
+        np.testing.assert_array_equal(frame, atlas.render(state))
+
+
+def test_tile_atlas_render_batch_invalid():
+    reset_function = reset_function_registry['empty']
+    states = [
+        reset_function(shape=Shape(5, 5)),
+        reset_function(shape=Shape(6, 6)),
+    ]
+
+    atlas = TileAtlas(10)
+    with pytest.raises(ValueError):
+        atlas.render_batch([])
+    with pytest.raises(ValueError):
+        atlas.render_batch(states)
+
+
+def test_get_tile_atlas():
+    assert get_tile_atlas(10) is get_tile_atlas(10)
+    assert get_tile_atlas(10) is not get_tile_atlas(20)
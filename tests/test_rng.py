@@ -1,8 +1,18 @@
+import pickle
+import threading
+
+import numpy.random as rnd
+import pkg_resources
 import pytest
 
+from gym_gridverse.envs.gridworld import GridWorld
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
 from gym_gridverse.rng import (
+    BufferedGenerator,
+    RngStreams,
     get_gv_rng,
     get_gv_rng_if_none,
+    gv_rng_context,
     make_rng,
     reset_gv_rng,
 )
@@ -64,3 +74,117 @@ def test_rng_if_none():
     # call with an rng returns that rng
     rng = make_rng()
     assert get_gv_rng_if_none(rng) is rng
+
+
+def test_gv_rng_context():
+    rng = get_gv_rng()
+
+    other_rng = make_rng()
+    with gv_rng_context(other_rng) as context_rng:
+        assert context_rng is other_rng
+        assert get_gv_rng() is other_rng
+
+    with gv_rng_context() as context_rng:
+        assert context_rng is not rng
+        assert get_gv_rng() is context_rng
+
+    assert get_gv_rng() is rng
+
+
+def test_gv_rng_thread_local():
+    rng = get_gv_rng()
+    thread_rngs = []
+
+    def target():
+        thread_rngs.append(get_gv_rng())
+        reset_gv_rng(0)
+        thread_rngs.append(get_gv_rng())
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+
+    assert thread_rngs[0] is not rng
+    assert thread_rngs[1] is not rng
+    assert get_gv_rng() is rng
+
+
+def draw(rng: rnd.Generator) -> list:
+    return [
+        rng.choice(5),
+        rng.integers(3),
+        rng.integers(-2, 2, endpoint=True),
+        rng.random(),
+        rng.choice(5, size=2).tolist(),
+        rng.integers(0, 10, size=3).tolist(),
+    ]
+
+
+def test_buffered_generator():
+    rng = BufferedGenerator(rnd.Philox(0), block_size=4)
+
+    for _ in range(100):
+        values = draw(rng)
+        assert 0 <= values[0] < 5
+        assert 0 <= values[1] < 3
+        assert -2 <= values[2] <= 2
+        assert 0.0 <= values[3] < 1.0
+
+    with pytest.raises(ValueError):
+        rng.choice(0)
+
+    with pytest.raises(ValueError):
+        rng.integers(2, 2)
+
+    with pytest.raises(ValueError):
+        BufferedGenerator(rnd.Philox(0), block_size=0)
+
+
+def test_buffered_generator_pickle():
+    rng = BufferedGenerator(rnd.Philox(0), block_size=4)
+    draw(rng)
+
+    rng_copy = pickle.loads(pickle.dumps(rng))
+    assert isinstance(rng_copy, BufferedGenerator)
+    assert draw(rng_copy) == draw(rng)
+
+
+def test_rng_streams():
+    streams = RngStreams(1337)
+
+    # streams are determined by (seed, env index, episode) alone
+    values = {
+        (env_index, episode): draw(streams.generator(env_index, episode))
+        for env_index in range(3)
+        for episode in range(3)
+    }
+    assert len(set(map(str, values.values()))) == len(values)
+    assert draw(RngStreams(1337).generator(2, 1)) == values[2, 1]
+    assert draw(RngStreams(1338).generator(2, 1)) != values[2, 1]
+
+    with pytest.raises(ValueError):
+        streams.generator(-1, 0)
+
+
+def test_gridworld_rng_streams():
+    path = pkg_resources.resource_filename(
+        'gym_gridverse', 'registered_envs/gv_dynamic_obstacles.7x7.yaml'
+    )
+
+    def run_episodes(env_index: int, num_episodes: int, *, episode: int = 0):
+        env = factory_env_from_yaml(path)
+        assert isinstance(env, GridWorld)
+        env.set_rng_streams(RngStreams(0), env_index, episode=episode)
+
+        states = []
+        for _ in range(num_episodes):
+            env.reset()
+            env.step(env.action_space.actions[0])
+            states.append(env.state)
+
+        return states
+
+    states = run_episodes(0, 3)
+    assert run_episodes(0, 3) == states
+    assert run_episodes(0, 1, episode=2) == states[2:]
+    assert run_episodes(1, 3) != states